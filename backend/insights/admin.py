@@ -0,0 +1,250 @@
+"""
+Admin for Insight and Tag, sized for tables with millions of rows.
+
+Changelists join the author in the page query and prefetch tags, count with
+the planner's estimate once results are large, search only through indexed
+prefixes and exact ids, and pick related rows with autocomplete widgets.
+Writes go through the repositories so author counters, the change feed,
+the tag id cache and the representation cache stay correct; bulk actions
+run a few set-based statements per batch of ids.
+
+Only loaded where django.contrib.admin is installed (not under settings_api).
+"""
+from __future__ import annotations
+
+from typing import Iterator
+
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.contrib.admin.utils import model_ngettext
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin
+from django.core.exceptions import PermissionDenied
+from django.db.models import QuerySet
+from django.template.response import TemplateResponse
+from django.utils.text import Truncator
+
+from insights.application.use_cases.merge_tags import MergeTagsInput, MergeTagsUseCase
+from insights.domain.exceptions import ValidationError
+from insights.infrastructure.pagination import EstimatedCountPaginator
+from insights.infrastructure.repositories import InsightRepository, TagRepository
+from insights.infrastructure.selectors import TagSelector
+from insights.infrastructure.tags import canonical_tag
+from insights.models import Insight, Tag
+
+User = get_user_model()
+
+ACTION_BATCH_SIZE = 1000
+
+
+def _id_batches(queryset: QuerySet) -> Iterator[list[int]]:
+    # Keyset pagination over the selection, so "select all" across millions
+    # of rows never materializes every id (or holds one long transaction).
+    after = 0
+    while True:
+        ids = list(queryset.filter(pk__gt=after).order_by("pk").values_list("pk", flat=True)[:ACTION_BATCH_SIZE])
+        if not ids:
+            return
+        yield ids
+        after = ids[-1]
+
+
+@admin.action(description="Delete selected %(verbose_name_plural)s", permissions=["delete"])
+def delete_selected(modeladmin, request, queryset):
+    """
+    Replaces Django's delete_selected, which loads every selected row (and
+    their related rows) for the confirmation page and again to delete them.
+    The page shows a count and a sample; the delete runs in id batches
+    through ``delete_queryset``, which returns how many rows went.
+    """
+    opts = modeladmin.model._meta
+    deletable_objects, model_count, perms_needed, _ = modeladmin.get_deleted_objects(queryset, request)
+    if request.POST.get("post"):
+        if perms_needed:
+            raise PermissionDenied
+        n = modeladmin.delete_queryset(request, queryset)
+        modeladmin.message_user(request, f"Successfully deleted {n} {model_ngettext(opts, n)}.", messages.SUCCESS)
+        return None
+    context = {
+        **modeladmin.admin_site.each_context(request),
+        "title": "Delete multiple objects",
+        "subtitle": None,
+        "objects_name": str(model_ngettext(queryset)),
+        "deletable_objects": deletable_objects,
+        "model_count": dict(model_count).items(),
+        "selected": request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+        "select_across": request.POST.get("select_across", "0"),
+        "perms_lacking": perms_needed,
+        "opts": opts,
+        "action_checkbox_name": helpers.ACTION_CHECKBOX_NAME,
+        "media": modeladmin.media,
+    }
+    request.current_app = modeladmin.admin_site.name
+    return TemplateResponse(request, "admin/insights/delete_selected_confirmation.html", context)
+
+
+def _deleted_summary(modeladmin, objs, request, *, ordering: tuple[str, ...], sample_size: int = 20):
+    # Stands in for ModelAdmin.get_deleted_objects, which walks every related
+    # row; here the cascade is only link rows and counters.
+    if isinstance(objs, QuerySet):
+        count = objs.count()
+        sample = [str(o) for o in objs.order_by(*ordering)[:sample_size]]
+    else:
+        count, sample = len(objs), [str(o) for o in objs]
+    if count > len(sample):
+        sample.append(f"... and {count - len(sample)} more")
+    opts = modeladmin.model._meta
+    perms_needed = set() if modeladmin.has_delete_permission(request) else {opts.verbose_name}
+    return sample, {opts.verbose_name_plural: count}, perms_needed, []
+
+
+def _recategorize_action(category: Insight.Category):
+    def action(modeladmin, request, queryset):
+        repo = InsightRepository()
+        changed = sum(repo.recategorize(ids=ids, category=category.value) for ids in _id_batches(queryset))
+        modeladmin.message_user(request, f"Moved {changed} insights to {category.label}.", messages.SUCCESS)
+
+    action.__name__ = f"recategorize_{category.value.lower()}"
+    return admin.action(description=f"Move selected insights to {category.label}", permissions=["change"])(action)
+
+
+@admin.register(Insight)
+class InsightAdmin(admin.ModelAdmin):
+    list_display = ("id", "title", "category", "created_by", "tag_list", "view_count", "created_at")
+    list_display_links = ("id", "title")
+    list_select_related = ("created_by",)
+    list_filter = ("category",)  # choices only; a created_by filter would list every user
+    list_per_page = 50
+    # Only orderings backed by an index (see Insight.Meta.indexes).
+    sortable_by = ("id", "title", "created_at")
+    ordering = ("-created_at", "-id")
+    search_fields = ("=id", "title__startswith")
+    search_help_text = "Exact id or the start of the title (case-sensitive)."
+    autocomplete_fields = ("created_by", "tags")
+    fields = ("title", "category", "body", "tags", "created_by", "created_at", "updated_at", "view_count")
+    readonly_fields = ("created_at", "updated_at", "view_count")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = [delete_selected, *(_recategorize_action(c) for c in Insight.Category)]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related("tags")
+
+    def get_readonly_fields(self, request, obj=None):
+        # Reassigning authors would bypass AuthorStats.
+        return (*self.readonly_fields, "created_by") if obj else self.readonly_fields
+
+    @admin.display(description="Tags")
+    def tag_list(self, obj: Insight) -> str:
+        return Truncator(", ".join(t.name for t in obj.tags.all())).chars(60)
+
+    def save_model(self, request, obj, form, change):
+        data = form.cleaned_data
+        fields = dict(
+            title=data["title"],
+            category=data["category"],
+            body=data["body"],
+            tags=[t.name for t in data["tags"]],
+        )
+        repo = InsightRepository()
+        if change:
+            repo.update(insight=obj, **fields)
+        else:
+            saved = repo.create(created_by=data["created_by"], **fields)
+            obj.pk, obj.created_at, obj.updated_at = saved.pk, saved.created_at, saved.updated_at
+
+    def save_related(self, request, form, formsets, change):
+        # Tags were written by the repository in save_model.
+        for formset in formsets:
+            self.save_formset(request, form, formset, change=change)
+
+    def delete_model(self, request, obj):
+        InsightRepository().delete(insight=obj)
+
+    def delete_queryset(self, request, queryset) -> int:
+        repo = InsightRepository()
+        deleted = 0
+        for ids in _id_batches(queryset):
+            self.log_deletions(request, Insight.objects.filter(id__in=ids))
+            deleted += repo.delete_many(ids=ids)
+        return deleted
+
+    def get_deleted_objects(self, objs, request):
+        return _deleted_summary(self, objs, request, ordering=self.ordering)
+
+
+class TagAdminForm(forms.ModelForm):
+    class Meta:
+        model = Tag
+        fields = ("name",)
+
+    def clean_name(self) -> str:
+        name = canonical_tag(self.cleaned_data["name"])
+        if not name:
+            raise forms.ValidationError("Enter a tag name.")
+        return name
+
+    def validate_unique(self):
+        # Renaming onto an existing tag is a merge (see TagAdmin.save_model).
+        if self.instance.pk is None:
+            super().validate_unique()
+
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    form = TagAdminForm
+    list_display = ("name", "id")
+    ordering = ("name",)
+    search_fields = ("name__startswith",)
+    search_help_text = "Start of the tag name."
+    list_per_page = 100
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = [delete_selected]
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            super().save_model(request, obj, form, change)
+            return
+        old = form.initial["name"]
+        if obj.name == old:
+            return
+        try:
+            result = MergeTagsUseCase(repo=TagRepository(), selector=TagSelector()).execute(
+                data=MergeTagsInput(sources=(old,), target=obj.name)
+            )
+        except ValidationError as e:
+            problems = "; ".join(m for msgs in e.details.values() for m in msgs)
+            self.message_user(request, f"Could not rename {old!r}: {problems}", messages.ERROR)
+            return
+        obj.pk = result.target.pk
+        self.message_user(request, f"Renamed {old!r} to {obj.name!r}; {result.insights_updated} insights updated.")
+
+    def delete_model(self, request, obj):
+        TagRepository().delete(ids=[obj.pk])
+
+    def delete_queryset(self, request, queryset) -> int:
+        repo = TagRepository()
+        deleted = 0
+        for ids in _id_batches(queryset):
+            self.log_deletions(request, Tag.objects.filter(id__in=ids))
+            deleted += repo.delete(ids=ids)
+        return deleted
+
+    def get_deleted_objects(self, objs, request):
+        return _deleted_summary(self, objs, request, ordering=self.ordering)
+
+
+if admin.site.is_registered(User):
+    admin.site.unregister(User)
+
+
+@admin.register(User)
+class IndexedSearchUserAdmin(UserAdmin):
+    """Django's UserAdmin with searches the username index can serve (used by autocomplete)."""
+
+    search_fields = ("username__startswith",)
+    search_help_text = "Start of the username."
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from insights.domain.exceptions import ValidationError
+from insights.infrastructure.query_log import traced
+from insights.infrastructure.selectors import InsightSelector
+from insights.models import Insight
+
+MAX_BATCH_IDS = 200
+
+
+@dataclass(frozen=True)
+class BatchGetInsightsResult:
+    insights: list[Insight]
+    missing: list[int]
+
+
+class BatchGetInsightsUseCase:
+    def __init__(self, *, selector: InsightSelector):
+        self.selector = selector
+
+    @traced
+    def execute(self, *, ids: list[int]) -> BatchGetInsightsResult:
+        unique_ids = list(dict.fromkeys(ids))
+        if not unique_ids:
+            raise ValidationError({"ids": ["Provide at least one id."]})
+        if len(unique_ids) > MAX_BATCH_IDS:
+            raise ValidationError({"ids": [f"At most {MAX_BATCH_IDS} ids per request."]})
+
+        found = self.selector.get_many(ids=unique_ids)
+        return BatchGetInsightsResult(
+            insights=[found[i] for i in unique_ids if i in found],
+            missing=[i for i in unique_ids if i not in found],
+        )
@@ -6,6 +6,7 @@ from typing import Iterable
 from django.contrib.auth import get_user_model
 
 from insights.domain.rules import validate_insight_payload
+from insights.infrastructure.query_log import traced
 from insights.infrastructure.repositories import InsightRepository
 
 User = get_user_model()
@@ -23,6 +24,7 @@ class CreateInsightUseCase:
     def __init__(self, *, repo: InsightRepository):
         self.repo = repo
 
+    @traced
     def execute(self, *, data: CreateInsightInput, user: User):
         validate_insight_payload(
             title=data.title,
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from django.contrib.auth import get_user_model
+from insights.infrastructure.query_log import traced
 from insights.infrastructure.repositories import InsightRepository
 from insights.models import Insight
 
@@ -11,6 +12,7 @@ class DeleteInsightUseCase:
     def __init__(self, *, repo: InsightRepository):
         self.repo = repo
 
+    @traced
     def execute(self, *, insight: Insight, user: User) -> None:
         if insight.created_by_id != user.id:
             raise PermissionError("Only the owner can delete this insight.")
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from insights.domain.exceptions import ResyncRequiredError
+from insights.infrastructure.query_log import traced
+from insights.infrastructure.selectors import ChangeFeedSelector, InsightSelector
+from insights.models import Insight, InsightChange
+
+
+@dataclass(frozen=True)
+class ChangeEntry:
+    seq: int
+    op: str
+    insight_id: int
+    # Current state for created/updated entries; None for tombstones or
+    # insights deleted later in the feed.
+    insight: Insight | None
+
+
+@dataclass(frozen=True)
+class ChangePage:
+    changes: list[ChangeEntry]
+    cursor: int
+    has_more: bool
+
+
+class ListChangesUseCase:
+    def __init__(self, *, feed: ChangeFeedSelector, selector: InsightSelector):
+        self.feed = feed
+        self.selector = selector
+
+    @traced
+    def execute(self, *, since: int, limit: int) -> ChangePage:
+        compacted_through = self.feed.compacted_through()
+        if since < compacted_through:
+            raise ResyncRequiredError(
+                compacted_through=compacted_through,
+                latest=max(self.feed.latest_seq(), compacted_through),
+            )
+
+        rows = self.feed.changes_since(since=since, limit=limit + 1)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        live_ids = {r.insight_id for r in rows if r.op != InsightChange.Op.DELETED}
+        insights = self.selector.get_many(ids=live_ids) if live_ids else {}
+
+        return ChangePage(
+            changes=[
+                ChangeEntry(
+                    seq=r.seq,
+                    op=r.op,
+                    insight_id=r.insight_id,
+                    insight=None if r.op == InsightChange.Op.DELETED else insights.get(r.insight_id),
+                )
+                for r in rows
+            ],
+            cursor=rows[-1].seq if rows else since,
+            has_more=has_more,
+        )
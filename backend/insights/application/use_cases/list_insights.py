@@ -1,23 +1,78 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from insights.infrastructure.selectors import InsightSelector
+from insights.infrastructure.query_log import traced
+from insights.infrastructure.selectors import (
+    DEFAULT_ORDERING,
+    TAG_MODE_ANY,
+    AsyncInsightSelector,
+    InsightSelector,
+)
 
 
 @dataclass(frozen=True)
 class ListInsightsQuery:
     search: str | None = None
     category: str | None = None
-    tag: str | None = None
+    created_by: int | None = None
+    tags: tuple[str, ...] = ()
+    tag_mode: str = TAG_MODE_ANY
+    tag_contains: str | None = None
+    ordering: str = DEFAULT_ORDERING
+    include_archived: bool = False
+
+    @property
+    def is_author_only(self) -> bool:
+        """True when the only filter is the author, so the cached count applies."""
+        return self.created_by is not None and not (
+            self.search or self.category or self.tags or self.tag_contains or self.include_archived
+        )
 
 
 class ListInsightsUseCase:
     def __init__(self, *, selector: InsightSelector):
         self.selector = selector
 
+    @traced
     def execute(self, *, query: ListInsightsQuery):
         return self.selector.list(
             search=query.search,
             category=query.category,
-            tag=query.tag,
-        )
\ No newline at end of file
+            created_by=query.created_by,
+            tags=query.tags,
+            tag_mode=query.tag_mode,
+            tag_contains=query.tag_contains,
+            ordering=query.ordering,
+            include_archived=query.include_archived,
+        )
+
+    @traced
+    def known_count(self, *, query: ListInsightsQuery) -> int | None:
+        """Count that can be served without aggregating the table, if any."""
+        if query.is_author_only:
+            return self.selector.count_by_author(user_id=query.created_by)
+        return None
+
+
+
+class AsyncListInsightsUseCase:
+    def __init__(self, *, selector: AsyncInsightSelector):
+        self.selector = selector
+
+    @traced
+    async def execute(self, *, query: ListInsightsQuery):
+        return await self.selector.alist(
+            search=query.search,
+            category=query.category,
+            created_by=query.created_by,
+            tags=query.tags,
+            tag_mode=query.tag_mode,
+            tag_contains=query.tag_contains,
+            ordering=query.ordering,
+        )
+
+    @traced
+    async def known_count(self, *, query: ListInsightsQuery) -> int | None:
+        if query.is_author_only:
+            return await self.selector.acount_by_author(user_id=query.created_by)
+        return None
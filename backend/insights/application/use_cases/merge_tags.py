@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable
+
+from insights.domain.exceptions import ValidationError
+from insights.domain.rules import canonical_tag_name
+from insights.infrastructure.query_log import traced
+from insights.infrastructure.repositories import TagMergeResult, TagRepository
+from insights.infrastructure.selectors import TagSelector
+from insights.infrastructure.tags import canonical_tag
+from insights.models import Tag
+
+TAG_MAX_LENGTH = Tag._meta.get_field("name").max_length
+
+
+@dataclass(frozen=True)
+class MergeTagsInput:
+    sources: tuple[str, ...]
+    target: str
+
+
+class MergeTagsUseCase:
+    def __init__(self, *, repo: TagRepository, selector: TagSelector):
+        self.repo = repo
+        self.selector = selector
+
+    @traced
+    def execute(self, *, data: MergeTagsInput) -> TagMergeResult:
+        errors: dict[str, list[str]] = {}
+
+        target = canonical_tag(data.target or "")
+        if not target or len(target) > TAG_MAX_LENGTH:
+            errors.setdefault("target", []).append(f"Must be between 1 and {TAG_MAX_LENGTH} characters.")
+
+        sources = list(dict.fromkeys(s.strip() for s in data.sources if s and s.strip()))
+        if not sources:
+            errors.setdefault("sources", []).append("Provide at least one tag to merge.")
+        else:
+            unknown = sorted(set(sources) - self.selector.existing_names(names=sources))
+            if unknown:
+                errors.setdefault("sources", []).append(f"Unknown tags: {', '.join(unknown)}.")
+
+        if errors:
+            raise ValidationError(errors)
+        return self.repo.merge(sources=sources, target=target)
+
+
+class NormalizeTagsUseCase:
+    """Merge every group of tags that share a canonical form into that form."""
+
+    def __init__(self, *, repo: TagRepository, selector: TagSelector):
+        self.repo = repo
+        self.selector = selector
+
+    def plan(self, *, rule: Callable[[str], str] = canonical_tag_name) -> dict[str, list[str]]:
+        groups: dict[str, list[str]] = defaultdict(list)
+        for name in self.selector.all_names():
+            canonical = rule(name).strip()
+            if canonical:
+                groups[canonical].append(name)
+        return {
+            target: names
+            for target, names in groups.items()
+            if names != [target] and 0 < len(target) <= TAG_MAX_LENGTH
+        }
+
+    @traced
+    def execute(
+        self,
+        *,
+        rule: Callable[[str], str] = canonical_tag_name,
+        plan: dict[str, list[str]] | None = None,
+    ) -> list[TagMergeResult]:
+        plan = self.plan(rule=rule) if plan is None else plan
+        return [self.repo.merge(sources=names, target=target) for target, names in plan.items()]
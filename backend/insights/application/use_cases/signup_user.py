@@ -1,7 +1,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from insights.infrastructure.user_repository import UserRepository, UserAlreadyExistsError
+from typing import Any
+
+from insights.infrastructure.passwords import PasswordHashingPool, password_pool
+from insights.infrastructure.query_log import traced
+from insights.infrastructure.user_repository import UserAlreadyExistsError, UserRepository
+
+DUPLICATE_MESSAGES = {
+    "username": "Username is already taken.",
+    "email": "Email is already registered.",
+}
 
 
 class SignupValidationError(Exception):
@@ -20,13 +29,25 @@ class SignupOutput:
     id: int
     username: str
     email: str
+    user: Any  # the created User, so callers can mint tokens without refetching it
 
 
 class SignupUserUseCase:
-    def __init__(self, repo: UserRepository) -> None:
+    def __init__(self, repo: UserRepository, hasher: PasswordHashingPool = password_pool) -> None:
         self.repo = repo
+        self.hasher = hasher
 
+    @traced
     def execute(self, data: SignupInput) -> SignupOutput:
+        username, email, password = self._clean(data)
+        password_hash = self.hasher.hash(password)
+        try:
+            user = self.repo.create_user(username=username, email=email, password_hash=password_hash)
+        except UserAlreadyExistsError as exc:
+            raise SignupValidationError(DUPLICATE_MESSAGES[exc.field]) from exc
+        return SignupOutput(id=user.id, username=user.username, email=user.email or "", user=user)
+
+    def _clean(self, data: SignupInput) -> tuple[str, str, str]:
         username = (data.username or "").strip()
         email = (data.email or "").strip()
         password = data.password or ""
@@ -35,15 +56,18 @@ class SignupUserUseCase:
             raise SignupValidationError("Username must be at least 3 characters.")
         if len(password) < 8:
             raise SignupValidationError("Password must be at least 8 characters.")
+        return username, email, password
+
 
-        if self.repo.exists_by_username(username=username):
-            raise SignupValidationError("Username is already taken.")
-        if email and self.repo.exists_by_email(email=email):
-            raise SignupValidationError("Email is already registered.")
+class AsyncSignupUserUseCase(SignupUserUseCase):
+    """Async counterpart for ASGI: the hash is awaited from the pool."""
 
+    @traced
+    async def execute(self, data: SignupInput) -> SignupOutput:
+        username, email, password = self._clean(data)
+        password_hash = await self.hasher.ahash(password)
         try:
-            created = self.repo.create_user(username=username, email=email, password=password)
+            user = await self.repo.acreate_user(username=username, email=email, password_hash=password_hash)
         except UserAlreadyExistsError as exc:
-            raise SignupValidationError("User already exists.") from exc
-
-        return SignupOutput(id=created.id, username=created.username, email=created.email)
\ No newline at end of file
+            raise SignupValidationError(DUPLICATE_MESSAGES[exc.field]) from exc
+        return SignupOutput(id=user.id, username=user.username, email=user.email or "", user=user)
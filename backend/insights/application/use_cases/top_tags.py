@@ -1,11 +1,22 @@
 from __future__ import annotations
 
-from insights.infrastructure.selectors import TagAnalyticsSelector
+from insights.infrastructure.query_log import traced
+from insights.infrastructure.selectors import AsyncTagAnalyticsSelector, TagAnalyticsSelector
 
 
 class TopTagsUseCase:
     def __init__(self, *, selector: TagAnalyticsSelector):
         self.selector = selector
 
+    @traced
     def execute(self, *, limit: int = 10):
-        return self.selector.top_tags(limit=limit)
\ No newline at end of file
+        return self.selector.top_tags(limit=limit)
+
+
+class AsyncTopTagsUseCase:
+    def __init__(self, *, selector: AsyncTagAnalyticsSelector):
+        self.selector = selector
+
+    @traced
+    async def execute(self, *, limit: int = 10):
+        return await self.selector.atop_tags(limit=limit)
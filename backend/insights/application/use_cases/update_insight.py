@@ -5,6 +5,7 @@ from dataclasses import dataclass
 from django.contrib.auth import get_user_model
 
 from insights.domain.rules import validate_insight_payload
+from insights.infrastructure.query_log import traced
 from insights.infrastructure.repositories import InsightRepository
 from insights.models import Insight
 
@@ -23,6 +24,7 @@ class UpdateInsightUseCase:
     def __init__(self, *, repo: InsightRepository):
         self.repo = repo
 
+    @traced
     def execute(self, *, insight: Insight, data: UpdateInsightInput, user: User) -> Insight:
         if insight.created_by_id != user.id:
             # keep it domain-level simple; API layer maps to 403
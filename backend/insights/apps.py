@@ -1,5 +1,11 @@
-
 from django.apps import AppConfig
 class InsightsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'insights'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from .infrastructure.query_log import install_recorder
+
+        connection_created.connect(install_recorder, dispatch_uid="insights.slow_query_recorder")
@@ -0,0 +1,260 @@
+"""
+Async-native read endpoints, mounted by insights/urls.py when
+settings.INSIGHTS_ASYNC_READS is on (project/asgi.py turns it on).
+
+GET requests are served with Django's async ORM; every other method is
+handed to the regular DRF views in a worker thread, so responses and
+error shapes match the WSGI deployment. Login and signup are the
+exception: they are async so password hashing can be awaited from the
+hashing pool (see infrastructure/passwords.py).
+"""
+from __future__ import annotations
+
+import json
+import math
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import AuthenticationFailed, ValidationError as DRFValidationError
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from project.renderers import dumps
+
+from .application.use_cases.list_insights import AsyncListInsightsUseCase
+from .application.use_cases.top_tags import AsyncTopTagsUseCase
+from .infrastructure.pagination import DefaultPagination, approximate_count
+from .infrastructure.passwords import PasswordHashingBusy
+from .infrastructure.query_log import use_case_scope
+from .infrastructure.representations import InsightKey, representation_cache
+from .infrastructure.selectors import AsyncInsightSelector, AsyncTagAnalyticsSelector
+from .infrastructure.view_counts import view_counts
+from .serializers import InsightSerializer
+from .views import InsightViewSet, parse_list_query
+
+_sync_list_view = InsightViewSet.as_view({"get": "list", "post": "create"})
+_sync_detail_view = InsightViewSet.as_view(
+    {"get": "retrieve", "put": "update", "patch": "partial_update", "delete": "destroy"}
+)
+
+
+def _json(data: Any, status: int = 200) -> HttpResponse:
+    return HttpResponse(dumps(data), content_type="application/json", status=status)
+
+
+def _error(status: int, code: str, details: Any) -> HttpResponse:
+    return _json({"error": {"code": code, "details": details}}, status=status)
+
+
+def _busy(e: PasswordHashingBusy) -> HttpResponse:
+    response = _error(503, "BUSY", {"detail": e.detail})
+    response["Retry-After"] = str(e.wait)
+    return response
+
+
+def _json_body(request) -> dict | None:
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _positive_int(raw: str | None, default: int) -> int:
+    try:
+        value = int(raw) if raw else default
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+async def _render_insights(keys: list[InsightKey], *, selector: AsyncInsightSelector) -> list[dict]:
+    # Async twin of views.render_insights.
+    rendered = await representation_cache.aget_many(keys)
+    missing = [k for k in keys if k.id not in rendered]
+    if missing:
+        found = await selector.aget_many(keys=missing)
+        fresh = {pk: (obj.updated_at, dict(InsightSerializer(obj).data)) for pk, obj in found.items()}
+        await representation_cache.aset_many(fresh)
+        rendered.update((pk, data) for pk, (_, data) in fresh.items())
+    return [rendered[k.id] for k in keys if k.id in rendered]
+
+
+@csrf_exempt
+async def insight_list_view(request):
+    if request.method != "GET":
+        return await sync_to_async(_sync_list_view)(request)
+
+    try:
+        query = parse_list_query(request.GET)
+    except DRFValidationError as e:
+        return _error(400, "VALIDATION_ERROR", e.detail)
+    if query.include_archived:
+        # The hot/archive UNION is only implemented on the sync path.
+        return await sync_to_async(_sync_list_view)(request)
+
+    # Same page/page_size rules as DefaultPagination.
+    pagination = DefaultPagination
+    page_size = min(
+        _positive_int(request.GET.get(pagination.page_size_query_param), pagination.page_size),
+        pagination.max_page_size,
+    )
+    try:
+        page = int(request.GET.get(pagination.page_query_param) or 1)
+    except ValueError:
+        return _error(404, "NOT_FOUND", {"detail": "Invalid page."})
+
+    selector = AsyncInsightSelector()
+    use_case = AsyncListInsightsUseCase(selector=selector)
+    # The queryset is evaluated here, after the use case returned.
+    with use_case_scope(AsyncListInsightsUseCase.__name__):
+        qs = await use_case.execute(query=query)
+        count = await use_case.known_count(query=query)
+        count_is_estimate = False
+        if count is None:
+            count = await sync_to_async(approximate_count)(qs)
+            count_is_estimate = count is not None
+        if count is None:
+            count = await qs.acount()
+
+        num_pages = max(1, math.ceil(count / page_size))
+        if page < 1 or page > num_pages:
+            return _error(404, "NOT_FOUND", {"detail": "Invalid page."})
+
+        keys = await selector.apage_keys(qs, offset=(page - 1) * page_size, limit=page_size)
+        url = request.build_absolute_uri()
+        previous = None
+        if page > 1:
+            previous = (
+                remove_query_param(url, pagination.page_query_param)
+                if page == 2
+                else replace_query_param(url, pagination.page_query_param, page - 1)
+            )
+
+        return _json(
+            {
+                "count": count,
+                "count_is_estimate": count_is_estimate,
+                "next": replace_query_param(url, pagination.page_query_param, page + 1) if page < num_pages else None,
+                "previous": previous,
+                "results": await _render_insights(keys, selector=selector),
+            }
+        )
+
+
+@csrf_exempt
+async def insight_detail_view(request, pk: int):
+    if request.method != "GET":
+        return await sync_to_async(_sync_detail_view)(request, pk=pk)
+
+    selector = AsyncInsightSelector()
+    key = await selector.aget_key(pk=pk)
+    rendered = await _render_insights([key], selector=selector) if key else []
+    if not rendered:
+        return _error(404, "NOT_FOUND", {"detail": "No Insight matches the given query."})
+    if not key.archived:
+        view_counts.record(key.id)
+    return _json(rendered[0])
+
+
+async def top_tags_view(request):
+    if request.method != "GET":
+        return _error(405, "ERROR", {"detail": f'Method "{request.method}" not allowed.'})
+
+    tags = await AsyncTopTagsUseCase(selector=AsyncTagAnalyticsSelector()).execute(limit=10)
+    return _json({"tags": [{"name": t.name, "count": t.count} for t in tags]})
+
+
+async def me_view(request):
+    if request.method != "GET":
+        return _error(405, "ERROR", {"detail": f'Method "{request.method}" not allowed.'})
+
+    try:
+        auth = await sync_to_async(JWTAuthentication().authenticate)(request)
+    except AuthenticationFailed as e:
+        return _error(401, "UNAUTHORIZED", e.detail)
+    if auth is None:
+        return _error(401, "UNAUTHORIZED", {"detail": "Authentication credentials were not provided."})
+
+    user, _ = auth
+    return _json({"id": user.id, "username": user.username})
+
+
+@csrf_exempt
+async def login_view(request):
+    """
+    auth/login/ under ASGI: same request and response as TokenObtainPairView,
+    but the password check is awaited from the hashing pool instead of
+    occupying the thread Django reserves for sync views.
+    """
+    from django.contrib.auth import aauthenticate, get_user_model
+    from rest_framework_simplejwt.settings import api_settings
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    if request.method != "POST":
+        return _error(405, "ERROR", {"detail": f'Method "{request.method}" not allowed.'})
+    data = _json_body(request)
+    if data is None:
+        return _error(400, "VALIDATION_ERROR", {"detail": "JSON parse error."})
+    username_field = get_user_model().USERNAME_FIELD
+    missing = {f: ["This field is required."] for f in (username_field, "password") if data.get(f) in (None, "")}
+    if missing:
+        return _error(400, "VALIDATION_ERROR", missing)
+
+    try:
+        user = await aauthenticate(request, **{username_field: str(data[username_field]), "password": str(data["password"])})
+    except PasswordHashingBusy as e:
+        return _busy(e)
+    if not api_settings.USER_AUTHENTICATION_RULE(user):
+        return _error(401, "UNAUTHORIZED", {"detail": "No active account found with the given credentials"})
+
+    # Pure token signing unless the blacklist app is installed (then it writes).
+    refresh = await sync_to_async(RefreshToken.for_user)(user)
+    if api_settings.UPDATE_LAST_LOGIN:
+        from django.contrib.auth.models import update_last_login
+
+        await sync_to_async(update_last_login)(None, user)
+    return _json({"refresh": str(refresh), "access": str(refresh.access_token)})
+
+
+@csrf_exempt
+async def signup_view(request):
+    # Signup is rare compared to reads; keep its modules off worker startup.
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from .application.use_cases.signup_user import AsyncSignupUserUseCase, SignupInput, SignupValidationError
+    from .infrastructure.user_repository import UserRepository
+    from .serializers import SignupSerializer
+
+    if request.method != "POST":
+        return _error(405, "ERROR", {"detail": f'Method "{request.method}" not allowed.'})
+    data = _json_body(request)
+    if data is None:
+        return _error(400, "VALIDATION_ERROR", {"detail": "JSON parse error."})
+    ser = SignupSerializer(data=data)
+    if not ser.is_valid():
+        return _error(400, "VALIDATION_ERROR", ser.errors)
+
+    try:
+        out = await AsyncSignupUserUseCase(repo=UserRepository()).execute(
+            SignupInput(
+                username=ser.validated_data["username"],
+                email=ser.validated_data.get("email", ""),
+                password=ser.validated_data["password"],
+            )
+        )
+    except SignupValidationError as e:
+        return _error(400, "VALIDATION_ERROR", {"detail": [str(e)]})
+    except PasswordHashingBusy as e:
+        return _busy(e)
+
+    refresh = await sync_to_async(RefreshToken.for_user)(out.user)
+    return _json(
+        {
+            "user": {"id": out.id, "username": out.username, "email": out.email},
+            "tokens": {"refresh": str(refresh), "access": str(refresh.access_token)},
+        },
+        status=201,
+    )
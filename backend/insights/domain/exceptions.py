@@ -5,4 +5,13 @@ class DomainError(Exception):
 class ValidationError(DomainError):
     def __init__(self, details: dict[str, list[str]]):
         super().__init__("Validation error")
-        self.details = details
\ No newline at end of file
+        self.details = details
+
+
+class ResyncRequiredError(DomainError):
+    """The client's change-feed cursor points at compacted history."""
+
+    def __init__(self, *, compacted_through: int, latest: int):
+        super().__init__("Cursor predates compacted change history")
+        self.compacted_through = compacted_through
+        self.latest = latest
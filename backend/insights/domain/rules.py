@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import math
+from datetime import datetime, timezone
 from typing import Iterable
 from .exceptions import ValidationError
 
+# Reference point for the recency term of hot_score (keeps scores small).
+HOT_EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
 
 def validate_insight_payload(*, title: str, body: str, category: str, tags: Iterable[str]) -> None:
     errors: dict[str, list[str]] = {}
@@ -23,4 +28,18 @@ def validate_insight_payload(*, title: str, body: str, category: str, tags: Iter
         errors.setdefault("tags", []).append("Tags must not contain duplicates.")
 
     if errors:
-        raise ValidationError(errors)
\ No newline at end of file
+        raise ValidationError(errors)
+
+def canonical_tag_name(name: str) -> str:
+    """Case- and punctuation-insensitive tag form: "C.P.I." -> "cpi", "Rate  Cuts" -> "rate cuts"."""
+    return " ".join(name.replace(".", "").casefold().split())
+
+
+def hot_score(*, views: int, created_at: datetime, half_life_hours: float) -> float:
+    """
+    log2(1 + views) plus age-since-HOT_EPOCH in half-lives: an insight one
+    half-life newer needs half the views to rank the same, which orders
+    like views * 2^-(age / half-life) without ever having to re-decay
+    stored scores. Mirrored in SQL by EngagementRepository.
+    """
+    return math.log2(1 + views) + (created_at - HOT_EPOCH).total_seconds() / (half_life_hours * 3600)
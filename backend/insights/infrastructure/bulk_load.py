@@ -0,0 +1,259 @@
+"""
+Bulk ingest used by `manage.py load_insights`.
+
+Input is read lazily and written in chunks. Each chunk is one transaction
+that also advances the job's LoadCheckpoint row, so after a failure the
+same command resumes at the first record of the first uncommitted chunk.
+
+On Postgres, insight rows and their tag links are loaded with COPY (ids
+are reserved from the table's sequence up front); other databases use
+bulk_create. Author counters and the change feed are kept in step, but no
+live SSE events are published for bulk loads.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone as dt_timezone
+from typing import Any, Iterable, Iterator, TextIO
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from insights.domain.exceptions import ValidationError
+from insights.domain.rules import validate_insight_payload
+from insights.infrastructure.tags import canonical_tags, tag_cache
+from insights.models import AuthorStats, ChangeLogState, Insight, InsightChange, LoadCheckpoint, Tag
+
+User = get_user_model()
+
+FORMATS = ("ndjson", "csv")
+CSV_TAG_SEPARATOR = "|"
+TAG_MAX_LENGTH = Tag._meta.get_field("name").max_length
+
+
+@dataclass(frozen=True)
+class InsightRecord:
+    number: int  # 1-based position in the input
+    title: str
+    category: str
+    body: str
+    tags: tuple[str, ...]
+    author: str | None = None
+    created_at: datetime | None = None
+
+
+@dataclass(frozen=True)
+class RejectedRecord:
+    number: int
+    details: dict[str, list[str]]
+
+
+def read_rows(stream: TextIO, fmt: str) -> Iterator[Any]:
+    """Raw input rows: dicts for CSV, undecoded lines for NDJSON (blank lines skipped)."""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    else:
+        for line in stream:
+            if line.strip():
+                yield line
+
+
+def parse_record(
+    raw: Any, *, number: int, fmt: str, tag_separator: str = CSV_TAG_SEPARATOR
+) -> InsightRecord | RejectedRecord:
+    """Decode and validate one input row with the same rules as the API."""
+    if fmt == "ndjson":
+        try:
+            raw = json.loads(raw)
+        except ValueError as e:
+            return RejectedRecord(number, {"record": [f"Invalid JSON: {e}"]})
+    if not isinstance(raw, dict):
+        return RejectedRecord(number, {"record": ["Expected an object."]})
+
+    tags = raw.get("tags") or []
+    if isinstance(tags, str):
+        tags = tags.split(tag_separator)
+    title = str(raw.get("title") or "")
+    body = str(raw.get("body") or "")
+    category = str(raw.get("category") or "")
+
+    errors: dict[str, list[str]] = {}
+    try:
+        validate_insight_payload(title=title, body=body, category=category, tags=tags)
+    except ValidationError as e:
+        errors.update(e.details)
+    tags = tuple(canonical_tags(tags))
+    if category not in Insight.Category.values:
+        errors.setdefault("category", []).append(f'"{category}" is not a valid choice.')
+    if any(len(t) > TAG_MAX_LENGTH for t in tags):
+        errors.setdefault("tags", []).append(f"Tags must be at most {TAG_MAX_LENGTH} characters.")
+
+    created_at = raw.get("created_at") or None
+    if created_at is not None:
+        created_at = parse_datetime(str(created_at))
+        if created_at is None:
+            errors.setdefault("created_at", []).append("Invalid datetime.")
+        elif timezone.is_naive(created_at):
+            created_at = timezone.make_aware(created_at, dt_timezone.utc)
+
+    author = raw.get("created_by")
+    if isinstance(author, dict):
+        author = author.get("username")
+
+    if errors:
+        return RejectedRecord(number, errors)
+    return InsightRecord(
+        number=number,
+        title=title.strip(),
+        category=category,
+        body=body.strip(),
+        tags=tags,
+        author=str(author) if author else None,
+        created_at=created_at,
+    )
+
+
+class InsightBulkLoader:
+    """Writes validated records chunk by chunk under a resumable job name."""
+
+    def __init__(self, *, job: str, default_author: User | None = None, use_copy: bool | None = None):
+        self.job = job
+        self.default_author = default_author
+        self.use_copy = connection.vendor == "postgresql" if use_copy is None else use_copy
+
+    def checkpoint(self) -> LoadCheckpoint:
+        return LoadCheckpoint.objects.get_or_create(job=self.job)[0]
+
+    def reset(self) -> None:
+        LoadCheckpoint.objects.filter(job=self.job).delete()
+
+    @transaction.atomic
+    def write_chunk(
+        self, records: list[InsightRecord], *, consumed: int, rejected: int = 0
+    ) -> list[RejectedRecord]:
+        """
+        Load ``records`` and advance the checkpoint by ``consumed`` input
+        records (``rejected`` of which already failed validation). Returns
+        records rejected here, i.e. those naming an unknown author.
+        """
+        checkpoint = LoadCheckpoint.objects.select_for_update().get_or_create(job=self.job)[0]
+
+        author_ids = self._resolve_authors({r.author for r in records if r.author})
+        default_id = self.default_author.id if self.default_author else None
+        rows, unknown = [], []
+        for record in records:
+            author_id = author_ids.get(record.author) if record.author else default_id
+            if author_id is None:
+                unknown.append(
+                    RejectedRecord(record.number, {"created_by": [f'Unknown user "{record.author or ""}".']})
+                )
+            else:
+                rows.append((record, author_id))
+
+        if rows:
+            tag_ids = self._upsert_tags({t for record, _ in rows for t in record.tags})
+            insight_ids = self._insert_insights(rows)
+            links = [
+                (insight_id, tag_ids[name])
+                for insight_id, (record, _) in zip(insight_ids, rows)
+                for name in record.tags
+            ]
+            self._insert_links(links)
+            self._bump_author_counts(Counter(author_id for _, author_id in rows))
+            ChangeLogState.objects.select_for_update().get_or_create(pk=1)
+            InsightChange.objects.bulk_create(
+                [InsightChange(insight_id=i, op=InsightChange.Op.CREATED) for i in insight_ids]
+            )
+
+        checkpoint.position += consumed
+        checkpoint.loaded += len(rows)
+        checkpoint.rejected += rejected + len(unknown)
+        checkpoint.save()
+        return unknown
+
+    def _resolve_authors(self, usernames: set[str]) -> dict[str, int]:
+        if not usernames:
+            return {}
+        return dict(User.objects.filter(username__in=usernames).values_list("username", "id"))
+
+    def _upsert_tags(self, names: set[str]) -> dict[str, int]:
+        # At most one INSERT ... ON CONFLICT DO NOTHING plus one SELECT per chunk.
+        ids = tag_cache.get_many(names)
+        missing = names - ids.keys()
+        if missing:
+            Tag.objects.bulk_create([Tag(name=n) for n in sorted(missing)], ignore_conflicts=True)
+            resolved = dict(Tag.objects.filter(name__in=missing).values_list("name", "id"))
+            tag_cache.set_many(resolved)
+            ids.update(resolved)
+        return ids
+
+    def _insert_insights(self, rows: list[tuple[InsightRecord, int]]) -> list[int]:
+        now = timezone.now()
+        if self.use_copy:
+            ids = self._reserve_ids(Insight._meta.db_table, len(rows))
+            self._copy(
+                Insight._meta.db_table,
+                ["id", "title", "category", "body", "created_by_id", "created_at", "updated_at"],
+                (
+                    (pk, r.title, r.category, r.body, author_id, r.created_at or now, now)
+                    for pk, (r, author_id) in zip(ids, rows)
+                ),
+            )
+            return ids
+
+        objs = Insight.objects.bulk_create(
+            [
+                Insight(title=r.title, category=r.category, body=r.body, created_by_id=author_id)
+                for r, author_id in rows
+            ]
+        )
+        # auto_now_add overrides created_at in bulk_create; restore historical dates.
+        dated = []
+        for obj, (record, _) in zip(objs, rows):
+            if record.created_at is not None:
+                obj.created_at = record.created_at
+                dated.append(obj)
+        if dated:
+            Insight.objects.bulk_update(dated, ["created_at"])
+        return [obj.pk for obj in objs]
+
+    def _insert_links(self, links: list[tuple[int, int]]) -> None:
+        through = Insight.tags.through
+        if self.use_copy:
+            self._copy(through._meta.db_table, ["insight_id", "tag_id"], links)
+        else:
+            through.objects.bulk_create([through(insight_id=i, tag_id=t) for i, t in links])
+
+    def _bump_author_counts(self, counts: Counter) -> None:
+        AuthorStats.objects.bulk_create(
+            [AuthorStats(user_id=user_id) for user_id in counts], ignore_conflicts=True
+        )
+        for user_id, n in counts.items():
+            AuthorStats.objects.filter(user_id=user_id).update(insight_count=F("insight_count") + n)
+
+    def _reserve_ids(self, table: str, n: int) -> list[int]:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+                [table, n],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def _copy(self, table: str, columns: list[str], rows: Iterable[tuple]) -> None:
+        buf = io.StringIO()
+        # Quoting every string keeps empty strings distinct from NULL in COPY's CSV format.
+        csv.writer(buf, quoting=csv.QUOTE_NONNUMERIC).writerows(rows)
+        buf.seek(0)
+        qn = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {qn(table)} ({', '.join(qn(c) for c in columns)}) FROM STDIN WITH (FORMAT csv)",
+                buf,
+            )
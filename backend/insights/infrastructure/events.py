@@ -0,0 +1,184 @@
+"""
+Live insight events for the SSE stream.
+
+InsightRepository publishes an event once its transaction commits. The
+configured backend (settings.INSIGHT_EVENTS_BACKEND) decides how events
+reach the process-local broadcaster that SSE connections subscribe to:
+
+- LocalEventBackend: same process only (development, single worker).
+- PostgresNotifyBackend: NOTIFY/LISTEN on the project database, so every
+  worker process sees writes made by any other.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import select
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils.module_loading import import_string
+
+from insights.infrastructure.selectors import TAG_MODE_ALL, TAG_MODE_ANY
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+@dataclass(eq=False)
+class Subscription:
+    """One SSE connection: a bounded queue owned by the connection's event loop."""
+
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(SUBSCRIBER_QUEUE_SIZE))
+    # Set when the client fell too far behind; the stream asks it to resync.
+    overflowed: bool = False
+
+    def _put(self, event: dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class Broadcaster:
+    """Fans events out to the subscriptions of this process (thread-safe)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subscriptions: set[Subscription] = set()
+
+    @contextmanager
+    def subscribe(self) -> Iterator[Subscription]:
+        sub = Subscription(loop=asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions.add(sub)
+        try:
+            yield sub
+        finally:
+            with self._lock:
+                self._subscriptions.discard(sub)
+
+    def deliver(self, event: dict[str, Any]) -> None:
+        with self._lock:
+            subs = list(self._subscriptions)
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub._put, event)
+            except RuntimeError:
+                # Loop already closed; the subscription is being torn down.
+                pass
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+
+broadcaster = Broadcaster()
+
+
+class LocalEventBackend:
+    """Delivers events to subscribers in the publishing process only."""
+
+    def start(self, target: Broadcaster) -> None:
+        pass  # publish() already delivers in-process
+
+    def publish(self, event: dict[str, Any]) -> None:
+        broadcaster.deliver(event)
+
+
+class PostgresNotifyBackend:
+    """Cross-process delivery through Postgres NOTIFY/LISTEN (payloads < 8kB)."""
+
+    channel = "insight_events"
+
+    def __init__(self) -> None:
+        self._started = False
+        self._lock = threading.Lock()
+
+    def publish(self, event: dict[str, Any]) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [self.channel, json.dumps(event)])
+
+    def start(self, target: Broadcaster) -> None:
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        threading.Thread(target=self._listen, args=(target,), name="insight-events", daemon=True).start()
+
+    def _listen(self, target: Broadcaster) -> None:
+        import psycopg2
+        import psycopg2.extensions
+
+        db = settings.DATABASES["default"]
+        while True:
+            try:
+                conn = psycopg2.connect(
+                    dbname=db["NAME"],
+                    user=db["USER"],
+                    password=db["PASSWORD"],
+                    host=db["HOST"],
+                    port=db["PORT"],
+                )
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.channel}")
+                while True:
+                    if select.select([conn], [], [], 30) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        target.deliver(json.loads(conn.notifies.pop(0).payload))
+            except Exception:
+                logger.exception("Insight event listener failed; reconnecting")
+                threading.Event().wait(5)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_event_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = import_string(settings.INSIGHT_EVENTS_BACKEND)()
+        return _backend
+
+
+def publish_on_commit(event: dict[str, Any]) -> None:
+    """Publish ``event`` after the surrounding transaction commits."""
+
+    def _publish() -> None:
+        try:
+            get_event_backend().publish(event)
+        except Exception:
+            # Live events are best effort; the change feed is the durable record.
+            logger.exception("Failed to publish insight event")
+
+    transaction.on_commit(_publish)
+
+
+@dataclass(frozen=True)
+class EventFilter:
+    """Same category/tag semantics as InsightSelector.list."""
+
+    category: str | None = None
+    tags: frozenset[str] = frozenset()
+    tag_mode: str = TAG_MODE_ANY
+
+    def matches(self, event: dict[str, Any]) -> bool:
+        if self.category and event.get("category") != self.category:
+            return False
+        if self.tags:
+            event_tags = set(event.get("tags") or ())
+            if self.tag_mode == TAG_MODE_ALL:
+                return self.tags <= event_tags
+            return bool(self.tags & event_tags)
+        return True
@@ -0,0 +1,159 @@
+"""
+``Idempotency-Key`` support for non-idempotent writes.
+
+A client that retries a write (after a timeout, say) sends the same key;
+views wrapped with ``idempotent`` then replay the first successful response
+instead of running the use case again. Keys are scoped to the authenticated
+user and kept for settings.IDEMPOTENCY_KEY_TTL_HOURS.
+
+The (user, key) row doubles as the lock. It is inserted, and committed,
+before the write runs, so a concurrent duplicate hits the unique
+constraint and gets 409 (with Retry-After) rather than racing the first.
+The response is stored in the same transaction as the write itself: either
+both commit or neither does, and a failed or non-2xx attempt releases the
+key for the next retry. A claim left behind by a crashed worker is taken
+over once settings.IDEMPOTENCY_LOCK_TIMEOUT_SECONDS have passed.
+"""
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timedelta
+from functools import wraps
+from typing import Any, Callable
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError as DRFValidationError
+from rest_framework.response import Response
+
+from insights.models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+KEY_MAX_LENGTH = IdempotencyKey._meta.get_field("key").max_length
+
+
+class IdempotencyKeyInUse(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "A request with this Idempotency-Key is still in progress; retry shortly."
+    default_code = "in_progress"
+    wait = 1  # seconds, sent as Retry-After
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "This Idempotency-Key was already used for a different request."
+    default_code = "key_reused"
+
+
+def request_fingerprint(request) -> str:
+    digest = hashlib.sha256()
+    for part in (request.method, request.get_full_path(), request.content_type or ""):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+class IdempotencyRepository:
+    """Claims, completes, releases and purges IdempotencyKey rows."""
+
+    def claim(self, *, user_id: int, key: str, fingerprint: str) -> IdempotencyKey | None:
+        """
+        Take the key for a new attempt; None means the caller now holds it.
+        Otherwise the current holder's row is returned (in progress or done).
+        """
+        now = timezone.now()
+        for _ in range(2):
+            try:
+                with transaction.atomic():
+                    IdempotencyKey.objects.create(
+                        user_id=user_id,
+                        key=key,
+                        fingerprint=fingerprint,
+                        locked_until=now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT_SECONDS),
+                        expires_at=now + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS),
+                    )
+                return None
+            except IntegrityError:
+                existing = IdempotencyKey.objects.filter(user_id=user_id, key=key).first()
+            if existing is None:
+                continue  # released since the insert failed
+            if not self._stale(existing, now):
+                return existing
+            # Expired, or abandoned by a crashed request (whose write rolled
+            # back with it): drop it, unless someone else already has, and retry.
+            IdempotencyKey.objects.filter(id=existing.id).filter(self._stale_q(now)).delete()
+        raise IdempotencyKeyInUse()  # lost the race for the freed key twice
+
+    def complete(self, *, user_id: int, key: str, response_status: int, body: Any) -> None:
+        IdempotencyKey.objects.filter(user_id=user_id, key=key, response_status__isnull=True).update(
+            response_status=response_status, response_body=body, locked_until=None
+        )
+
+    def release(self, *, user_id: int, key: str) -> None:
+        IdempotencyKey.objects.filter(user_id=user_id, key=key, response_status__isnull=True).delete()
+
+    def purge_expired(self, *, batch_size: int = 5000) -> int:
+        """Delete expired keys in batches (each its own short statement); returns rows deleted."""
+        deleted = 0
+        while True:
+            ids = list(
+                IdempotencyKey.objects.filter(expires_at__lte=timezone.now())
+                .order_by("expires_at")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                return deleted
+            deleted += IdempotencyKey.objects.filter(id__in=ids).delete()[0]
+
+    def _stale_q(self, now: datetime) -> Q:
+        return Q(expires_at__lte=now) | Q(response_status__isnull=True, locked_until__lte=now)
+
+    def _stale(self, row: IdempotencyKey, now: datetime) -> bool:
+        return row.expires_at <= now or (row.response_status is None and row.locked_until <= now)
+
+
+def idempotent(view: Callable) -> Callable:
+    """
+    Honour ``Idempotency-Key`` on a DRF view function or (through
+    ``method_decorator``) a viewset action. Requests without the header, or
+    from anonymous users, pass straight through.
+    """
+
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None or not request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+        if not key.strip() or len(key) > KEY_MAX_LENGTH:
+            raise DRFValidationError({HEADER: [f"Must be between 1 and {KEY_MAX_LENGTH} characters."]})
+
+        repo = IdempotencyRepository()
+        fingerprint = request_fingerprint(request)
+        held = repo.claim(user_id=request.user.id, key=key, fingerprint=fingerprint)
+        if held is not None:
+            if held.fingerprint != fingerprint:
+                raise IdempotencyKeyReused()
+            if held.response_status is None:
+                raise IdempotencyKeyInUse()
+            return Response(held.response_body, status=held.response_status, headers={REPLAYED_HEADER: "true"})
+
+        try:
+            with transaction.atomic():
+                response = view(request, *args, **kwargs)
+                if status.is_success(response.status_code):
+                    repo.complete(
+                        user_id=request.user.id, key=key, response_status=response.status_code, body=response.data
+                    )
+        except BaseException:
+            repo.release(user_id=request.user.id, key=key)
+            raise
+        if not status.is_success(response.status_code):
+            repo.release(user_id=request.user.id, key=key)
+        return response
+
+    return wrapped
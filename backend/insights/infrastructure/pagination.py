@@ -1,7 +1,92 @@
+import json
+from functools import cached_property, partial
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+
+class KnownCountPaginator(Paginator):
+    """Paginator that trusts a precomputed count instead of running COUNT(*)."""
+
+    def __init__(self, object_list, per_page, *, count: int, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self._known_count = count
+
+    @cached_property
+    def count(self) -> int:
+        return self._known_count
+
+
+def estimate_count(queryset) -> int | None:
+    """Planner row estimate for ``queryset`` (Postgres only; None elsewhere)."""
+    if connections[queryset.db].vendor != "postgresql":
+        return None
+    plan = json.loads(queryset.explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def approximate_count(queryset) -> int | None:
+    """
+    Estimated count when it is large enough that an exact COUNT(*) is not
+    worth it (settings.INSIGHTS_APPROX_COUNT_THRESHOLD); None means "count
+    exactly". Small and selective result sets therefore stay exact.
+    """
+    threshold = settings.INSIGHTS_APPROX_COUNT_THRESHOLD
+    if not threshold:
+        return None
+    estimate = estimate_count(queryset)
+    if estimate is None or estimate < threshold:
+        return None
+    return estimate
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for admin changelists: large results report the planner's
+    estimate (see approximate_count) instead of running COUNT(*).
+    """
+
+    @cached_property
+    def count(self) -> int:
+        estimate = approximate_count(self.object_list)
+        return super().count if estimate is None else estimate
 
 
 class DefaultPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
-    max_page_size = 100
\ No newline at end of file
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # Views may expose ``get_known_count()`` when the total is maintained
+        # elsewhere (e.g. AuthorStats); otherwise large results use the
+        # planner's estimate and everything else an exact count.
+        get_known_count = getattr(view, "get_known_count", None)
+        known = get_known_count() if get_known_count else None
+        self.count_is_estimate = False
+        if known is None:
+            known = approximate_count(queryset)
+            self.count_is_estimate = known is not None
+        self.django_paginator_class = (
+            Paginator if known is None else partial(KnownCountPaginator, count=known)
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.page.paginator.count,
+                "count_is_estimate": self.count_is_estimate,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_is_estimate"] = {"type": "boolean", "example": False}
+        return response_schema
@@ -0,0 +1,155 @@
+"""
+Password hashing off the request thread.
+
+PBKDF2 (hashlib releases the GIL while it runs) dominates signup and login
+CPU. Hashes and checks run in a process-wide pool of
+settings.PASSWORD_HASH_WORKERS threads; at most
+settings.PASSWORD_HASH_QUEUE_SIZE more may wait, beyond that callers get
+PasswordHashingBusy (503 with Retry-After) instead of piling up behind a
+spike. Async views await the pool directly, so on ASGI hashing occupies
+neither the event loop nor Django's single thread for sync code.
+
+Only CPU work runs in the pool; reading and saving users stays with the
+caller's database connection.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, get_hasher, identify_hasher, make_password
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PasswordHashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many sign-ins in progress; retry shortly."
+    default_code = "busy"
+    wait = 1  # seconds, sent as Retry-After
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    Django's pbkdf2_sha256 with the work factor from
+    settings.PASSWORD_PBKDF2_ITERATIONS (0 keeps Django's default). Hashes
+    stay interchangeable with the stock hasher; users whose stored hash
+    uses a different count are rehashed on their next login.
+    """
+
+    @property
+    def iterations(self) -> int:
+        return settings.PASSWORD_PBKDF2_ITERATIONS or PBKDF2PasswordHasher.iterations
+
+
+def verify(raw: str, encoded: str) -> tuple[bool, bool]:
+    """(password matches, hash should be upgraded to the preferred hasher/cost)."""
+    if not raw or not encoded:
+        return False, False
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False, False
+    preferred = get_hasher("default")
+    changed = hasher.algorithm != preferred.algorithm
+    must_update = changed or preferred.must_update(encoded)
+    ok = hasher.verify(raw, encoded)
+    if not ok and not changed and must_update:
+        hasher.harden_runtime(raw, encoded)
+    return ok, must_update
+
+
+class PasswordHashingPool:
+    """Bounded thread pool for make_password / verify."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._slots: threading.BoundedSemaphore | None = None
+
+    @property
+    def workers(self) -> int:
+        return settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+
+    def hash(self, raw: str) -> str:
+        return self._submit(make_password, raw).result()
+
+    async def ahash(self, raw: str) -> str:
+        return await asyncio.wrap_future(self._submit(make_password, raw))
+
+    def verify(self, raw: str, encoded: str) -> tuple[bool, bool]:
+        return self._submit(verify, raw, encoded).result()
+
+    async def averify(self, raw: str, encoded: str) -> tuple[bool, bool]:
+        return await asyncio.wrap_future(self._submit(verify, raw, encoded))
+
+    def shutdown(self) -> None:
+        """Stop the threads; the next call starts a pool sized from current settings."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+            self._executor = self._slots = None
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        with self._lock:
+            if self._executor is None:
+                workers = self.workers
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+                self._slots = threading.BoundedSemaphore(workers + settings.PASSWORD_HASH_QUEUE_SIZE)
+            executor, slots = self._executor, self._slots
+        if not slots.acquire(blocking=False):
+            raise PasswordHashingBusy()
+        future = executor.submit(fn, *args)
+        future.add_done_callback(lambda _: slots.release())
+        return future
+
+
+password_pool = PasswordHashingPool()
+
+
+class PooledModelBackend(ModelBackend):
+    """ModelBackend whose password checks (and rehashes) run in ``password_pool``."""
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        User = get_user_model()
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = User._default_manager.get_by_natural_key(username)
+        except User.DoesNotExist:
+            # Hash anyway so unknown usernames take as long as wrong passwords.
+            password_pool.hash(password)
+            return None
+        ok, must_update = password_pool.verify(password, user.password)
+        if not ok or not self.user_can_authenticate(user):
+            return None
+        if must_update:
+            user.password = password_pool.hash(password)
+            user.save(update_fields=["password"])
+        return user
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        User = get_user_model()
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        user = await User._default_manager.filter(**{User.USERNAME_FIELD: username}).afirst()
+        if user is None:
+            await password_pool.ahash(password)
+            return None
+        ok, must_update = await password_pool.averify(password, user.password)
+        if not ok or not self.user_can_authenticate(user):
+            return None
+        if must_update:
+            user.password = await password_pool.ahash(password)
+            await user.asave(update_fields=["password"])
+        return user
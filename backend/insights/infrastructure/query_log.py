@@ -0,0 +1,310 @@
+"""
+Slow-query log.
+
+An execute wrapper, installed on every database connection by
+InsightsConfig.ready(), times each statement. Statements slower than
+settings.SLOW_QUERY_THRESHOLD_MS are recorded with a normalized SQL
+fingerprint, their parameters, the view and the use case that issued them,
+and an EXPLAIN plan (never ANALYZE) captured off the request path by a
+background thread (settings.SLOW_QUERY_EXPLAIN).
+
+Entries go to a ring buffer of settings.SLOW_QUERY_LOG_SIZE slots in the
+Django cache, so with a shared CACHES backend the staff endpoint and
+`manage.py slow_queries` see every worker's entries. Each entry takes its
+slot from an atomic cache counter and is written under its own key, so
+concurrent workers never overwrite each other's entries.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import queue
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Iterator
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = "insights:slow-queries"
+SEQ_KEY = f"{CACHE_KEY}:seq"
+EXPLAIN_QUEUE_SIZE = 1000
+MAX_PARAMS = 20
+MAX_PARAM_CHARS = 200
+
+# Set by QueryContextMiddleware and, for the duration of the call, by @traced
+# use-case methods. Views that evaluate a use case's lazy queryset after it
+# returns (the paginated list) wrap that evaluation in use_case_scope().
+_current_request: ContextVar[Any] = ContextVar("slow_query_request", default=None)
+current_use_case: ContextVar[str | None] = ContextVar("current_use_case", default=None)
+# True while this module itself talks to the database (EXPLAIN, cache).
+_capturing: ContextVar[bool] = ContextVar("slow_query_capturing", default=False)
+
+
+@contextmanager
+def use_case_scope(name: str) -> Iterator[None]:
+    """Attribute slow queries issued inside the block to use case ``name``."""
+    token = current_use_case.set(name)
+    try:
+        yield
+    finally:
+        current_use_case.reset(token)
+
+
+def traced(method: Callable) -> Callable:
+    """Mark a use-case method so slow queries are attributed to its class."""
+    name = method.__qualname__.rpartition(".")[0] or method.__qualname__
+
+    if iscoroutinefunction(method):
+
+        @wraps(method)
+        async def async_wrapper(*args, **kwargs):
+            with use_case_scope(name):
+                return await method(*args, **kwargs)
+
+        return async_wrapper
+
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        with use_case_scope(name):
+            return method(*args, **kwargs)
+
+    return wrapper
+
+
+class QueryContextMiddleware:
+    """Makes the current request's view and use case known to the slow-query log."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        tokens = self._enter(request)
+        try:
+            return self.get_response(request)
+        finally:
+            self._exit(tokens)
+
+    async def __acall__(self, request):
+        tokens = self._enter(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            self._exit(tokens)
+
+    def _enter(self, request):
+        return _current_request.set(request), current_use_case.set(None)
+
+    def _exit(self, tokens) -> None:
+        _current_request.reset(tokens[0])
+        current_use_case.reset(tokens[1])
+
+
+def current_view() -> str | None:
+    # Read at record time: resolver_match is only set once URL routing ran.
+    match = getattr(_current_request.get(), "resolver_match", None)
+    return (match.view_name or match._func_path) if match else None
+
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> tuple[str, str]:
+    """(normalized SQL, short hash): literals -> ?, IN lists collapsed, whitespace squeezed."""
+    normalized = _STRING.sub("?", sql)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _IN_LIST.sub("(...)", normalized.replace("%s", "?"))
+    normalized = _SPACE.sub(" ", normalized).strip()
+    return normalized, hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+def _short_params(params: Any) -> list[str]:
+    if params is None:
+        return []
+    values = params.items() if isinstance(params, dict) else params
+    return [repr(p)[:MAX_PARAM_CHARS] for p in list(values)[:MAX_PARAMS]]
+
+
+def capture_plan(connection, sql: str, params: Any) -> str | None:
+    """EXPLAIN (without ANALYZE) for a SELECT; None for anything else."""
+    head = sql.lstrip()[:6].upper()
+    if not (head == "SELECT" or head.startswith("WITH")):
+        return None
+    token = _capturing.set(True)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+            return "\n".join(str(row[-1]) for row in cursor.fetchall())
+    except Exception as e:
+        return f"EXPLAIN failed: {e}"
+    finally:
+        _capturing.reset(token)
+
+
+def _slot_key(slot: int) -> str:
+    return f"{CACHE_KEY}:{slot}"
+
+
+class SlowQueryLog:
+    """Bounded ring buffer of slow-query entries in the Django cache."""
+
+    def append(self, entry: dict[str, Any]) -> None:
+        token = _capturing.set(True)
+        try:
+            cache.add(SEQ_KEY, 0, timeout=None)
+            try:
+                seq = cache.incr(SEQ_KEY)
+            except ValueError:  # evicted between add() and incr()
+                seq = 1
+                cache.set(SEQ_KEY, seq, timeout=None)
+            cache.set(_slot_key(seq % settings.SLOW_QUERY_LOG_SIZE), (seq, entry), timeout=None)
+        finally:
+            _capturing.reset(token)
+
+    def entries(self) -> list[dict[str, Any]]:
+        """Oldest first."""
+        seq = cache.get(SEQ_KEY) or 0
+        size = settings.SLOW_QUERY_LOG_SIZE
+        slots = cache.get_many([_slot_key(i) for i in range(size)]).values()
+        # Slots left over from before a clear() or a smaller log size fall outside the window.
+        return [entry for n, entry in sorted(slots, key=lambda s: s[0]) if seq - size < n <= seq]
+
+    def clear(self) -> None:
+        cache.delete_many([SEQ_KEY, *(_slot_key(i) for i in range(settings.SLOW_QUERY_LOG_SIZE))])
+
+    def top(self, *, limit: int = 20) -> list[dict[str, Any]]:
+        """Entries grouped by fingerprint, worst total time first."""
+        groups: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for entry in self.entries():
+            groups[entry["fingerprint"]].append(entry)
+
+        summary = []
+        for key, items in groups.items():
+            durations = [e["duration_ms"] for e in items]
+            latest = items[-1]
+            summary.append(
+                {
+                    "fingerprint": key,
+                    "sql": latest["sql"],
+                    "count": len(items),
+                    "total_ms": round(sum(durations), 2),
+                    "mean_ms": round(sum(durations) / len(durations), 2),
+                    "max_ms": round(max(durations), 2),
+                    "views": sorted({e["view"] for e in items if e["view"]}),
+                    "use_cases": sorted({e["use_case"] for e in items if e["use_case"]}),
+                    "last_seen": latest["at"],
+                    "params": latest["params"],
+                    "plan": next((e["plan"] for e in reversed(items) if e["plan"]), None),
+                }
+            )
+        summary.sort(key=lambda s: s["total_ms"], reverse=True)
+        return summary[:limit]
+
+
+slow_query_log = SlowQueryLog()
+
+
+class _PlanWorker:
+    """Background thread that EXPLAINs recorded statements and stores the entries."""
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue = queue.Queue(EXPLAIN_QUEUE_SIZE)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def submit(self, entry: dict[str, Any], sql: str, params: Any) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="slow-query-explain", daemon=True)
+                self._thread.start()
+        try:
+            self._queue.put_nowait((entry, sql, params))
+        except queue.Full:
+            pass  # diagnostics are best effort; never block a request
+
+    def _run(self) -> None:
+        _capturing.set(True)
+        while True:
+            entry, sql, params = self._queue.get()
+            try:
+                connection = connections[entry["alias"]]
+                entry["plan"] = capture_plan(connection, sql, params)
+                slow_query_log.append(entry)
+            except Exception:
+                logger.exception("Failed to capture slow query plan")
+            finally:
+                connections.close_all()
+
+
+_plan_worker = _PlanWorker()
+
+
+class SlowQueryRecorder:
+    """Execute wrapper (see django.db.backends.base.base.execute_wrapper)."""
+
+    def __call__(self, execute, sql, params, many, context):
+        threshold = settings.SLOW_QUERY_THRESHOLD_MS
+        if not threshold or _capturing.get():
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration_ms = (time.perf_counter() - start) * 1000
+        if duration_ms >= threshold:
+            try:
+                self._record(sql, params, many, context["connection"], duration_ms)
+            except Exception:
+                logger.exception("Failed to record slow query")
+        return result
+
+    def _record(self, sql, params, many, connection, duration_ms: float) -> None:
+        normalized, key = fingerprint(sql)
+        entry = {
+            "fingerprint": key,
+            "sql": normalized,
+            "params": [] if many else _short_params(params),
+            "duration_ms": round(duration_ms, 2),
+            "at": timezone.now().isoformat(),
+            "view": current_view(),
+            "use_case": current_use_case.get(),
+            "alias": connection.alias,
+            "plan": None,
+        }
+        mode = settings.SLOW_QUERY_EXPLAIN
+        if many or mode == "off":
+            slow_query_log.append(entry)
+        elif mode == "sync":
+            entry["plan"] = capture_plan(connection, sql, params)
+            slow_query_log.append(entry)
+        else:
+            _plan_worker.submit(entry, sql, params)
+
+
+recorder = SlowQueryRecorder()
+
+
+def install_recorder(sender, connection, **kwargs) -> None:
+    """connection_created receiver: time every statement on ``connection``."""
+    if recorder not in connection.execute_wrappers:
+        connection.execute_wrappers.append(recorder)
@@ -1,10 +1,80 @@
-from typing import Iterable
-from django.db import transaction
-from insights.models import Insight, Tag
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Iterable
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F, FloatField, Func, Value
+from django.db.models.functions import Cast, Log
+from django.utils import timezone
+from insights.domain.rules import HOT_EPOCH, hot_score
+from insights.models import (
+    ArchivedInsight,
+    ArchivedInsightTag,
+    AuthorStats,
+    ChangeLogState,
+    Insight,
+    InsightChange,
+    Tag,
+)
 from django.contrib.auth import get_user_model
+from insights.infrastructure.events import publish_on_commit
+from insights.infrastructure.representations import representation_cache
+from insights.infrastructure.tags import canonical_tags, tag_cache
+from insights.infrastructure.tasks import task
 
 User = get_user_model()
 
+PUBLISH_BATCH_SIZE = 1000
+
+
+def _latest_seq() -> int:
+    # Only meaningful while holding the ChangeLogState lock.
+    return InsightChange.objects.order_by("-seq").values_list("seq", flat=True).first() or 0
+
+
+def _event_fields(ids: list[int]) -> dict[int, dict[str, Any]]:
+    """Title, category and tag names of hot or archived insights, for live events."""
+    fields: dict[int, dict[str, Any]] = {}
+    for model, through in ((Insight, Insight.tags.through), (ArchivedInsight, ArchivedInsightTag)):
+        missing = [i for i in ids if i not in fields]
+        if not missing:
+            break
+        found = {
+            row.pop("id"): {**row, "tags": []}
+            for row in model.objects.filter(id__in=missing).values("id", "title", "category")
+        }
+        links = through.objects.filter(insight_id__in=list(found)).order_by("id").values_list("insight_id", "tag__name")
+        for insight_id, name in links:
+            found[insight_id]["tags"].append(name)
+        fields.update(found)
+    return fields
+
+
+def _publish_changes(changes: Iterable[tuple[int, int, str]], fields: dict[int, dict[str, Any]]) -> None:
+    for seq, insight_id, op in changes:
+        if insight_id in fields:
+            publish_on_commit({"seq": seq, "op": op, "id": insight_id, **fields[insight_id]})
+
+
+@task(batch_size=1)
+def publish_change_range(payloads: list[dict[str, int]]) -> None:
+    """
+    Live events for change-log rows appended set-based (``after`` < seq <=
+    ``through``), read back in batches once the write has committed.
+    """
+    for payload in payloads:
+        after = payload["after"]
+        while True:
+            rows = list(
+                InsightChange.objects.filter(seq__gt=after, seq__lte=payload["through"])
+                .order_by("seq")
+                .values_list("seq", "insight_id", "op")[:PUBLISH_BATCH_SIZE]
+            )
+            if not rows:
+                break
+            _publish_changes(rows, _event_fields([insight_id for _, insight_id, _ in rows]))
+            after = rows[-1][0]
+
 
 class InsightRepository:
     """Handles write operations for Insight."""
@@ -24,13 +94,23 @@ class InsightRepository:
             category=category,
             body=body,
             created_by=created_by,
+            # created_at is stamped within microseconds of this; close enough
+            # that the row need not wait for refresh_hot_scores.
+            hot_score=hot_score(
+                views=0, created_at=timezone.now(), half_life_hours=settings.INSIGHT_HOT_HALF_LIFE_HOURS
+            ),
+            hot_dirty=False,
         )
 
         tag_objs = self._get_or_create_tags(tags)
-        insight.tags.set(tag_objs)
+        insight.tags.set([t.id for t in tag_objs])
+
+        self._bump_author_count(user_id=created_by.id, delta=1)
+        self._record_change(insight=insight, tags=tag_objs, op=InsightChange.Op.CREATED)
 
         return insight
 
+    @transaction.atomic
     def update(
         self,
         *,
@@ -43,19 +123,341 @@ class InsightRepository:
         insight.title = title
         insight.category = category
         insight.body = body
-        insight.save()
+        # Only the edited columns: view_count and hot_score are written
+        # concurrently by EngagementRepository, and the instance's copies may be stale.
+        insight.save(update_fields=["title", "category", "body", "updated_at"])
 
         tag_objs = self._get_or_create_tags(tags)
-        insight.tags.set(tag_objs)
+        insight.tags.set([t.id for t in tag_objs])
+
+        self._record_change(insight=insight, tags=tag_objs, op=InsightChange.Op.UPDATED)
+        representation_cache.evict_on_commit([insight.id])
 
         return insight
 
+    @transaction.atomic
     def delete(self, *, insight: Insight) -> None:
+        tag_objs = list(insight.tags.all())
+        self._record_change(insight=insight, tags=tag_objs, op=InsightChange.Op.DELETED)
+        representation_cache.evict_on_commit([insight.id])
         insight.delete()
+        self._bump_author_count(user_id=insight.created_by_id, delta=-1)
+
+    @transaction.atomic
+    def recategorize(self, *, ids: Iterable[int], category: str) -> int:
+        """
+        Move a batch of insights to ``category`` with one UPDATE (plus one
+        change-log INSERT); returns how many actually changed.
+        """
+        ChangeLogState.objects.select_for_update().get_or_create(pk=1)
+        changed = list(
+            Insight.objects.filter(id__in=list(ids))
+            .exclude(category=category)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        if changed:
+            before = _latest_seq()
+            Insight.objects.filter(id__in=changed).update(category=category, updated_at=timezone.now())
+            InsightChange.objects.bulk_create(
+                [InsightChange(insight_id=i, op=InsightChange.Op.UPDATED) for i in changed]
+            )
+            publish_change_range.defer({"after": before, "through": _latest_seq()})
+            representation_cache.evict_on_commit(changed)
+        return len(changed)
+
+    @transaction.atomic
+    def delete_many(self, *, ids: Iterable[int]) -> int:
+        """
+        Delete a batch of insights with a constant number of statements,
+        keeping author counters and the change log in step; returns rows deleted.
+        """
+        ChangeLogState.objects.select_for_update().get_or_create(pk=1)
+        rows = Insight.objects.select_for_update().filter(id__in=list(ids))
+        deleted = list(rows.order_by("id").values_list("id", flat=True))
+        if not deleted:
+            return 0
+        fields = _event_fields(deleted)  # the rows are gone by the time events go out
+        before = _latest_seq()
+        InsightChange.objects.bulk_create(
+            [InsightChange(insight_id=i, op=InsightChange.Op.DELETED) for i in deleted]
+        )
+        _publish_changes(
+            InsightChange.objects.filter(seq__gt=before).order_by("seq").values_list("seq", "insight_id", "op"),
+            fields,
+        )
+        for row in Insight.objects.filter(id__in=deleted).order_by().values("created_by_id").annotate(n=Count("id")):
+            self._bump_author_count(user_id=row["created_by_id"], delta=-row["n"])
+        Insight.objects.filter(id__in=deleted).delete()
+        representation_cache.evict_on_commit(deleted)
+        return len(deleted)
+
+    def _bump_author_count(self, *, user_id: int, delta: int) -> None:
+        # Row-level UPDATE keeps concurrent writers from losing increments.
+        if delta > 0:
+            AuthorStats.objects.get_or_create(user_id=user_id)
+        AuthorStats.objects.filter(user_id=user_id, insight_count__gte=-delta).update(
+            insight_count=F("insight_count") + delta
+        )
+
+    def _record_change(self, *, insight: Insight, tags: list[Tag], op: str) -> None:
+        # Locking the state row until commit serialises appends, so a reader
+        # never sees seq N+1 committed before seq N.
+        ChangeLogState.objects.select_for_update().get_or_create(pk=1)
+        change = InsightChange.objects.create(insight_id=insight.id, op=op)
+        publish_on_commit(
+            {
+                "seq": change.seq,
+                "op": op,
+                "id": insight.id,
+                "title": insight.title,
+                "category": insight.category,
+                "tags": [t.name for t in tags],
+            }
+        )
 
     def _get_or_create_tags(self, tags: Iterable[str]) -> list[Tag]:
-        tag_objs = []
-        for tag_name in tags:
-            tag, _ = Tag.objects.get_or_create(name=tag_name.strip())
-            tag_objs.append(tag)
-        return tag_objs
\ No newline at end of file
+        names = canonical_tags(tags)
+        ids = tag_cache.get_many(names)
+        missing = [n for n in names if n not in ids]
+        if missing:
+            resolved = dict(Tag.objects.filter(name__in=missing).values_list("name", "id"))
+            for name in missing:
+                if name not in resolved:
+                    resolved[name] = Tag.objects.get_or_create(name=name)[0].id
+            tag_cache.set_many(resolved)
+            ids.update(resolved)
+        return [Tag(id=ids[name], name=name) for name in names]
+
+
+class EpochSeconds(Func):
+    """Seconds since the Unix epoch of a datetime column, as a float."""
+
+    output_field = FloatField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return super().as_sql(compiler, connection, template="EXTRACT(EPOCH FROM %(expressions)s)", **extra_context)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection, template="((julianday(%(expressions)s) - 2440587.5) * 86400.0)", **extra_context
+        )
+
+
+class EngagementRepository:
+    """Batched writes behind ``ordering=hot``: view counts and the stored hot_score."""
+
+    def add_views(self, counts: dict[int, int]) -> None:
+        """Add buffered retrieve counts; one UPDATE per distinct increment."""
+        by_increment: dict[int, list[int]] = {}
+        for insight_id, n in counts.items():
+            if n > 0:
+                by_increment.setdefault(n, []).append(insight_id)
+        for n, ids in by_increment.items():
+            # Missing ids (deleted or archived since) simply match no row.
+            Insight.objects.filter(id__in=ids).update(view_count=F("view_count") + n, hot_dirty=True)
+
+    def refresh_hot_scores(self, *, batch_size: int = 1000, everything: bool = False) -> int:
+        """
+        Recompute hot_score in the database for rows whose views changed (or,
+        with ``everything``, for all rows, e.g. after changing the half-life).
+        Each batch is a single UPDATE; returns rows refreshed. Views added
+        while a batch runs set hot_dirty again, so nothing is lost.
+        """
+        half_life = float(settings.INSIGHT_HOT_HALF_LIFE_HOURS) * 3600
+        score = Log(Value(2.0), Cast(F("view_count"), FloatField()) + 1.0) + (
+            EpochSeconds("created_at") - HOT_EPOCH.timestamp()
+        ) / half_life
+        refreshed, after = 0, 0
+        while True:
+            rows = Insight.objects.order_by("id")
+            rows = rows.filter(id__gt=after) if everything else rows.filter(hot_dirty=True)
+            ids = list(rows.values_list("id", flat=True)[:batch_size])
+            if not ids:
+                return refreshed
+            refreshed += Insight.objects.filter(id__in=ids).update(hot_score=score, hot_dirty=False)
+            after = ids[-1]
+
+
+class ChangeLogRepository:
+    """Maintenance writes for the InsightChange log."""
+
+    def compact(self, *, before: datetime, batch_size: int = 5000) -> int:
+        """Delete entries older than ``before`` in batches; returns rows deleted."""
+        deleted = 0
+        while True:
+            with transaction.atomic():
+                state, _ = ChangeLogState.objects.select_for_update().get_or_create(pk=1)
+                seqs = list(
+                    InsightChange.objects.filter(created_at__lt=before)
+                    .order_by("seq")
+                    .values_list("seq", flat=True)[:batch_size]
+                )
+                if not seqs:
+                    return deleted
+                InsightChange.objects.filter(seq__lte=seqs[-1]).delete()
+                state.compacted_through = max(state.compacted_through, seqs[-1])
+                state.save(update_fields=["compacted_through"])
+                deleted += len(seqs)
+
+
+@dataclass(frozen=True)
+class TagMergeResult:
+    target: Tag
+    merged: list[str]
+    insights_updated: int
+
+
+class TagRepository:
+    """Set-based maintenance of the tag vocabulary."""
+
+    @transaction.atomic
+    def merge(self, *, sources: Iterable[str], target: str) -> TagMergeResult:
+        """
+        Fold the ``sources`` tags into ``target`` (created if missing) with a
+        constant number of statements, however many insights are tagged.
+        Merging a single source into a new name is a rename.
+        """
+        names = [n for n in dict.fromkeys(sources) if n != target]
+        source_tags = list(Tag.objects.select_for_update().filter(name__in=names).order_by("id"))
+        target_tag = Tag.objects.select_for_update().filter(name=target).first()
+        merged = [t.name for t in source_tags]
+        source_ids = [t.id for t in source_tags]
+        touched = self._touch(source_ids)
+
+        if target_tag is None and len(source_tags) == 1:
+            target_tag = source_tags[0]
+            target_tag.name = target
+            target_tag.save(update_fields=["name"])
+        else:
+            if target_tag is None:
+                target_tag = Tag.objects.create(name=target)
+            if source_ids:
+                self._relink(source_ids=source_ids, target_id=target_tag.id)
+                Tag.objects.filter(id__in=source_ids).delete()
+
+        transaction.on_commit(tag_cache.invalidate)
+        return TagMergeResult(target=target_tag, merged=merged, insights_updated=touched)
+
+    @transaction.atomic
+    def delete(self, *, ids: Iterable[int]) -> int:
+        """
+        Delete tags and their links (hot and archived) in a constant number of
+        statements; insights that lose a tag are marked updated. Returns tags deleted.
+        """
+        tag_ids = list(Tag.objects.select_for_update().filter(id__in=list(ids)).values_list("id", flat=True))
+        if not tag_ids:
+            return 0
+        self._touch(tag_ids)
+        Tag.objects.filter(id__in=tag_ids).delete()
+        transaction.on_commit(tag_cache.invalidate)
+        return len(tag_ids)
+
+    def _relink(self, *, source_ids: list[int], target_id: int) -> None:
+        # Per link table, one INSERT ... SELECT adds the target link to every
+        # insight that had a source tag and lacks the target; deleting the
+        # source tags then cascades to their links.
+        qn = connection.ops.quote_name
+        placeholders = ", ".join(["%s"] * len(source_ids))
+        with connection.cursor() as cursor:
+            for through in (Insight.tags.through, ArchivedInsightTag):
+                table = qn(through._meta.db_table)
+                cursor.execute(
+                    f"INSERT INTO {table} (insight_id, tag_id) "
+                    f"SELECT DISTINCT s.insight_id, %s FROM {table} s "
+                    f"WHERE s.tag_id IN ({placeholders}) AND NOT EXISTS ("
+                    f"SELECT 1 FROM {table} t WHERE t.insight_id = s.insight_id AND t.tag_id = %s)",
+                    [target_id, *source_ids, target_id],
+                )
+
+    def _touch(self, tag_ids: list[int]) -> int:
+        """
+        Mark insights linked to ``tag_ids``, hot and archived, as updated (which
+        also retires their cached representations), in the change feed too: per
+        table one UPDATE and one INSERT ... SELECT driven by the link table.
+        Live events follow after commit, in batches (see publish_change_range).
+        Returns how many insights were touched.
+        """
+        if not tag_ids:
+            return 0
+        ChangeLogState.objects.select_for_update().get_or_create(pk=1)
+        before = _latest_seq()
+        now = timezone.now()
+        qn = connection.ops.quote_name
+        placeholders = ", ".join(["%s"] * len(tag_ids))
+        touched = 0
+        for model, through in ((Insight, Insight.tags.through), (ArchivedInsight, ArchivedInsightTag)):
+            linked = through.objects.filter(tag_id__in=tag_ids).values("insight_id")
+            n = model.objects.filter(id__in=linked).update(updated_at=now)
+            if n:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"INSERT INTO {qn(InsightChange._meta.db_table)} (insight_id, op, created_at) "
+                        f"SELECT DISTINCT insight_id, %s, %s FROM {qn(through._meta.db_table)} "
+                        f"WHERE tag_id IN ({placeholders})",
+                        [InsightChange.Op.UPDATED.value, now, *tag_ids],
+                    )
+            touched += n
+        if touched:
+            publish_change_range.defer({"after": before, "through": _latest_seq()})
+        return touched
+
+
+class ArchiveRepository:
+    """Moves old insights from the hot Insight table to ArchivedInsight."""
+
+    COPIED_COLUMNS = (
+        "id",
+        "title",
+        "category",
+        "body",
+        "created_by_id",
+        "created_at",
+        "updated_at",
+        "view_count",
+        "hot_score",
+    )
+
+    def archive(self, *, before: datetime, batch_size: int = 1000) -> int:
+        """Archive insights created before ``before`` in batches; returns rows moved."""
+        moved = 0
+        while True:
+            with transaction.atomic():
+                # Locking the batch keeps a concurrent edit from landing between copy and delete.
+                ids = list(
+                    Insight.objects.select_for_update(skip_locked=True)
+                    .filter(created_at__lt=before)
+                    .order_by("created_at", "id")
+                    .values_list("id", flat=True)[:batch_size]
+                )
+                if not ids:
+                    return moved
+                self._copy_batch(ids)
+                for row in (
+                    Insight.objects.filter(id__in=ids)
+                    .order_by()
+                    .values("created_by_id")
+                    .annotate(n=Count("id"))
+                ):
+                    AuthorStats.objects.filter(
+                        user_id=row["created_by_id"], insight_count__gte=row["n"]
+                    ).update(insight_count=F("insight_count") - row["n"])
+                Insight.objects.filter(id__in=ids).delete()
+                moved += len(ids)
+
+    def _copy_batch(self, ids: list[int]) -> None:
+        qn = connection.ops.quote_name
+        placeholders = ", ".join(["%s"] * len(ids))
+        columns = ", ".join(qn(c) for c in self.COPIED_COLUMNS)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {qn(ArchivedInsight._meta.db_table)} ({columns}, {qn('archived_at')}) "
+                f"SELECT {columns}, %s FROM {qn(Insight._meta.db_table)} WHERE id IN ({placeholders})",
+                [timezone.now(), *ids],
+            )
+            cursor.execute(
+                f"INSERT INTO {qn(ArchivedInsightTag._meta.db_table)} (insight_id, tag_id) "
+                f"SELECT insight_id, tag_id FROM {qn(Insight.tags.through._meta.db_table)} "
+                f"WHERE insight_id IN ({placeholders})",
+                ids,
+            )
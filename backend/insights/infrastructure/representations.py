@@ -0,0 +1,137 @@
+"""
+Per-insight cache of rendered API representations.
+
+List variants (searches, categories, pages, page sizes) overlap heavily, so
+instead of caching whole responses each insight's serialized form is
+cached on its own under ``insights:repr:<id>`` together with the
+``updated_at`` it was rendered from. A lookup only counts as a hit when
+that timestamp still matches the row's, so any write that bumps
+``updated_at`` (edits, tag merges and deletes, hot or archived) retires the
+entry without coordination.
+InsightRepository also evicts on update and delete to free the space, as a
+deferred task so the write does not wait for the cache.
+
+Hit and miss counters live in the Django cache next to the entries, so
+with a shared CACHES backend the diagnostics endpoint reports all workers.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Iterable, Mapping
+
+from django.conf import settings
+from django.core.cache import cache
+
+from insights.infrastructure.tasks import task
+
+KEY_PREFIX = "insights:repr:"
+HITS_KEY = "insights:repr-stats:hits"
+MISSES_KEY = "insights:repr-stats:misses"
+
+
+@dataclass(frozen=True)
+class InsightKey:
+    """What a list or detail read needs to find a cached representation."""
+
+    id: int
+    updated_at: datetime
+    archived: bool = False
+
+
+def _key(insight_id: int) -> str:
+    return f"{KEY_PREFIX}{insight_id}"
+
+
+def _stamp(updated_at: datetime) -> str:
+    return updated_at.isoformat()
+
+
+class RepresentationCache:
+    """Rendered insights by (id, updated_at), with shared hit/miss counters."""
+
+    @property
+    def enabled(self) -> bool:
+        return settings.INSIGHT_REPRESENTATION_CACHE_TIMEOUT > 0
+
+    def get_many(self, keys: Iterable[InsightKey]) -> dict[int, dict[str, Any]]:
+        """Cached representations that are still current; absent ids are misses."""
+        keys = list(keys)
+        if not self.enabled or not keys:
+            return {}
+        found = self._current(keys, cache.get_many([_key(k.id) for k in keys]))
+        self._count(hits=len(found), misses=len(keys) - len(found))
+        return found
+
+    async def aget_many(self, keys: Iterable[InsightKey]) -> dict[int, dict[str, Any]]:
+        keys = list(keys)
+        if not self.enabled or not keys:
+            return {}
+        found = self._current(keys, await cache.aget_many([_key(k.id) for k in keys]))
+        await self._acount(hits=len(found), misses=len(keys) - len(found))
+        return found
+
+    def set_many(self, rendered: Mapping[int, tuple[datetime, dict[str, Any]]]) -> None:
+        """Store ``{id: (updated_at, representation)}`` for freshly serialized insights."""
+        if self.enabled and rendered:
+            cache.set_many(self._entries(rendered), timeout=settings.INSIGHT_REPRESENTATION_CACHE_TIMEOUT)
+
+    async def aset_many(self, rendered: Mapping[int, tuple[datetime, dict[str, Any]]]) -> None:
+        if self.enabled and rendered:
+            await cache.aset_many(self._entries(rendered), timeout=settings.INSIGHT_REPRESENTATION_CACHE_TIMEOUT)
+
+    def evict_on_commit(self, ids: Iterable[int]) -> None:
+        ids = list(ids)
+        if self.enabled and ids:
+            evict_representations.defer({"ids": ids})
+
+    def stats(self) -> dict[str, Any]:
+        counts = cache.get_many([HITS_KEY, MISSES_KEY])
+        hits, misses = counts.get(HITS_KEY, 0), counts.get(MISSES_KEY, 0)
+        return {
+            "enabled": self.enabled,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+        }
+
+    def reset_stats(self) -> None:
+        cache.delete_many([HITS_KEY, MISSES_KEY])
+
+    def _current(self, keys: list[InsightKey], entries: Mapping[str, Any]) -> dict[int, dict[str, Any]]:
+        found = {}
+        for k in keys:
+            entry = entries.get(_key(k.id))
+            if entry is not None and entry[0] == _stamp(k.updated_at):
+                found[k.id] = entry[1]
+        return found
+
+    def _entries(self, rendered: Mapping[int, tuple[datetime, dict[str, Any]]]) -> dict[str, Any]:
+        return {_key(i): (_stamp(updated_at), data) for i, (updated_at, data) in rendered.items()}
+
+    def _count(self, *, hits: int, misses: int) -> None:
+        for key, n in ((HITS_KEY, hits), (MISSES_KEY, misses)):
+            if n:
+                cache.add(key, 0, timeout=None)
+                try:
+                    cache.incr(key, n)
+                except ValueError:  # evicted between add() and incr()
+                    cache.set(key, n, timeout=None)
+
+    async def _acount(self, *, hits: int, misses: int) -> None:
+        for key, n in ((HITS_KEY, hits), (MISSES_KEY, misses)):
+            if n:
+                await cache.aadd(key, 0, timeout=None)
+                try:
+                    await cache.aincr(key, n)
+                except ValueError:
+                    await cache.aset(key, n, timeout=None)
+
+
+representation_cache = RepresentationCache()
+
+
+@task(batch_size=500)
+def evict_representations(payloads: list[dict[str, Any]]) -> None:
+    """Drop cached representations of changed insights; one cache call per batch of writes."""
+    cache.delete_many([_key(i) for payload in payloads for i in payload["ids"]])
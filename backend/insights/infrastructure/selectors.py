@@ -1,5 +1,106 @@
-from django.db.models import Count, QuerySet, Q
-from insights.models import Insight, Tag
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.db.models import BooleanField, Count, Exists, Model, OuterRef, QuerySet, Q, Value
+from insights.infrastructure.representations import InsightKey
+from insights.infrastructure.tags import canonical_tags, tag_cache
+from insights.models import ArchivedInsight, AuthorStats, ChangeLogState, Insight, InsightChange, Tag
+
+TAG_MODE_ANY = "any"
+TAG_MODE_ALL = "all"
+TAG_MODES = (TAG_MODE_ANY, TAG_MODE_ALL)
+
+# Public ``ordering=`` values -> ORDER BY clause. Every entry is backed by a
+# composite index on Insight (ascending variants use a backward index scan).
+INSIGHT_ORDERINGS: dict[str, tuple[str, ...]] = {
+    "-created_at": ("-created_at", "-id"),
+    "created_at": ("created_at", "id"),
+    "-updated_at": ("-updated_at", "-id"),
+    "updated_at": ("updated_at", "id"),
+    "title": ("title", "id"),
+    "-title": ("-title", "-id"),
+    # Precomputed time-decayed popularity (see EngagementRepository).
+    "hot": ("-hot_score", "-id"),
+}
+DEFAULT_ORDERING = "-created_at"
+
+
+def _clean_tag_names(tags: Iterable[str]) -> set[str]:
+    return set(canonical_tags(tags))
+
+
+class CombinedInsightList:
+    """
+    Hot and archived results of one list query, ordered and paged as one.
+
+    Supports what Django's Paginator needs (``count()`` and slicing). A
+    page costs one UNION over the ordering columns, then one hydration
+    query (plus tag prefetch) per tier.
+    """
+
+    ordered = True
+
+    def __init__(
+        self,
+        *,
+        hot: QuerySet[Insight],
+        archived: QuerySet[ArchivedInsight],
+        ordering: tuple[str, ...],
+        selector: InsightSelector,
+    ):
+        columns = list(dict.fromkeys(["id", "updated_at", *(o.lstrip("-") for o in ordering)]))
+
+        def keys(qs: QuerySet, archived: bool) -> QuerySet:
+            return qs.order_by().values(*columns).annotate(
+                is_archived=Value(archived, output_field=BooleanField())
+            )
+
+        self._union = keys(hot, False).union(keys(archived, True)).order_by(*ordering)
+        self._selector = selector
+        self.db = hot.db
+
+    def count(self) -> int:
+        return self._union.count()
+
+    def explain(self, **options) -> str:
+        return self._union.explain(**options)
+
+    def keys(self, key: slice) -> list[InsightKey]:
+        """One page of (id, updated_at) keys, without hydrating the rows."""
+        return [InsightKey(r["id"], r["updated_at"], r["is_archived"]) for r in self._union[key]]
+
+    def __getitem__(self, key: slice) -> list[Insight | ArchivedInsight]:
+        rows = list(self._union[key])
+        hot = self._selector.get_many(ids=[r["id"] for r in rows if not r["is_archived"]], include_archived=False)
+        cold = self._selector.get_archived_many(ids=[r["id"] for r in rows if r["is_archived"]])
+        return [(cold if r["is_archived"] else hot)[r["id"]] for r in rows]
+
+
+class InsightKeyList:
+    """
+    A list query reduced to (id, updated_at) keys, for pagination ahead of
+    the representation cache: a page costs the COUNT plus one narrow query,
+    and only cache misses are hydrated (see InsightSelector.get_many).
+    """
+
+    ordered = True
+
+    def __init__(self, source: QuerySet[Insight] | CombinedInsightList):
+        self._source = source
+        self.db = source.db
+
+    def count(self) -> int:
+        return self._source.count()
+
+    def explain(self, **options) -> str:
+        return self._source.explain(**options)
+
+    def __getitem__(self, key: slice) -> list[InsightKey]:
+        if isinstance(self._source, CombinedInsightList):
+            return self._source.keys(key)
+        rows = self._source.select_related(None).prefetch_related(None).values_list("id", "updated_at")
+        return [InsightKey(pk, updated_at) for pk, updated_at in rows[key]]
 
 
 class InsightSelector:
@@ -10,9 +111,61 @@ class InsightSelector:
         *,
         search: str | None = None,
         category: str | None = None,
-        tag: str | None = None,
+        created_by: int | None = None,
+        tags: Iterable[str] = (),
+        tag_mode: str = TAG_MODE_ANY,
+        tag_contains: str | None = None,
+        ordering: str = DEFAULT_ORDERING,
+        include_archived: bool = False,
+    ) -> QuerySet[Insight] | CombinedInsightList:
+        names = _clean_tag_names(tags)
+        filters = dict(
+            search=search,
+            category=category,
+            created_by=created_by,
+            tag_names=names,
+            tag_ids=self._resolve_tag_ids(names) if names else [],
+            tag_mode=tag_mode,
+            tag_contains=tag_contains,
+            ordering=ordering,
+        )
+        hot = self._build_list(**filters)
+        if not include_archived:
+            return hot
+        return CombinedInsightList(
+            hot=hot,
+            archived=self._build_list(model=ArchivedInsight, **filters),
+            ordering=INSIGHT_ORDERINGS[ordering],
+            selector=self,
+        )
+
+    def _resolve_tag_ids(self, names: set[str]) -> list[int]:
+        # Resolve names to ids first (tag_cache, then the unique index) so the
+        # through-table subqueries only compare integer ids.
+        found = tag_cache.get_many(names)
+        missing = names - found.keys()
+        if missing:
+            fetched = dict(Tag.objects.filter(name__in=missing).values_list("name", "id"))
+            tag_cache.set_many(fetched)
+            found.update(fetched)
+        return list(found.values())
+
+    def _build_list(
+        self,
+        *,
+        model: type[Model] = Insight,
+        search: str | None,
+        category: str | None,
+        created_by: int | None,
+        tag_names: set[str],
+        tag_ids: list[int],
+        tag_mode: str,
+        tag_contains: str | None,
+        ordering: str,
     ) -> QuerySet[Insight]:
-        qs = Insight.objects.select_related("created_by").prefetch_related("tags")
+        # Builds the queryset without touching the database, so the sync and
+        # async selectors share it. ``model`` is Insight or ArchivedInsight.
+        qs = model.objects.select_related("created_by").prefetch_related("tags")
 
         if search:
             qs = qs.filter(
@@ -24,10 +177,159 @@ class InsightSelector:
         if category:
             qs = qs.filter(category=category)
 
-        if tag:
-            qs = qs.filter(tags__name__icontains=tag)
+        if created_by is not None:
+            qs = qs.filter(created_by_id=created_by)
 
-        return qs
+        if tag_names:
+            qs = self._filter_by_tag_ids(qs, names=tag_names, tag_ids=tag_ids, mode=tag_mode)
+
+        if tag_contains:
+            # Substring match cannot use the Tag.name index; kept as an explicit opt-in.
+            through = model.tags.through.objects.filter(
+                insight_id=OuterRef("pk"),
+                tag__name__icontains=tag_contains,
+            )
+            qs = qs.filter(Exists(through))
+
+        return qs.order_by(*INSIGHT_ORDERINGS[ordering])
+
+    def _filter_by_tag_ids(
+        self,
+        qs: QuerySet[Insight],
+        *,
+        names: set[str],
+        tag_ids: list[int],
+        mode: str,
+    ) -> QuerySet[Insight]:
+        through = qs.model.tags.through.objects
+
+        if mode == TAG_MODE_ALL:
+            if len(tag_ids) != len(names):
+                return qs.none()
+            matching = (
+                through.filter(tag_id__in=tag_ids)
+                .values("insight_id")
+                .annotate(matched=Count("tag_id"))
+                .filter(matched=len(tag_ids))
+                .values("insight_id")
+            )
+            return qs.filter(pk__in=matching)
+
+        if not tag_ids:
+            return qs.none()
+        return qs.filter(Exists(through.filter(insight_id=OuterRef("pk"), tag_id__in=tag_ids)))
+
+    def get_many(
+        self, *, ids: Iterable[int], include_archived: bool = True
+    ) -> dict[int, Insight | ArchivedInsight]:
+        """
+        Fetch insights by id with one insight query and one tag query; ids
+        not in the hot table are looked up in the archive the same way.
+        """
+        ids = list(ids)
+        qs = (
+            Insight.objects.select_related("created_by")
+            .prefetch_related("tags")
+            .filter(pk__in=ids)
+            .order_by()
+        )
+        found: dict[int, Insight | ArchivedInsight] = {insight.pk: insight for insight in qs}
+        missing = [i for i in ids if i not in found]
+        if include_archived and missing:
+            found.update(self.get_archived_many(ids=missing))
+        return found
+
+    def get_key(self, *, pk: int) -> InsightKey | None:
+        """(id, updated_at) of one insight, hot table first, then the archive."""
+        for model in (Insight, ArchivedInsight):
+            updated_at = model.objects.filter(pk=pk).values_list("updated_at", flat=True).first()
+            if updated_at is not None:
+                return InsightKey(pk, updated_at, archived=model is ArchivedInsight)
+        return None
+
+    def get_archived_many(self, *, ids: Iterable[int]) -> dict[int, ArchivedInsight]:
+        qs = (
+            ArchivedInsight.objects.select_related("created_by")
+            .prefetch_related("tags")
+            .filter(pk__in=list(ids))
+            .order_by()
+        )
+        return {insight.pk: insight for insight in qs}
+
+    def count_by_author(self, *, user_id: int) -> int:
+        """Cached insight count for one author (maintained by InsightRepository)."""
+        count = (
+            AuthorStats.objects.filter(user_id=user_id)
+            .values_list("insight_count", flat=True)
+            .first()
+        )
+        return count or 0
+
+
+class AsyncInsightSelector(InsightSelector):
+    """Async counterparts of InsightSelector reads, for ASGI views."""
+
+    async def alist(
+        self,
+        *,
+        search: str | None = None,
+        category: str | None = None,
+        created_by: int | None = None,
+        tags: Iterable[str] = (),
+        tag_mode: str = TAG_MODE_ANY,
+        tag_contains: str | None = None,
+        ordering: str = DEFAULT_ORDERING,
+    ) -> QuerySet[Insight]:
+        names = _clean_tag_names(tags)
+        return self._build_list(
+            search=search,
+            category=category,
+            created_by=created_by,
+            tag_names=names,
+            tag_ids=await self._aresolve_tag_ids(names) if names else [],
+            tag_mode=tag_mode,
+            tag_contains=tag_contains,
+            ordering=ordering,
+        )
+
+    async def _aresolve_tag_ids(self, names: set[str]) -> list[int]:
+        found = await tag_cache.aget_many(names)
+        missing = names - found.keys()
+        if missing:
+            fetched = {n: i async for n, i in Tag.objects.filter(name__in=missing).values_list("name", "id")}
+            await tag_cache.aset_many(fetched)
+            found.update(fetched)
+        return list(found.values())
+
+    async def apage_keys(self, qs: QuerySet[Insight], *, offset: int, limit: int) -> list[InsightKey]:
+        rows = qs.select_related(None).prefetch_related(None).values_list("id", "updated_at")
+        return [InsightKey(pk, updated_at) async for pk, updated_at in rows[offset:offset + limit]]
+
+    async def aget_key(self, *, pk: int) -> InsightKey | None:
+        for model in (Insight, ArchivedInsight):
+            updated_at = await model.objects.filter(pk=pk).values_list("updated_at", flat=True).afirst()
+            if updated_at is not None:
+                return InsightKey(pk, updated_at, archived=model is ArchivedInsight)
+        return None
+
+    async def aget_many(self, *, keys: Iterable[InsightKey]) -> dict[int, Insight | ArchivedInsight]:
+        """Hydrate ``keys`` from their tier: one row query plus one tag query per tier."""
+        found: dict[int, Insight | ArchivedInsight] = {}
+        keys = list(keys)
+        for model, archived in ((Insight, False), (ArchivedInsight, True)):
+            ids = [k.id for k in keys if k.archived is archived]
+            if ids:
+                qs = model.objects.select_related("created_by").prefetch_related("tags").filter(pk__in=ids)
+                found.update({i.pk: i async for i in qs.order_by().aiterator(chunk_size=len(ids))})
+        return found
+
+    async def acount_by_author(self, *, user_id: int) -> int:
+        count = await (
+            AuthorStats.objects.filter(user_id=user_id)
+            .values_list("insight_count", flat=True)
+            .afirst()
+        )
+        return count or 0
 
 
 class TagAnalyticsSelector:
@@ -37,4 +339,36 @@ class TagAnalyticsSelector:
         return (
             Tag.objects.annotate(count=Count("insights"))
             .order_by("-count")[:limit]
-        )
\ No newline at end of file
+        )
+
+
+class TagSelector:
+    """Reads over the tag vocabulary itself."""
+
+    def existing_names(self, *, names: Iterable[str]) -> set[str]:
+        return set(Tag.objects.filter(name__in=list(names)).values_list("name", flat=True))
+
+    def all_names(self) -> list[str]:
+        return list(Tag.objects.order_by("name").values_list("name", flat=True))
+
+
+class ChangeFeedSelector:
+    """Reads the insight change log by sequence number."""
+
+    def compacted_through(self) -> int:
+        value = ChangeLogState.objects.filter(pk=1).values_list("compacted_through", flat=True).first()
+        return value or 0
+
+    def latest_seq(self) -> int:
+        return InsightChange.objects.order_by("-seq").values_list("seq", flat=True).first() or 0
+
+    def changes_since(self, *, since: int, limit: int) -> list[InsightChange]:
+        # Primary-key range scan: cost is proportional to the changes returned.
+        return list(InsightChange.objects.filter(seq__gt=since).order_by("seq")[:limit])
+
+
+class AsyncTagAnalyticsSelector(TagAnalyticsSelector):
+    """Async counterpart of TagAnalyticsSelector."""
+
+    async def atop_tags(self, *, limit: int = 10) -> list[Tag]:
+        return [t async for t in self.top_tags(limit=limit)]
@@ -0,0 +1,123 @@
+"""Tag name handling shared by insight writes, list filters and bulk loads."""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Iterable, Mapping
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+TAG_CACHE_VERSION_KEY = "insights:tag-ids:version"
+
+
+@lru_cache(maxsize=None)
+def _load_rule(path: str) -> Callable[[str], str]:
+    return import_string(path)
+
+
+def canonical_tag(name: str) -> str:
+    """``name`` stripped and passed through settings.INSIGHT_TAG_CANONICALIZER, if set."""
+    name = name.strip()
+    path = settings.INSIGHT_TAG_CANONICALIZER
+    return _load_rule(path)(name).strip() if path else name
+
+
+def canonical_tags(names: Iterable[str]) -> list[str]:
+    """Canonical names without blanks or duplicates, in first-seen order."""
+    canonical = (canonical_tag(n) for n in names if n and n.strip())
+    return list(dict.fromkeys(n for n in canonical if n))
+
+
+class TagIdCache:
+    """
+    Bounded, thread-safe LRU map of tag name -> id for this process.
+
+    Every lookup first compares a version number kept in the Django cache
+    (settings.CACHES, shared between workers in production) with the one
+    the local entries were filled under; `invalidate()` bumps it, so renames
+    and merges in one worker empty the map in all of them. Tags are only
+    ever added by other writers, so a miss simply falls through to the
+    database.
+    """
+
+    def __init__(self, maxsize: int | None = None) -> None:
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._version: int | None = None
+
+    @property
+    def maxsize(self) -> int:
+        return settings.INSIGHT_TAG_CACHE_SIZE if self._maxsize is None else self._maxsize
+
+    def get_many(self, names: Iterable[str]) -> dict[str, int]:
+        """Cached ids for ``names``; absent names are misses."""
+        self._sync_version(cache.get(TAG_CACHE_VERSION_KEY))
+        return self._lookup(names)
+
+    async def aget_many(self, names: Iterable[str]) -> dict[str, int]:
+        self._sync_version(await cache.aget(TAG_CACHE_VERSION_KEY))
+        return self._lookup(names)
+
+    def set_many(self, mapping: Mapping[str, int]) -> None:
+        """Remember ids read or created after a `get_many`, once the transaction commits."""
+        if mapping and self.maxsize > 0:
+            mapping, version = dict(mapping), self._version
+            transaction.on_commit(lambda: self._store(mapping, version, cache.get(TAG_CACHE_VERSION_KEY)))
+
+    async def aset_many(self, mapping: Mapping[str, int]) -> None:
+        # Async views never run inside a transaction, so there is nothing to wait for.
+        if mapping and self.maxsize > 0:
+            self._store(mapping, self._version, await cache.aget(TAG_CACHE_VERSION_KEY))
+
+    def invalidate(self) -> None:
+        """Drop the map here and, via the version key, in every other worker."""
+        cache.add(TAG_CACHE_VERSION_KEY, 0, timeout=None)
+        try:
+            cache.incr(TAG_CACHE_VERSION_KEY)
+        except ValueError:  # evicted between add() and incr()
+            cache.set(TAG_CACHE_VERSION_KEY, 1, timeout=None)
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _sync_version(self, version: int | None) -> None:
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+
+    def _lookup(self, names: Iterable[str]) -> dict[str, int]:
+        found = {}
+        with self._lock:
+            for name in names:
+                tag_id = self._entries.get(name)
+                if tag_id is not None:
+                    self._entries.move_to_end(name)
+                    found[name] = tag_id
+        return found
+
+    def _store(self, mapping: Mapping[str, int], read_under: int | None, current: int | None) -> None:
+        # Ids read before an invalidation elsewhere may already be stale.
+        maxsize = self.maxsize
+        with self._lock:
+            if read_under != current or current != self._version:
+                return
+            self._entries.update(mapping)
+            for name in mapping:
+                self._entries.move_to_end(name)
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+
+
+tag_cache = TagIdCache()
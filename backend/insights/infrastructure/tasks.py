@@ -0,0 +1,322 @@
+"""
+Deferred side effects.
+
+Work a write's response does not have to wait for (cache eviction fan-out,
+score refreshes, rollups, notifications) is declared as a task and
+deferred from the write path:
+
+    @task(batch_size=500)
+    def evict_representations(payloads: list[dict]) -> None: ...
+
+    evict_representations.defer({"ids": [1, 2]})
+
+Handlers always receive a list of payloads: pending tasks of the same type
+run together, so a burst of writes costs one handler call per batch rather
+than one per write. A deferred task only runs if the enqueuing transaction
+commits. settings.INSIGHT_TASK_BACKEND decides where it runs:
+
+- ImmediateTaskBackend: right after commit, in the calling thread (tests).
+- ThreadPoolTaskBackend: after commit, in settings.INSIGHT_TASK_WORKERS
+  threads of this process, batching whatever is pending and retrying with
+  backoff; queued work is lost on exit (development, single worker).
+- DatabaseTaskBackend: a DeferredTask row written in the enqueuing
+  transaction, run by `manage.py run_workers`. Survives restarts (a crashed
+  worker's batch runs again once its lease lapses), retries with exponential
+  backoff and parks tasks that keep failing as dead.
+
+Run counts, failures and enqueue-to-done latency are counted in the Django
+cache (shared between workers); task_stats() adds each backend's queue depth.
+"""
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import update_wrapper
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from insights.models import DeferredTask
+
+logger = logging.getLogger(__name__)
+
+RETRY_BASE_SECONDS = 2.0
+RETRY_MAX_SECONDS = 600.0
+LEASE_SECONDS = 300  # how long a claimed batch is hidden from other workers
+STATS_KEY_PREFIX = "insights:task-stats:"
+COUNTERS = ("runs", "tasks", "failures", "dead", "latency_ms")
+
+
+def backoff(attempt: int) -> float:
+    """Seconds to wait after failed attempt number ``attempt``: doubling, capped, jittered."""
+    return min(RETRY_BASE_SECONDS * 2 ** (attempt - 1), RETRY_MAX_SECONDS) * random.uniform(0.5, 1.0)
+
+
+class Task:
+    """A handler for batches of payloads, addressed by its dotted path."""
+
+    def __init__(self, fn: Callable[[list[dict[str, Any]]], None], *, batch_size: int, max_attempts: int):
+        update_wrapper(self, fn)
+        self.fn = fn
+        self.name = f"{fn.__module__}.{fn.__qualname__}"
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+
+    def __call__(self, payloads: list[dict[str, Any]]) -> None:
+        self.fn(payloads)
+
+    def defer(self, payload: dict[str, Any] | None = None) -> None:
+        """Run with ``payload`` once the current transaction commits."""
+        get_task_backend().enqueue(self, payload or {})
+
+
+def task(*, batch_size: int = 100, max_attempts: int = 5) -> Callable[[Callable], Task]:
+    """Declare a module-level function as a task (see module docstring)."""
+    return lambda fn: Task(fn, batch_size=batch_size, max_attempts=max_attempts)
+
+
+def resolve(name: str) -> Task:
+    handler = import_string(name)
+    if not isinstance(handler, Task):
+        raise ImportError(f"{name} is not a task")
+    return handler
+
+
+class TaskMetrics:
+    """Counters shared through the Django cache, like the representation cache's."""
+
+    def record(self, *, tasks: int, latency_ms: float = 0.0, failed: bool = False, dead: int = 0) -> None:
+        counts = {"runs": int(bool(tasks)), "tasks": 0 if failed else tasks, "failures": int(failed), "dead": dead}
+        counts["latency_ms"] = 0 if failed else round(latency_ms)
+        for name, n in counts.items():
+            if n:
+                key = STATS_KEY_PREFIX + name
+                cache.add(key, 0, timeout=None)
+                try:
+                    cache.incr(key, n)
+                except ValueError:  # evicted between add() and incr()
+                    cache.set(key, n, timeout=None)
+
+    def stats(self) -> dict[str, Any]:
+        values = cache.get_many([STATS_KEY_PREFIX + c for c in COUNTERS])
+        counts = {c: values.get(STATS_KEY_PREFIX + c, 0) for c in COUNTERS}
+        latency = counts.pop("latency_ms")
+        counts["avg_latency_ms"] = round(latency / counts["tasks"], 1) if counts["tasks"] else None
+        return counts
+
+    def reset(self) -> None:
+        cache.delete_many([STATS_KEY_PREFIX + c for c in COUNTERS])
+
+
+task_metrics = TaskMetrics()
+
+
+def _run(task: Task, payloads: list[dict[str, Any]], enqueued_at: list[float]) -> bool:
+    """Run one batch in this process and count it; False if the handler raised."""
+    try:
+        task(payloads)
+    except Exception:
+        logger.exception("Task %s failed (%d payloads)", task.name, len(payloads))
+        task_metrics.record(tasks=len(payloads), failed=True)
+        return False
+    now = time.time()
+    task_metrics.record(tasks=len(payloads), latency_ms=sum(now - t for t in enqueued_at) * 1000)
+    return True
+
+
+class ImmediateTaskBackend:
+    """Runs each task right after commit in the calling thread; no retries."""
+
+    def enqueue(self, task: Task, payload: dict[str, Any]) -> None:
+        enqueued_at = time.time()
+        transaction.on_commit(lambda: _run(task, [payload], [enqueued_at]))
+
+    def depth(self) -> dict[str, Any]:
+        return {}
+
+
+class ThreadPoolTaskBackend:
+    """In-process executor: per-task pending lists drained in batches by a thread pool."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: dict[str, list[tuple[dict[str, Any], float]]] = {}
+        self._executor: ThreadPoolExecutor | None = None
+
+    def enqueue(self, task: Task, payload: dict[str, Any]) -> None:
+        enqueued_at = time.time()
+        transaction.on_commit(lambda: self._add(task, (payload, enqueued_at)))
+
+    def depth(self) -> dict[str, Any]:
+        with self._lock:
+            return {name: {"queued": len(items)} for name, items in self._pending.items() if items}
+
+    def shutdown(self) -> None:
+        """Wait for running batches; the next task starts a new pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _add(self, task: Task, item: tuple[dict[str, Any], float]) -> None:
+        with self._lock:
+            pending = self._pending.setdefault(task.name, [])
+            pending.append(item)
+            if len(pending) > 1:
+                return  # a drain for this task is already scheduled
+        self._submit(self._drain, task)
+
+    def _drain(self, task: Task) -> None:
+        while True:
+            with self._lock:
+                pending = self._pending.get(task.name, [])
+                batch, pending[:] = pending[: task.batch_size], pending[task.batch_size :]
+            if not batch:
+                return
+            self._attempt(task, batch, attempt=1)
+
+    def _attempt(self, task: Task, batch: list[tuple[dict[str, Any], float]], attempt: int) -> None:
+        try:
+            if _run(task, [p for p, _ in batch], [t for _, t in batch]):
+                return
+        finally:
+            connections.close_all()
+        if attempt >= task.max_attempts:
+            task_metrics.record(tasks=0, dead=len(batch))
+            return
+        retry = threading.Timer(backoff(attempt), self._submit, args=(self._attempt, task, batch, attempt + 1))
+        retry.daemon = True
+        retry.start()
+
+    def _submit(self, fn: Callable, *args) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.INSIGHT_TASK_WORKERS, thread_name_prefix="insight-task"
+                )
+            executor = self._executor
+        executor.submit(fn, *args)
+
+
+class DatabaseTaskBackend:
+    """Durable queue in DeferredTask; ``run_batch`` is one step of `manage.py run_workers`."""
+
+    def enqueue(self, task: Task, payload: dict[str, Any]) -> None:
+        # Written in the caller's transaction: rolled back with it, visible to
+        # workers only once it commits.
+        DeferredTask.objects.create(name=task.name, payload=payload, run_after=timezone.now())
+
+    def depth(self) -> dict[str, Any]:
+        now = timezone.now()
+        depth: dict[str, Any] = {}
+        rows = (
+            DeferredTask.objects.order_by()
+            .values("name")
+            .annotate(
+                queued=Count("id", filter=Q(status=DeferredTask.Status.QUEUED)),
+                ready=Count("id", filter=Q(status=DeferredTask.Status.QUEUED, run_after__lte=now)),
+                dead=Count("id", filter=Q(status=DeferredTask.Status.DEAD)),
+                oldest=Min("created_at", filter=Q(status=DeferredTask.Status.QUEUED)),
+            )
+        )
+        for row in rows:
+            oldest = row.pop("oldest")
+            row["oldest_age_s"] = round((now - oldest).total_seconds(), 1) if oldest else None
+            depth[row.pop("name")] = row
+        return depth
+
+    def run_batch(self) -> int:
+        """
+        Claim the oldest runnable task and up to its batch size of others of
+        the same type, run them in one handler call and delete them (or
+        schedule a retry); returns how many were taken. Call it outside a
+        transaction, so the claim is visible to other workers at once.
+        """
+        while True:
+            now = timezone.now()
+            ready = DeferredTask.objects.filter(status=DeferredTask.Status.QUEUED, run_after__lte=now)
+            head = ready.order_by("run_after", "id").only("id", "name").first()
+            if head is None:
+                return 0
+            try:
+                task, error = resolve(head.name), ""
+            except ImportError as exc:
+                task, error = None, f"{type(exc).__name__}: {exc}"
+            others = ready.filter(name=head.name).exclude(id=head.id).order_by("run_after", "id")
+            ids = [head.id, *others.values_list("id", flat=True)[: task.batch_size - 1 if task else 0]]
+            rows = self._claim(ids, now)
+            if rows:
+                break
+            # Another worker claimed them between the read and the claim.
+
+        if task is None:
+            self._fail(rows, max_attempts=0, error=error)
+            return len(rows)
+        try:
+            with transaction.atomic():  # a failed batch's own writes roll back
+                task([r.payload for r in rows])
+                DeferredTask.objects.filter(id__in=[r.id for r in rows], claim=rows[0].claim).delete()
+        except Exception as exc:
+            logger.exception("Task %s failed (%d payloads)", task.name, len(rows))
+            self._fail(rows, max_attempts=task.max_attempts, error=f"{type(exc).__name__}: {exc}")
+            return len(rows)
+        done = timezone.now()  # enqueue-to-done, as the in-process backends count it
+        latency = sum((done - r.created_at).total_seconds() for r in rows) * 1000
+        task_metrics.record(tasks=len(rows), latency_ms=latency)
+        return len(rows)
+
+    def _claim(self, ids: list[int], now: datetime) -> list[DeferredTask]:
+        # One conditional UPDATE: a row already claimed by another worker no
+        # longer matches (its run_after moved past now), on every database,
+        # SQLite included. The lease must outlast the batch or it runs twice.
+        token = uuid.uuid4()
+        claimed = DeferredTask.objects.filter(id__in=ids, status=DeferredTask.Status.QUEUED, run_after__lte=now).update(
+            claim=token, run_after=now + timedelta(seconds=LEASE_SECONDS)
+        )
+        if not claimed:
+            return []
+        return list(DeferredTask.objects.filter(id__in=ids, claim=token).order_by("id"))
+
+    def _fail(self, rows: list[DeferredTask], *, max_attempts: int, error: str) -> None:
+        ids = [r.id for r in rows]
+        attempt = max(r.attempts for r in rows) + 1
+        DeferredTask.objects.filter(id__in=ids).update(
+            claim=None,
+            attempts=F("attempts") + 1,
+            last_error=error[:2000],
+            run_after=timezone.now() + timedelta(seconds=backoff(attempt)),
+        )
+        dead = DeferredTask.objects.filter(id__in=ids, attempts__gte=max_attempts).update(
+            status=DeferredTask.Status.DEAD
+        )
+        task_metrics.record(tasks=len(rows), failed=True, dead=dead)
+
+
+_backends: dict[str, Any] = {}
+_backends_lock = threading.Lock()
+
+
+def get_task_backend():
+    path = settings.INSIGHT_TASK_BACKEND
+    with _backends_lock:
+        if path not in _backends:
+            _backends[path] = import_string(path)()
+        return _backends[path]
+
+
+def task_stats() -> dict[str, Any]:
+    return {
+        "backend": settings.INSIGHT_TASK_BACKEND.rsplit(".", 1)[-1],
+        "queue": get_task_backend().depth(),
+        **task_metrics.stats(),
+    }
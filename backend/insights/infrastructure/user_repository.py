@@ -1,47 +1,50 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
-
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
-from django.db import IntegrityError
+from django.db import IntegrityError, connection, transaction
 
 User = get_user_model()
 
+# Partial unique index on non-blank emails (migration 0007_unique_user_email).
+EMAIL_UNIQUE_INDEX = "insights_user_email_uniq"
+
 
 class UserAlreadyExistsError(Exception):
-    pass
+    def __init__(self, field: str) -> None:
+        super().__init__(f"{field} already exists")
+        self.field = field
 
 
-@dataclass(frozen=True)
-class CreatedUser:
-    id: int
-    username: str
-    email: str
+def _conflicting_field(exc: IntegrityError) -> str:
+    # Postgres names the violated constraint; SQLite reports "table.column".
+    constraint = getattr(getattr(exc.__cause__, "diag", None), "constraint_name", None)
+    if constraint is not None:
+        return "email" if constraint == EMAIL_UNIQUE_INDEX else "username"
+    return "email" if str(exc).endswith(".email") else "username"
 
 
 class UserRepository:
-    def create_user(self, *, username: str, email: str, password: str) -> CreatedUser:
+    def create_user(self, *, username: str, email: str, password_hash: str) -> User:
+        """
+        Insert a user with an already hashed password. Duplicates are caught
+        by the unique constraints rather than checked up front, so this is a
+        single INSERT.
+        """
+        user = User(
+            username=User.normalize_username(username),
+            email=User.objects.normalize_email(email),
+            password=password_hash,
+        )
         try:
-            user = User.objects.create_user(
-                username=username,
-                email=email,
-                password=password,
-            )
+            if connection.in_atomic_block:
+                with transaction.atomic():  # savepoint keeps the caller's transaction usable
+                    user.save(force_insert=True)
+            else:
+                user.save(force_insert=True)
         except IntegrityError as exc:
-            # Covers unique constraints (username/email) depending on your User model config
-            raise UserAlreadyExistsError("User already exists") from exc
-
-        return CreatedUser(
-            id=user.id,
-            username=user.username,
-            email=user.email or "",
-        )
-
-    def exists_by_username(self, *, username: str) -> bool:
-        return User.objects.filter(username=username).exists()
+            raise UserAlreadyExistsError(_conflicting_field(exc)) from exc
+        return user
 
-    def exists_by_email(self, *, email: str) -> bool:
-        if not email:
-            return False
-        return User.objects.filter(email=email).exists()
\ No newline at end of file
+    async def acreate_user(self, *, username: str, email: str, password_hash: str) -> User:
+        return await sync_to_async(self.create_user)(username=username, email=email, password_hash=password_hash)
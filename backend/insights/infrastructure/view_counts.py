@@ -0,0 +1,108 @@
+"""
+Buffered retrieve counts for ``ordering=hot``.
+
+Counting a view must not cost the detail read a write, so retrieves only
+bump an in-process counter. A background thread hands the accumulated
+counts to EngagementRepository.add_views every
+settings.INSIGHT_VIEW_FLUSH_SECONDS (sooner once
+settings.INSIGHT_VIEW_FLUSH_MAX_PENDING views are waiting), which costs one
+UPDATE per distinct increment rather than one per view, then defers a
+hot_score refresh for the rows it touched. With the interval set to 0 there
+is no thread, and the retrieve that fills the buffer flushes it. Pending
+counts are also flushed at interpreter exit; a worker that is killed loses at
+most one interval of views, which a popularity signal can afford.
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections
+
+from insights.infrastructure.repositories import EngagementRepository
+from insights.infrastructure.tasks import task
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCountBuffer:
+    """Per-process view counter flushed to the database in batches."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: Counter[int] = Counter()
+        self._total = 0
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._exit_flush_registered = False
+
+    def record(self, insight_id: int) -> None:
+        with self._lock:
+            self._pending[insight_id] += 1
+            self._total += 1
+            full = self._total >= settings.INSIGHT_VIEW_FLUSH_MAX_PENDING
+            if not self._exit_flush_registered:
+                atexit.register(self.flush)
+                self._exit_flush_registered = True
+            if self._thread is None and settings.INSIGHT_VIEW_FLUSH_SECONDS > 0:
+                self._thread = threading.Thread(target=self._run, name="view-count-flush", daemon=True)
+                self._thread.start()
+            background = self._thread is not None
+        if not full:
+            return
+        if background:
+            self._wake.set()
+            return
+        # No flusher thread (INSIGHT_VIEW_FLUSH_SECONDS = 0): keep the buffer
+        # bounded by flushing in the recording request.
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Failed to flush view counts")
+
+    def pending(self) -> dict[int, int]:
+        with self._lock:
+            return dict(self._pending)
+
+    def flush(self) -> int:
+        """Write pending counts now; returns the number of views written."""
+        with self._lock:
+            counts, self._pending, self._total = self._pending, Counter(), 0
+        if counts:
+            try:
+                EngagementRepository().add_views(counts)
+            except Exception:
+                # Put them back for the next attempt rather than dropping them.
+                with self._lock:
+                    self._pending.update(counts)
+                    self._total += sum(counts.values())
+                raise
+            refresh_hot_scores.defer()
+        return sum(counts.values())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending, self._total = Counter(), 0
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(settings.INSIGHT_VIEW_FLUSH_SECONDS or None)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Failed to flush view counts")
+            finally:
+                connections.close_all()
+
+
+view_counts = ViewCountBuffer()
+
+
+@task(batch_size=1000)
+def refresh_hot_scores(payloads: list[dict]) -> None:
+    """Recompute dirty hot scores; any number of queued flushes need only one run."""
+    EngagementRepository().refresh_hot_scores()
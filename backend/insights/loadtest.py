@@ -0,0 +1,458 @@
+"""
+HTTP load generator behind `manage.py loadtest`.
+
+Talks plain HTTP/1.1 with keep-alive over asyncio streams, so it needs no
+extra dependency and works the same against runserver, gunicorn (WSGI) or
+uvicorn (ASGI). Virtual users run weighted scenario steps, either back to
+back (closed loop, ``concurrency``) or on a fixed schedule (open loop,
+``rate`` steps per second), and every request is timed per route.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import random
+import secrets
+import ssl
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+from urllib.parse import urlencode, urlsplit
+
+DEFAULT_MIX = "browse:6,search:2,top-tags:1"
+SEARCH_TERMS = ("rates", "inflation", "equities", "credit", "growth", "policy")
+ORDERINGS = ("-created_at", "-updated_at", "title")
+CATEGORIES = ("Macro", "Equities", "FixedIncome", "Alternatives")
+
+
+@dataclass
+class HTTPResponse:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+    def json(self) -> Any:
+        return json.loads(self.body) if self.body else None
+
+
+class AsyncHTTPClient:
+    """Minimal HTTP/1.1 client with a bounded keep-alive connection pool."""
+
+    def __init__(self, base_url: str, *, max_connections: int = 100, timeout: float = 30.0):
+        url = urlsplit(base_url)
+        self.host = url.hostname or "127.0.0.1"
+        self.port = url.port or (443 if url.scheme == "https" else 80)
+        self.host_header = url.netloc
+        self.prefix = url.path.rstrip("/")
+        self.ssl = ssl.create_default_context() if url.scheme == "https" else None
+        self.timeout = timeout
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        json_body: Any = None,
+        headers: dict[str, str] | None = None,
+    ) -> HTTPResponse:
+        body = json.dumps(json_body).encode() if json_body is not None else b""
+        head = [
+            f"{method} {self.prefix}{path} HTTP/1.1",
+            f"Host: {self.host_header}",
+            "Accept: application/json",
+            f"Content-Length: {len(body)}",
+        ]
+        if body:
+            head.append("Content-Type: application/json")
+        head += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        payload = ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+        async with self._slots:
+            while True:
+                reused = bool(self._idle)
+                conn = self._idle.pop() if reused else await self._connect()
+                try:
+                    response, keep_alive = await asyncio.wait_for(self._roundtrip(conn, method, payload), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    conn[1].close()
+                    if reused:
+                        continue  # the server closed an idle keep-alive connection
+                    raise
+                except BaseException:
+                    conn[1].close()
+                    raise
+                if keep_alive:
+                    self._idle.append(conn)
+                else:
+                    conn[1].close()
+                return response
+
+    async def close(self) -> None:
+        while self._idle:
+            self._idle.pop()[1].close()
+
+    async def _connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        return await asyncio.wait_for(asyncio.open_connection(self.host, self.port, ssl=self.ssl), self.timeout)
+
+    async def _roundtrip(self, conn, method: str, payload: bytes) -> tuple[HTTPResponse, bool]:
+        reader, writer = conn
+        writer.write(payload)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed before response")
+        version, status, *_ = status_line.decode("latin-1").split(" ", 2)
+        headers: dict[str, str] = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        status_code = int(status)
+        keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        if method == "HEAD" or status_code in (204, 304) or status_code < 200:
+            body = b""
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            body = await self._read_chunked(reader)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body, keep_alive = await reader.read(), False
+        return HTTPResponse(status_code, headers, body), keep_alive
+
+    async def _read_chunked(self, reader: asyncio.StreamReader) -> bytes:
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0].strip(), 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list (0.0 when empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+@dataclass
+class RouteStats:
+    latencies_ms: list[float] = field(default_factory=list)
+    status_codes: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+
+
+class Recorder:
+    """Times requests per route label; only records once warm-up is over."""
+
+    def __init__(self) -> None:
+        self.routes: dict[str, RouteStats] = defaultdict(RouteStats)
+        self.recording = False
+
+    async def call(self, client: AsyncHTTPClient, route: str, method: str, path: str, **kwargs) -> HTTPResponse | None:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+        except Exception as e:
+            if self.recording:
+                self.routes[route].errors[type(e).__name__] += 1
+            return None
+        if self.recording:
+            stats = self.routes[route]
+            stats.latencies_ms.append((time.perf_counter() - start) * 1000)
+            stats.status_codes[response.status] += 1
+            if response.status >= 400:
+                stats.errors[str(response.status)] += 1
+        return response
+
+    def report(self, elapsed_s: float) -> dict[str, Any]:
+        routes = {name: self._summarize(stats, elapsed_s) for name, stats in sorted(self.routes.items())}
+        total = RouteStats()
+        for stats in self.routes.values():
+            total.latencies_ms += stats.latencies_ms
+            total.status_codes.update(stats.status_codes)
+            total.errors.update(stats.errors)
+        return {"routes": routes, "total": self._summarize(total, elapsed_s)}
+
+    def _summarize(self, stats: RouteStats, elapsed_s: float) -> dict[str, Any]:
+        latencies = sorted(stats.latencies_ms)
+        requests = len(latencies) + sum(v for k, v in stats.errors.items() if not k.isdigit())
+        return {
+            "requests": requests,
+            "rps": round(requests / elapsed_s, 2) if elapsed_s else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+            "status_codes": {str(k): v for k, v in sorted(stats.status_codes.items())},
+            "errors": dict(sorted(stats.errors.items())),
+        }
+
+
+@dataclass
+class VirtualUser:
+    client: AsyncHTTPClient
+    recorder: Recorder
+    api: str
+    rng: random.Random
+    credentials: tuple[str, str] | None = None
+    token: str | None = None
+    seen_ids: list[int] = field(default_factory=list)
+    tags: list[str] = field(default_factory=list)
+
+    async def call(self, route: str, method: str, path: str, **kwargs) -> HTTPResponse | None:
+        if self.token:
+            kwargs.setdefault("headers", {})["Authorization"] = f"Bearer {self.token}"
+        return await self.recorder.call(self.client, route, method, f"{self.api}{path}", **kwargs)
+
+    def remember(self, response: HTTPResponse | None) -> None:
+        if response is not None and response.status == 200:
+            ids = [r["id"] for r in (response.json() or {}).get("results", [])]
+            if ids:
+                self.seen_ids = ids
+
+
+async def browse(vu: VirtualUser) -> None:
+    params = {"ordering": vu.rng.choice(ORDERINGS)}
+    if vu.rng.random() < 0.3:
+        params["category"] = vu.rng.choice(CATEGORIES)
+    vu.remember(await vu.call("GET insights/ (list)", "GET", f"/insights/?{urlencode(params)}"))
+    if vu.seen_ids:
+        await vu.call("GET insights/<id>/", "GET", f"/insights/{vu.rng.choice(vu.seen_ids)}/")
+
+
+async def search(vu: VirtualUser) -> None:
+    if vu.tags and vu.rng.random() < 0.5:
+        query = {"tag": vu.rng.choice(vu.tags)}
+        route = "GET insights/?tag="
+    else:
+        query = {"search": vu.rng.choice(SEARCH_TERMS)}
+        route = "GET insights/?search="
+    vu.remember(await vu.call(route, "GET", f"/insights/?{urlencode(query)}"))
+
+
+async def top_tags(vu: VirtualUser) -> None:
+    response = await vu.call("GET analytics/top-tags/", "GET", "/analytics/top-tags/")
+    if response is not None and response.status == 200:
+        vu.tags = [t["name"] for t in response.json()["tags"]] or vu.tags
+
+
+async def author(vu: VirtualUser) -> None:
+    if vu.token is None:
+        await login(vu)
+        if vu.token is None:
+            return
+    n = vu.rng.randrange(1_000_000)
+    created = await vu.call(
+        "POST insights/",
+        "POST",
+        "/insights/",
+        json_body={
+            "title": f"Load test insight {n}",
+            "category": vu.rng.choice(CATEGORIES),
+            "body": "Generated by manage.py loadtest to exercise the write path. " * 3,
+            "tags": ["loadtest", vu.rng.choice(SEARCH_TERMS)],
+        },
+    )
+    if created is None or created.status != 201:
+        return
+    insight_id = created.json()["id"]
+    await vu.call(
+        "PATCH insights/<id>/",
+        "PATCH",
+        f"/insights/{insight_id}/",
+        json_body={"title": f"Load test insight {n} (edited)"},
+    )
+    await vu.call("DELETE insights/<id>/", "DELETE", f"/insights/{insight_id}/")
+
+
+async def login(vu: VirtualUser) -> None:
+    if vu.credentials is None:
+        return
+    username, password = vu.credentials
+    vu.token = None
+    response = await vu.call(
+        "POST auth/login/", "POST", "/auth/login/", json_body={"username": username, "password": password}
+    )
+    if response is not None and response.status == 200:
+        vu.token = response.json()["access"]
+
+
+async def signup(vu: VirtualUser) -> None:
+    # Anonymous: every step creates a new account.
+    await vu.recorder.call(
+        vu.client,
+        "POST auth/signup/",
+        "POST",
+        f"{vu.api}/auth/signup/",
+        json_body={"username": f"loadtest-{secrets.token_hex(6)}", "email": "", "password": secrets.token_urlsafe(16)},
+    )
+
+
+SCENARIOS: dict[str, Callable[[VirtualUser], Awaitable[None]]] = {
+    "browse": browse,
+    "search": search,
+    "top-tags": top_tags,
+    "author": author,
+    "login": login,
+    "signup": signup,
+}
+# Scenarios that need an account (--username/--password or a signed-up one).
+AUTHENTICATED_SCENARIOS = frozenset({"author", "login"})
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    """'browse:6,author:1' -> {"browse": 6.0, "author": 1.0}."""
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.strip().partition(":")
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}.")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("The scenario mix needs a positive weight.")
+    return mix
+
+
+@dataclass
+class LoadConfig:
+    url: str
+    api_prefix: str = "/api"
+    mix: dict[str, float] = field(default_factory=lambda: parse_mix(DEFAULT_MIX))
+    duration_s: float = 30.0
+    warmup_s: float = 5.0
+    concurrency: int = 10
+    rate: float | None = None  # scenario steps per second (open loop); None = closed loop
+    credentials: tuple[str, str] | None = None
+    timeout_s: float = 30.0
+    seed: int | None = None
+
+
+async def signup_user(config: LoadConfig) -> tuple[str, str]:
+    """Create a throwaway account for the write scenarios."""
+    client = AsyncHTTPClient(config.url, max_connections=1, timeout=config.timeout_s)
+    username, password = f"loadtest-{secrets.token_hex(4)}", secrets.token_urlsafe(16)
+    try:
+        response = await client.request(
+            "POST",
+            f"{config.api_prefix}/auth/signup/",
+            json_body={"username": username, "email": "", "password": password},
+        )
+    finally:
+        await client.close()
+    if response.status != 201:
+        raise RuntimeError(f"Signup failed with HTTP {response.status}: {response.body[:200]!r}")
+    return username, password
+
+
+async def run_load(config: LoadConfig) -> dict[str, Any]:
+    rng = random.Random(config.seed)
+    recorder = Recorder()
+    client = AsyncHTTPClient(config.url, max_connections=config.concurrency, timeout=config.timeout_s)
+    users: asyncio.Queue[VirtualUser] = asyncio.Queue()
+    for _ in range(config.concurrency):
+        users.put_nowait(
+            VirtualUser(
+                client=client,
+                recorder=recorder,
+                api=config.api_prefix,
+                rng=random.Random(rng.random()),
+                credentials=config.credentials,
+            )
+        )
+    names, weights = list(config.mix), list(config.mix.values())
+
+    async def step() -> None:
+        vu = await users.get()
+        try:
+            await SCENARIOS[vu.rng.choices(names, weights)[0]](vu)
+        finally:
+            users.put_nowait(vu)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    measure_from = start + config.warmup_s
+    stop_at = measure_from + config.duration_s
+    skipped = 0
+
+    async def arm_recorder() -> None:
+        await asyncio.sleep(config.warmup_s)
+        recorder.recording = True
+
+    armer = asyncio.create_task(arm_recorder())
+    try:
+        if config.rate:
+            in_flight: set[asyncio.Task] = set()
+            interval, next_at = 1 / config.rate, start
+            while next_at < stop_at:
+                await asyncio.sleep(max(0.0, next_at - loop.time()))
+                next_at += interval
+                if users.empty():
+                    # Open loop: never queue behind a saturated server.
+                    if recorder.recording:
+                        skipped += 1
+                    continue
+                task = asyncio.create_task(step())
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            if in_flight:
+                await asyncio.wait(in_flight, timeout=config.timeout_s)
+        else:
+
+            async def worker() -> None:
+                while loop.time() < stop_at:
+                    await step()
+
+            await asyncio.gather(*(worker() for _ in range(config.concurrency)))
+    finally:
+        armer.cancel()
+        await client.close()
+
+    report = recorder.report(max(loop.time() - measure_from, 0.0))
+    return {
+        "target": config.url,
+        "mode": {"rate": config.rate} if config.rate else {"concurrency": config.concurrency},
+        "mix": config.mix,
+        "duration_s": config.duration_s,
+        "warmup_s": config.warmup_s,
+        "skipped_steps": skipped,
+        **report,
+    }
+
+
+def format_table(report: dict[str, Any]) -> list[str]:
+    lines = [
+        f"{'route':<28} {'reqs':>7} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}  errors",
+    ]
+    rows = list(report["routes"].items()) + [("TOTAL", report["total"])]
+    for name, r in rows:
+        errors = ", ".join(f"{k}x{v}" for k, v in r["errors"].items()) or "-"
+        lines.append(
+            f"{name:<28} {r['requests']:>7} {r['rps']:>8.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+            f"{r['p99_ms']:>8.1f} {r['max_ms']:>8.1f}  {errors}"
+        )
+    return lines
+
+
+def compare_reports(base: dict[str, Any], other: dict[str, Any]) -> list[str]:
+    """Side-by-side rps and latency percentiles, e.g. gunicorn vs uvicorn runs."""
+    lines = [f"{'route':<28} {'metric':>7} {'base':>9} {'other':>9} {'change':>8}"]
+    routes = [r for r in base["routes"] if r in other["routes"]] + ["TOTAL"]
+    for name in routes:
+        a = base["total"] if name == "TOTAL" else base["routes"][name]
+        b = other["total"] if name == "TOTAL" else other["routes"][name]
+        for metric in ("rps", "p50_ms", "p95_ms", "p99_ms"):
+            change = f"{(b[metric] - a[metric]) / a[metric] * 100:+.0f}%" if a[metric] else "-"
+            lines.append(f"{name:<28} {metric:>7} {a[metric]:>9.1f} {b[metric]:>9.1f} {change:>8}")
+            name = ""
+    return lines
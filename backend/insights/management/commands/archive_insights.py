@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from insights.infrastructure.repositories import ArchiveRepository
+
+
+class Command(BaseCommand):
+    help = "Move insights older than the retention horizon to the archive table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.INSIGHT_ARCHIVE_AFTER_DAYS,
+            help="Archive insights created more than this many days ago.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options["days"])
+        moved = ArchiveRepository().archive(before=before, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Archived {moved} insights created before {before:%Y-%m-%d}."))
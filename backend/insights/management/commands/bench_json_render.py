@@ -0,0 +1,66 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from project import renderers
+
+
+def sample_page(rows: int, body_chars: int) -> dict:
+    """A list page shaped like InsightSerializer output."""
+    now = timezone.now()
+    body = ("Rates moved higher after the CPI print; curve flattening continues. " * 64)[:body_chars]
+    return {
+        "count": rows * 50,
+        "next": "http://localhost:8000/api/insights/?page=2",
+        "previous": None,
+        "results": [
+            {
+                "id": i,
+                "title": f"Insight number {i} on inflation and rates",
+                "category": "Macro",
+                "body": body,
+                "created_by": {"id": 1, "username": "analyst"},
+                "created_at": (now - timedelta(minutes=i)).isoformat(),
+                "updated_at": now - timedelta(minutes=i),
+                "tags": ["Rates", "CPI", "Inflation"],
+            }
+            for i in range(rows)
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmark JSON rendering of one insights list page per available encoder."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100)
+        parser.add_argument("--body-chars", type=int, default=2000)
+        parser.add_argument("--iterations", type=int, default=200)
+
+    def handle(self, *args, **options):
+        data = sample_page(options["rows"], options["body_chars"])
+        iterations = options["iterations"]
+
+        candidates = [("drf JSONRenderer", JSONRenderer().render)]
+        for name in renderers.JSON_BACKENDS:
+            backend = renderers._load_backend(name)
+            if backend is None or backend[0] != name:
+                self.stdout.write(f"{name:<18} not installed")
+                continue
+            candidates.append((name, backend[1]))
+
+        baseline = None
+        for label, render in candidates:
+            size = len(render(data))
+            start = time.perf_counter()
+            for _ in range(iterations):
+                render(data)
+            per_page_ms = (time.perf_counter() - start) * 1000 / iterations
+            baseline = baseline or per_page_ms
+            self.stdout.write(
+                f"{label:<18} {per_page_ms:8.3f} ms/page  {baseline / per_page_ms:5.1f}x  {size} bytes"
+            )
+        self.stdout.write(f"Active backend: {renderers.backend_name()} ({options['rows']} rows/page)")
@@ -0,0 +1,53 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from insights.infrastructure.passwords import password_pool
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark password hashing throughput (the CPU cost of signup and login) "
+        "through the hashing pool at several pool sizes."
+    )
+
+    def add_arguments(self, parser):
+        cpus = os.cpu_count() or 1
+        parser.add_argument(
+            "--workers", default=",".join(str(n) for n in sorted({1, 2, 4, cpus})), help="Pool sizes to try."
+        )
+        parser.add_argument("--hashes", type=int, default=200, help="Hashes per pool size.")
+        parser.add_argument("--callers", type=int, default=32, help="Concurrent request threads to simulate.")
+        parser.add_argument("--iterations", type=int, help="Override PASSWORD_PBKDF2_ITERATIONS for this run.")
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"] if options["iterations"] is not None else settings.PASSWORD_PBKDF2_ITERATIONS
+        hashes, callers = options["hashes"], options["callers"]
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=iterations):
+            hasher = get_hasher("default")
+            self.stdout.write(
+                f"{hasher.algorithm} ({getattr(hasher, 'iterations', '-')} iterations), "
+                f"{hashes} hashes from {callers} caller threads"
+            )
+            self.stdout.write(f"{'workers':>8} {'hashes/s':>10} {'ms/hash':>9} {'speedup':>8}")
+            baseline = None
+            for workers in (int(w) for w in options["workers"].split(",")):
+                rate = self._run(workers=workers, hashes=hashes, callers=callers)
+                baseline = baseline or rate
+                self.stdout.write(f"{workers:>8} {rate:>10.1f} {1000 / rate:>9.2f} {rate / baseline:>7.2f}x")
+
+    def _run(self, *, workers: int, hashes: int, callers: int) -> float:
+        with override_settings(PASSWORD_HASH_WORKERS=workers, PASSWORD_HASH_QUEUE_SIZE=hashes):
+            password_pool.shutdown()
+            password_pool.hash("warm-up password")
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=callers) as requests:
+                list(requests.map(password_pool.hash, (f"benchmark password {i}" for i in range(hashes))))
+            elapsed = time.perf_counter() - start
+            password_pool.shutdown()
+        return hashes / elapsed
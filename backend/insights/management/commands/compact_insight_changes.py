@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from insights.infrastructure.repositories import ChangeLogRepository
+
+
+class Command(BaseCommand):
+    help = "Delete change-feed entries older than the retention window."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.INSIGHT_CHANGES_RETENTION_DAYS,
+            help="Keep entries newer than this many days.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options["days"])
+        deleted = ChangeLogRepository().compact(before=before, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} change log entries."))
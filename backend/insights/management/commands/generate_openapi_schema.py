@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from project.schema import write_schema_artifact
+
+
+class Command(BaseCommand):
+    help = "Generate the OpenAPI schema artifact served by /api/schema/."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--file", help="Output path (defaults to settings.OPENAPI_SCHEMA_PATH).")
+
+    def handle(self, *args, **options):
+        path = write_schema_artifact(options.get("file"))
+        self.stdout.write(self.style.SUCCESS(f"Wrote OpenAPI schema to {path}"))
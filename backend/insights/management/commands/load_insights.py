@@ -0,0 +1,104 @@
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from insights.infrastructure.bulk_load import (
+    CSV_TAG_SEPARATOR,
+    FORMATS,
+    InsightBulkLoader,
+    RejectedRecord,
+    parse_record,
+    read_rows,
+)
+
+
+class Command(BaseCommand):
+    help = "Bulk-load insights from NDJSON or CSV (file or '-' for stdin); resumable per job."
+
+    def add_arguments(self, parser):
+        parser.add_argument("source", help="Input file, or '-' to read stdin.")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            default=None,
+            help="Input format (default: from the file extension, ndjson for stdin).",
+        )
+        parser.add_argument("--user", default=None, help="Username for records without created_by.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--job",
+            default=None,
+            help="Checkpoint name; re-running the same job resumes after the last committed chunk "
+            "(default: the absolute source path, or 'stdin').",
+        )
+        parser.add_argument("--restart", action="store_true", help="Discard the job's checkpoint first.")
+        parser.add_argument(
+            "--max-errors",
+            type=int,
+            default=100,
+            help="Abort once this many records have been rejected in this run (-1: no limit).",
+        )
+        parser.add_argument("--tag-separator", default=CSV_TAG_SEPARATOR, help="Separator for CSV tag cells.")
+
+    def handle(self, *args, **options):
+        source = options["source"]
+        fmt = options["format"] or ("csv" if source.lower().endswith(".csv") else "ndjson")
+        job = options["job"] or ("stdin" if source == "-" else str(Path(source).resolve()))
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        default_author = None
+        if options["user"]:
+            try:
+                default_author = get_user_model().objects.get(username=options["user"])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f'Unknown user "{options["user"]}".')
+
+        loader = InsightBulkLoader(job=job, default_author=default_author)
+        if options["restart"]:
+            loader.reset()
+        start = loader.checkpoint().position
+        if start:
+            self.stdout.write(f"Resuming job {job} after record {start}.")
+
+        try:
+            stream = sys.stdin if source == "-" else open(source, newline="", encoding="utf-8")
+        except OSError as e:
+            raise CommandError(str(e))
+
+        loaded = rejected = 0
+        started = time.perf_counter()
+        with stream:
+            rows = enumerate(islice(read_rows(stream, fmt), start, None), start=start + 1)
+            while chunk := list(islice(rows, batch_size)):
+                parsed = [
+                    parse_record(raw, number=n, fmt=fmt, tag_separator=options["tag_separator"])
+                    for n, raw in chunk
+                ]
+                invalid = [r for r in parsed if isinstance(r, RejectedRecord)]
+                valid = [r for r in parsed if not isinstance(r, RejectedRecord)]
+                invalid += loader.write_chunk(valid, consumed=len(chunk), rejected=len(invalid))
+
+                loaded += len(chunk) - len(invalid)
+                rejected += len(invalid)
+                for r in invalid:
+                    self.stderr.write(f"record {r.number}: {r.details}")
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"{chunk[-1][0]:>10} records  loaded {loaded}  rejected {rejected}  "
+                    f"{(loaded + rejected) / elapsed if elapsed else 0:,.0f} rec/s"
+                )
+                if 0 <= options["max_errors"] < rejected:
+                    raise CommandError(
+                        f"Aborting after {rejected} rejected records; fix the input and re-run to resume."
+                    )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"Loaded {loaded} insights ({rejected} rejected) in {elapsed:.1f}s.")
+        )
@@ -0,0 +1,101 @@
+import asyncio
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from insights.loadtest import (
+    AUTHENTICATED_SCENARIOS,
+    DEFAULT_MIX,
+    LoadConfig,
+    compare_reports,
+    format_table,
+    parse_mix,
+    run_load,
+    signup_user,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive a running server (runserver, gunicorn or uvicorn) with a weighted mix of API "
+        "scenarios and report throughput and p50/p95/p99 latency per route."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000", help="Server base URL.")
+        parser.add_argument("--api-prefix", default="/api")
+        parser.add_argument(
+            "--scenario",
+            default=DEFAULT_MIX,
+            help="Weighted mix of browse, search, top-tags, author, login and signup, e.g. "
+            "'browse:6,author:1'. 'author' creates, edits and deletes insights; 'signup' creates "
+            "a new account per step.",
+        )
+        parser.add_argument("--concurrency", type=int, default=10, help="Virtual users (closed loop).")
+        parser.add_argument(
+            "--rate",
+            type=float,
+            help="Start this many scenario steps per second (open loop), " "with at most --concurrency in flight.",
+        )
+        parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds.")
+        parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds before that.")
+        parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds.")
+        parser.add_argument(
+            "--username", help="Account for 'author' and 'login'; a throwaway one is signed up if omitted."
+        )
+        parser.add_argument("--password")
+        parser.add_argument("--seed", type=int)
+        parser.add_argument("--json", action="store_true", help="Print the JSON report instead of a table.")
+        parser.add_argument("--output", help="Also write the JSON report to this file.")
+        parser.add_argument(
+            "--compare", nargs=2, metavar=("BASE", "OTHER"), help="Compare two saved JSON reports and exit."
+        )
+
+    def handle(self, *args, **options):
+        if options["compare"]:
+            base, other = (json.loads(Path(p).read_text()) for p in options["compare"])
+            for line in compare_reports(base, other):
+                self.stdout.write(line)
+            return
+
+        try:
+            mix = parse_mix(options["scenario"])
+        except ValueError as e:
+            raise CommandError(str(e))
+        if options["concurrency"] < 1:
+            raise CommandError("--concurrency must be at least 1.")
+
+        config = LoadConfig(
+            url=options["url"],
+            api_prefix=options["api_prefix"].rstrip("/"),
+            mix=mix,
+            duration_s=options["duration"],
+            warmup_s=options["warmup"],
+            concurrency=options["concurrency"],
+            rate=options["rate"],
+            timeout_s=options["timeout"],
+            seed=options["seed"],
+        )
+        if AUTHENTICATED_SCENARIOS & mix.keys():
+            if options["username"]:
+                config.credentials = (options["username"], options["password"] or "")
+            else:
+                try:
+                    config.credentials = asyncio.run(signup_user(config))
+                except (OSError, RuntimeError) as e:
+                    raise CommandError(f"Could not create a load-test user: {e}")
+                self.stderr.write(f"Signed up {config.credentials[0]} for the authenticated scenarios.")
+
+        report = asyncio.run(run_load(config))
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(report, indent=2) + "\n")
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            mode = f"{config.rate:g} steps/s" if config.rate else f"{config.concurrency} users"
+            self.stdout.write(f"{config.url} - {mode}, {config.duration_s:g}s measured")
+            for line in format_table(report):
+                self.stdout.write(line)
+            if report["skipped_steps"]:
+                self.stdout.write(f"{report['skipped_steps']} scheduled steps skipped: all users were busy.")
@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from insights.application.use_cases.merge_tags import (
+    MergeTagsInput,
+    MergeTagsUseCase,
+    NormalizeTagsUseCase,
+)
+from insights.domain.exceptions import ValidationError
+from insights.domain.rules import canonical_tag_name
+from insights.infrastructure.repositories import TagRepository
+from insights.infrastructure.selectors import TagSelector
+
+
+class Command(BaseCommand):
+    help = (
+        "Merge tags into one (merge_tags TARGET SOURCE [SOURCE ...]) or fold every group of "
+        "tags sharing a canonical form (--normalize)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("target", nargs="?", help="Tag to keep (created if missing).")
+        parser.add_argument("sources", nargs="*", help="Tags merged into the target and removed.")
+        parser.add_argument(
+            "--normalize",
+            action="store_true",
+            help="Merge tags by INSIGHT_TAG_CANONICALIZER (or the built-in case/punctuation rule).",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="With --normalize, only list the merges.")
+
+    def handle(self, *args, **options):
+        repo, selector = TagRepository(), TagSelector()
+
+        if options["normalize"]:
+            if options["target"]:
+                raise CommandError("--normalize takes no tag arguments.")
+            path = settings.INSIGHT_TAG_CANONICALIZER
+            rule = import_string(path) if path else canonical_tag_name
+            use_case = NormalizeTagsUseCase(repo=repo, selector=selector)
+            plan = use_case.plan(rule=rule)
+            for target, names in plan.items():
+                self.stdout.write(f"{', '.join(names)} -> {target}")
+            if options["dry_run"]:
+                self.stdout.write(f"{len(plan)} merges planned (dry run).")
+                return
+            results = use_case.execute(rule=rule, plan=plan)
+            updated = sum(r.insights_updated for r in results)
+            self.stdout.write(self.style.SUCCESS(f"Applied {len(results)} merges; {updated} insights retagged."))
+            return
+
+        if not options["target"] or not options["sources"]:
+            raise CommandError("Give a target and at least one source tag, or use --normalize.")
+        try:
+            result = MergeTagsUseCase(repo=repo, selector=selector).execute(
+                data=MergeTagsInput(sources=tuple(options["sources"]), target=options["target"])
+            )
+        except ValidationError as e:
+            raise CommandError(e.details)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Merged {', '.join(result.merged) or 'nothing'} into {result.target.name}; "
+                f"{result.insights_updated} insights retagged."
+            )
+        )
@@ -0,0 +1,107 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter so nothing is already imported.
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import django
+django.setup()
+t1 = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+t2 = time.perf_counter()
+from django.test import Client
+status = Client().get(sys.argv[1], HTTP_HOST="localhost").status_code
+t3 = time.perf_counter()
+watch = sys.argv[2].split(",") if sys.argv[2] else []
+print(json.dumps({
+    "setup_ms": (t1 - t0) * 1000,
+    "urlconf_ms": (t2 - t1) * 1000,
+    "first_request_ms": (t3 - t2) * 1000,
+    "total_ms": (t3 - t0) * 1000,
+    "status": status,
+    "watched_modules_loaded": sorted(m for m in watch if m in sys.modules),
+}))
+"""
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, float, float]]:
+    """Top-level modules from ``-X importtime`` output as (name, self_ms, cumulative_ms)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        if name[1:].startswith(" "):  # nested import, already counted by its parent
+            continue
+        rows.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    return sorted(rows, key=lambda r: r[2], reverse=True)
+
+
+class Command(BaseCommand):
+    help = "Measure import time and time to first request of a fresh API worker."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profile-settings",
+            default=os.environ.get("DJANGO_SETTINGS_MODULE", "project.settings"),
+            help="Settings module to profile (e.g. project.settings_api).",
+        )
+        parser.add_argument("--path", default="/api/auth/me/", help="URL for the first request.")
+        parser.add_argument("--top", type=int, default=20, help="Number of modules to list.")
+        parser.add_argument(
+            "--max-ms",
+            type=float,
+            default=None,
+            help="Fail if time to first request exceeds this (defaults to STARTUP_TARGET_MS).",
+        )
+        parser.add_argument("--check", action="store_true", help="Enforce the time target.")
+        parser.add_argument("--json", action="store_true", help="Print a JSON report.")
+
+    def handle(self, *args, **options):
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": options["profile_settings"]}
+        watched = ",".join(settings.STARTUP_WATCHED_MODULES)
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PROBE, options["path"], watched],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            raise CommandError(f"Startup probe failed:\n{proc.stderr[-4000:]}")
+
+        timings = json.loads(proc.stdout.strip().splitlines()[-1])
+        modules = parse_importtime(proc.stderr)
+        report = {
+            "settings": options["profile_settings"],
+            **timings,
+            "import_ms": sum(m[2] for m in modules),
+            "top_modules": [
+                {"module": name, "self_ms": round(self_ms, 2), "cumulative_ms": round(cum_ms, 2)}
+                for name, self_ms, cum_ms in modules[: options["top"]]
+            ],
+        }
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.stdout.write(f"Settings:          {report['settings']}")
+            self.stdout.write(f"django.setup():    {report['setup_ms']:8.1f} ms")
+            self.stdout.write(f"URLconf:           {report['urlconf_ms']:8.1f} ms")
+            self.stdout.write(f"First request:     {report['first_request_ms']:8.1f} ms (HTTP {report['status']})")
+            self.stdout.write(f"Total:             {report['total_ms']:8.1f} ms")
+            self.stdout.write(f"Watched modules:   {', '.join(report['watched_modules_loaded']) or '-'}")
+            self.stdout.write("\n  cumulative      self  module")
+            for row in report["top_modules"]:
+                self.stdout.write(f"{row['cumulative_ms']:9.1f} ms {row['self_ms']:7.1f} ms  {row['module']}")
+
+        limit = options["max_ms"] if options["max_ms"] is not None else settings.STARTUP_TARGET_MS
+        if (options["check"] or options["max_ms"] is not None) and report["total_ms"] > limit:
+            raise CommandError(f"Time to first request {report['total_ms']:.0f} ms exceeds target {limit:.0f} ms")
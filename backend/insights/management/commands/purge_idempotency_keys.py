@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from insights.infrastructure.idempotency import IdempotencyRepository
+
+
+class Command(BaseCommand):
+    help = "Delete Idempotency-Key records past IDEMPOTENCY_KEY_TTL_HOURS, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        deleted = IdempotencyRepository().purge_expired(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired idempotency keys."))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from insights.infrastructure.repositories import EngagementRepository
+from insights.infrastructure.view_counts import view_counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the stored hot_score (ordering=hot) for insights whose view "
+        "counts changed since the last run. View count flushes already defer "
+        "this as a task; run it to catch up, or with --all after a settings change."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Refresh every insight, e.g. after changing INSIGHT_HOT_HALF_LIFE_HOURS.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        view_counts.flush()  # this process's own views, if any
+        refreshed = EngagementRepository().refresh_hot_scores(
+            batch_size=options["batch_size"], everything=options["all"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {refreshed} hot scores."))
@@ -0,0 +1,75 @@
+import logging
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from insights.infrastructure.tasks import DatabaseTaskBackend
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run deferred tasks queued by DatabaseTaskBackend (INSIGHT_TASK_BACKEND). "
+        "Safe to run several at once: workers skip rows another worker holds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=settings.INSIGHT_TASK_WORKERS)
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.INSIGHT_TASK_POLL_SECONDS,
+            help="Seconds to sleep when nothing is runnable (or after an error).",
+        )
+        parser.add_argument("--once", action="store_true", help="Exit once nothing is runnable.")
+
+    def handle(self, *args, **options):
+        backend = DatabaseTaskBackend()
+        stop = threading.Event()
+        processed = [0] * options["concurrency"]
+        failed: list[int] = []
+
+        def work(slot: int) -> None:
+            try:
+                while not stop.is_set():
+                    try:
+                        taken = backend.run_batch()
+                    except Exception:
+                        logger.exception("Task worker %d could not run a batch", slot)
+                        connections.close_all()  # reconnect on the next attempt
+                        if options["once"]:
+                            failed.append(slot)
+                            return
+                        stop.wait(options["poll_interval"])
+                        continue
+                    processed[slot] += taken
+                    if not taken:
+                        if options["once"]:
+                            return
+                        stop.wait(options["poll_interval"])
+            except BaseException:
+                failed.append(slot)
+                raise
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=work, args=(slot,), name=f"insight-task-worker-{slot}", daemon=True)
+            for slot in range(options["concurrency"])
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.5)
+        except KeyboardInterrupt:
+            stop.set()  # finish the batches in hand
+            for thread in threads:
+                thread.join()
+        if failed:
+            raise CommandError(f"{len(failed)} of {len(threads)} workers failed after running {sum(processed)} tasks.")
+        self.stdout.write(self.style.SUCCESS(f"Ran {sum(processed)} tasks."))
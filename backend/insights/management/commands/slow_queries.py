@@ -0,0 +1,37 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from insights.infrastructure.query_log import slow_query_log
+
+
+class Command(BaseCommand):
+    help = "List the slowest recorded queries, grouped by normalized SQL fingerprint."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=10)
+        parser.add_argument("--plans", action="store_true", help="Print the captured EXPLAIN plans.")
+        parser.add_argument("--json", action="store_true", help="Print a JSON report.")
+        parser.add_argument("--clear", action="store_true", help="Empty the log afterwards.")
+
+    def handle(self, *args, **options):
+        top = slow_query_log.top(limit=options["limit"])
+        if options["json"]:
+            self.stdout.write(json.dumps(top, indent=2))
+        elif not top:
+            self.stdout.write(f"No queries over {settings.SLOW_QUERY_THRESHOLD_MS:g} ms recorded.")
+        else:
+            self.stdout.write("   total ms    max ms  count  fingerprint       where")
+            for row in top:
+                where = ", ".join(row["views"] + row["use_cases"]) or "-"
+                self.stdout.write(
+                    f"{row['total_ms']:11.1f} {row['max_ms']:9.1f} {row['count']:6d}  {row['fingerprint']}  {where}"
+                )
+                self.stdout.write(f"    {row['sql'][:300]}")
+                if options["plans"] and row["plan"]:
+                    for line in row["plan"].splitlines():
+                        self.stdout.write(f"      {line}")
+
+        if options["clear"]:
+            slow_query_log.clear()
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("insights", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="insight",
+            name="insights_in_categor_05abe2_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="insight",
+            name="insights_in_created_c34a89_idx",
+        ),
+        migrations.AddIndex(
+            model_name="insight",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="insight_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="insight",
+            index=models.Index(
+                fields=["category", "-created_at", "-id"],
+                name="insight_cat_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="insight",
+            index=models.Index(
+                fields=["-updated_at", "-id"], name="insight_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="insight",
+            index=models.Index(fields=["title", "id"], name="insight_title_idx"),
+        ),
+    ]
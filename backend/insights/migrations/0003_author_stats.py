@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_author_stats(apps, schema_editor):
+    Insight = apps.get_model("insights", "Insight")
+    AuthorStats = apps.get_model("insights", "AuthorStats")
+    counts = (
+        Insight.objects.order_by()
+        .values("created_by_id")
+        .annotate(n=models.Count("id"))
+        .values_list("created_by_id", "n")
+    )
+    AuthorStats.objects.bulk_create(
+        [AuthorStats(user_id=user_id, insight_count=n) for user_id, n in counts],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("insights", "0002_insight_ordering_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AuthorStats",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="insight_stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("insight_count", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name="insight",
+            name="created_by",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="insights",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="insight",
+            index=models.Index(
+                fields=["created_by", "-created_at", "-id"],
+                name="insight_author_created_idx",
+            ),
+        ),
+        migrations.RunPython(backfill_author_stats, migrations.RunPython.noop),
+    ]
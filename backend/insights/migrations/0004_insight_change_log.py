@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:13
+
+from django.db import migrations, models
+
+
+def create_state_row(apps, schema_editor):
+    apps.get_model("insights", "ChangeLogState").objects.get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("insights", "0003_author_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeLogState",
+            fields=[
+                (
+                    "id",
+                    models.PositiveSmallIntegerField(
+                        default=1, primary_key=True, serialize=False
+                    ),
+                ),
+                ("compacted_through", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="InsightChange",
+            fields=[
+                ("seq", models.BigAutoField(primary_key=True, serialize=False)),
+                ("insight_id", models.BigIntegerField()),
+                (
+                    "op",
+                    models.CharField(
+                        choices=[
+                            ("created", "Created"),
+                            ("updated", "Updated"),
+                            ("deleted", "Deleted"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["seq"],
+            },
+        ),
+        migrations.RunPython(create_state_row, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,106 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("insights", "0005_load_checkpoint"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedInsight",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("title", models.CharField(max_length=200)),
+                (
+                    "category",
+                    models.CharField(
+                        choices=[
+                            ("Macro", "Macro"),
+                            ("Equities", "Equities"),
+                            ("FixedIncome", "Fixed Income"),
+                            ("Alternatives", "Alternatives"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("body", models.TextField()),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_insights",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedInsightTag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "insight",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="insights.archivedinsight",
+                    ),
+                ),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="insights.tag"
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="archivedinsight",
+            name="tags",
+            field=models.ManyToManyField(
+                related_name="archived_insights",
+                through="insights.ArchivedInsightTag",
+                to="insights.tag",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="archivedinsighttag",
+            constraint=models.UniqueConstraint(
+                fields=("insight", "tag"), name="archived_insight_tag_uniq"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedinsight",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="archived_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedinsight",
+            index=models.Index(
+                fields=["created_by", "-created_at", "-id"],
+                name="archived_author_created_idx",
+            ),
+        ),
+    ]
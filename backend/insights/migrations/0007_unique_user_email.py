@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Non-blank emails are unique, so signup can rely on the constraint
+    instead of checking first. Blank emails (the field is optional) may repeat.
+    """
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("insights", "0006_insight_archive"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="CREATE UNIQUE INDEX insights_user_email_uniq ON auth_user (email) WHERE email <> ''",
+            reverse_sql="DROP INDEX insights_user_email_uniq",
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("insights", "0007_unique_user_email"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="archivedinsight",
+            name="hot_score",
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name="archivedinsight",
+            name="view_count",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="insight",
+            name="hot_dirty",
+            field=models.BooleanField(db_default=True, default=True),
+        ),
+        migrations.AddField(
+            model_name="insight",
+            name="hot_score",
+            field=models.FloatField(db_default=0.0, default=0.0),
+        ),
+        migrations.AddField(
+            model_name="insight",
+            name="view_count",
+            field=models.PositiveBigIntegerField(db_default=0, default=0),
+        ),
+        migrations.AddIndex(
+            model_name="insight",
+            index=models.Index(fields=["-hot_score", "-id"], name="insight_hot_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="insight",
+            index=models.Index(
+                condition=models.Q(("hot_dirty", True)),
+                fields=["id"],
+                name="insight_hot_dirty_idx",
+            ),
+        ),
+    ]
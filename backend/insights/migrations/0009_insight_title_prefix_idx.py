@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("insights", "0008_insight_hot_score"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="insight",
+            index=models.Index(
+                fields=["title"],
+                name="insight_title_prefix_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("insights", "0011_deferred_task"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="deferredtask",
+            name="claim",
+            field=models.UUIDField(blank=True, null=True),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from typing import Any
 
@@ -36,17 +37,231 @@ class Insight(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="insights",
+        db_index=False,  # covered by insight_author_created_idx
     )
 
     created_at: models.DateTimeField = models.DateTimeField(auto_now_add=True)
     updated_at: models.DateTimeField = models.DateTimeField(auto_now=True)
 
+    # Engagement for ordering=hot. view_count is bumped in batches by the view
+    # counter buffer, which sets hot_dirty; `manage.py refresh_hot_scores`
+    # recomputes hot_score for dirty rows. Database defaults keep COPY loads
+    # (which do not list these columns) valid.
+    view_count: models.PositiveBigIntegerField = models.PositiveBigIntegerField(default=0, db_default=0)
+    hot_score: models.FloatField = models.FloatField(default=0.0, db_default=0.0)
+    hot_dirty: models.BooleanField = models.BooleanField(default=True, db_default=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        # One composite index per supported list ordering (see
+        # insights.infrastructure.selectors.INSIGHT_ORDERINGS); the trailing id
+        # matches the tie-breaker so paging never needs an explicit sort.
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="insight_created_idx"),
+            models.Index(fields=["category", "-created_at", "-id"], name="insight_cat_created_idx"),
+            models.Index(fields=["-updated_at", "-id"], name="insight_updated_idx"),
+            models.Index(fields=["title", "id"], name="insight_title_idx"),
+            # Title prefix search in the admin (LIKE 'x%' needs pattern_ops
+            # unless the database collation is C).
+            models.Index(fields=["title"], opclasses=["varchar_pattern_ops"], name="insight_title_prefix_idx"),
+            models.Index(
+                fields=["created_by", "-created_at", "-id"],
+                name="insight_author_created_idx",
+            ),
+            models.Index(fields=["-hot_score", "-id"], name="insight_hot_idx"),
+            # Small: only rows whose views changed since the last score refresh.
+            models.Index(fields=["id"], condition=models.Q(hot_dirty=True), name="insight_hot_dirty_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return self.title
+
+
+class ArchivedInsight(models.Model):
+    """
+    Cold tier: insights moved out of Insight by `manage.py archive_insights`
+    so everyday list/search queries only touch recent rows. Rows keep their
+    original id, so retrieve-by-id can fall through to this table.
+    """
+
+    id: models.BigIntegerField = models.BigIntegerField(primary_key=True)
+    title: models.CharField = models.CharField(max_length=200)
+    category: models.CharField = models.CharField(max_length=20, choices=Insight.Category.choices)
+    body: models.TextField = models.TextField()
+    tags: models.ManyToManyField = models.ManyToManyField(
+        Tag,
+        through="ArchivedInsightTag",
+        related_name="archived_insights",
+    )
+    created_by: models.ForeignKey = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_insights",
+        db_index=False,  # covered by archived_author_created_idx
+    )
+    created_at: models.DateTimeField = models.DateTimeField()
+    updated_at: models.DateTimeField = models.DateTimeField()
+    view_count: models.PositiveBigIntegerField = models.PositiveBigIntegerField(default=0)
+    hot_score: models.FloatField = models.FloatField(default=0.0)  # frozen when archived
+    archived_at: models.DateTimeField = models.DateTimeField(auto_now_add=True)
+
     class Meta:
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=["category"]),
-            models.Index(fields=["created_at"]),
+            models.Index(fields=["-created_at", "-id"], name="archived_created_idx"),
+            models.Index(
+                fields=["created_by", "-created_at", "-id"],
+                name="archived_author_created_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return self.title
+
+
+class ArchivedInsightTag(models.Model):
+    """Tag links of archived insights; same shape as Insight's through table."""
+
+    insight: models.ForeignKey = models.ForeignKey(ArchivedInsight, on_delete=models.CASCADE)
+    tag: models.ForeignKey = models.ForeignKey(Tag, on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["insight", "tag"], name="archived_insight_tag_uniq"),
+        ]
+
+
+class AuthorStats(models.Model):
+    """Per-user counters maintained by InsightRepository writes."""
+
+    user: models.OneToOneField = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="insight_stats",
+    )
+    insight_count: models.PositiveIntegerField = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.user_id}: {self.insight_count}"
+
+
+class InsightChange(models.Model):
+    """Append-only change log written in the same transaction as insight writes."""
+
+    class Op(models.TextChoices):
+        CREATED = "created", "Created"
+        UPDATED = "updated", "Updated"
+        DELETED = "deleted", "Deleted"
+
+    # The primary key doubles as the feed cursor.
+    seq: models.BigAutoField = models.BigAutoField(primary_key=True)
+    # Plain id rather than a FK so tombstones survive the insight row.
+    insight_id: models.BigIntegerField = models.BigIntegerField()
+    op: models.CharField = models.CharField(max_length=10, choices=Op.choices)
+    created_at: models.DateTimeField = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["seq"]
+
+    def __str__(self) -> str:
+        return f"{self.seq} {self.op} {self.insight_id}"
+
+
+class ChangeLogState(models.Model):
+    """
+    Singleton row for the change log. Writers lock it while appending so
+    sequence order matches commit order; compaction records its watermark.
+    """
+
+    id: models.PositiveSmallIntegerField = models.PositiveSmallIntegerField(primary_key=True, default=1)
+    compacted_through: models.BigIntegerField = models.BigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"compacted through {self.compacted_through}"
+
+
+class LoadCheckpoint(models.Model):
+    """Progress of a `load_insights` job, committed together with each chunk."""
+
+    job: models.CharField = models.CharField(max_length=255, unique=True)
+    # Input records consumed so far (loaded or rejected); a resumed run skips them.
+    position: models.BigIntegerField = models.BigIntegerField(default=0)
+    loaded: models.BigIntegerField = models.BigIntegerField(default=0)
+    rejected: models.BigIntegerField = models.BigIntegerField(default=0)
+    updated_at: models.DateTimeField = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.job} @ {self.position}"
+
+
+class IdempotencyKey(models.Model):
+    """
+    First successful response to a write sent with an ``Idempotency-Key``
+    header, replayed to retries of the same request by the same user. The
+    unique (user, key) row is also the lock: it is inserted before the write
+    runs, with no response yet, and completed in the write's transaction.
+    """
+
+    user: models.ForeignKey = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+        db_index=False,  # covered by idempotency_user_key_uniq
+    )
+    key: models.CharField = models.CharField(max_length=255)
+    # sha256 of method, path and body; a reused key with a different request is rejected.
+    fingerprint: models.CharField = models.CharField(max_length=64)
+    response_status: models.PositiveSmallIntegerField = models.PositiveSmallIntegerField(null=True)
+    response_body: models.JSONField = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    # While the response is missing: a claim older than this was abandoned.
+    locked_until: models.DateTimeField = models.DateTimeField(null=True)
+    expires_at: models.DateTimeField = models.DateTimeField()
+    created_at: models.DateTimeField = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key"], name="idempotency_user_key_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["expires_at"], name="idempotency_expires_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id}: {self.key}"
+
+
+class DeferredTask(models.Model):
+    """
+    Durable queue for insights.infrastructure.tasks.DatabaseTaskBackend.
+    Rows are written in the enqueuing transaction (so they exist only if it
+    commits) and deleted once their task has run. A worker claims rows by
+    stamping ``claim`` and pushing ``run_after`` out by a lease, so a claim
+    left by a crashed worker lapses on its own.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        DEAD = "dead", "Dead"  # out of attempts; kept for inspection
+
+    name: models.CharField = models.CharField(max_length=200)  # dotted path of the Task
+    payload: models.JSONField = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    status: models.CharField = models.CharField(max_length=10, choices=Status.choices, default=Status.QUEUED)
+    attempts: models.PositiveSmallIntegerField = models.PositiveSmallIntegerField(default=0)
+    run_after: models.DateTimeField = models.DateTimeField()
+    last_error: models.TextField = models.TextField(blank=True)
+    claim: models.UUIDField = models.UUIDField(null=True, blank=True)  # the worker batch holding the row
+    created_at: models.DateTimeField = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Workers only scan runnable rows; dead ones stay out of the index.
+            models.Index(
+                fields=["run_after", "id"],
+                condition=models.Q(status="queued"),
+                name="deferred_task_ready_idx",
+            ),
         ]
 
     def __str__(self) -> str:
-        return self.title
\ No newline at end of file
+        return f"{self.name} ({self.status})"
@@ -34,7 +34,8 @@ class InsightSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_by", "created_at", "updated_at", "tags_list"]
 
     def get_tags_list(self, obj: Insight) -> list[str]:
-        return list(obj.tags.values_list("name", flat=True))
+        # .all() reuses prefetch_related("tags") from the selectors
+        return [t.name for t in obj.tags.all()]
 
     def get_created_by(self, obj: Insight) -> dict[str, Any]:
         user = obj.created_by
@@ -0,0 +1,33 @@
+import pytest
+from django.core.cache import cache
+
+from insights.infrastructure.tags import tag_cache
+from insights.infrastructure.view_counts import view_counts
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    # Cached ids and representations must not outlive the test database rows
+    # they describe (ids are reused once a test's transaction rolls back).
+    tag_cache.clear()
+    cache.clear()
+    yield
+    tag_cache.clear()
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _no_background_view_flush(settings):
+    # Tests flush view counts explicitly; a flusher thread would write to the
+    # test database from outside the test's transaction.
+    settings.INSIGHT_VIEW_FLUSH_SECONDS = 0
+    view_counts.clear()
+    yield
+    view_counts.clear()
+
+
+@pytest.fixture(autouse=True)
+def _immediate_tasks(settings):
+    # Deferred tasks run on commit in the test's own thread, so effects are
+    # visible to assertions and nothing writes from outside the test.
+    settings.INSIGHT_TASK_BACKEND = "insights.infrastructure.tasks.ImmediateTaskBackend"
@@ -0,0 +1,152 @@
+import pytest
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from insights.infrastructure.repositories import InsightRepository
+from insights.models import AuthorStats, Insight, InsightChange, Tag
+
+User = get_user_model()
+CHANGELIST = "/admin/insights/insight/"
+
+
+@pytest.fixture
+def staff(db):
+    return User.objects.create_superuser(username="admin", email="admin@example.com", password="password123")
+
+
+@pytest.fixture
+def admin_client(staff):
+    c = Client()
+    c.force_login(staff)
+    return c
+
+
+def make_insights(user, n, **overrides):
+    repo = InsightRepository()
+    return [
+        repo.create(
+            title=overrides.get("title", f"Insight {i}"),
+            category=overrides.get("category", "Macro"),
+            body="This is a long enough body for validation.",
+            tags=overrides.get("tags", ["rates", f"tag{i}"]),
+            created_by=user,
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.django_db
+def test_changelist_queries_do_not_grow_with_rows(admin_client, staff):
+    def changelist_queries():
+        with CaptureQueriesContext(connection) as ctx:
+            assert admin_client.get(CHANGELIST).status_code == 200
+        return len(ctx.captured_queries)
+
+    make_insights(staff, 2)
+    few = changelist_queries()
+    make_insights(staff, 20)
+    assert changelist_queries() == few
+
+
+@pytest.mark.django_db
+def test_search_uses_id_and_title_prefix(admin_client, staff):
+    first, _ = make_insights(staff, 2)
+    Insight.objects.filter(id=first.id).update(title="Yield curve")
+
+    resp = admin_client.get(CHANGELIST, {"q": "Yield"})
+    assert [o.id for o in resp.context["cl"].result_list] == [first.id]
+    resp = admin_client.get(CHANGELIST, {"q": str(first.id)})
+    assert first.id in [o.id for o in resp.context["cl"].result_list]
+    assert admin_client.get(CHANGELIST, {"q": "curve"}).context["cl"].result_count == 0
+
+
+@pytest.mark.django_db
+def test_autocomplete_serves_tags_and_users(admin_client, staff):
+    make_insights(staff, 1, tags=["rates", "real yields"])
+    resp = admin_client.get(
+        "/admin/autocomplete/",
+        {"term": "rea", "app_label": "insights", "model_name": "insight", "field_name": "tags"},
+    )
+    assert [r["text"] for r in resp.json()["results"]] == ["real yields"]
+    resp = admin_client.get(
+        "/admin/autocomplete/",
+        {"term": "adm", "app_label": "insights", "model_name": "insight", "field_name": "created_by"},
+    )
+    assert [r["text"] for r in resp.json()["results"]] == ["admin"]
+
+
+@pytest.mark.django_db
+def test_recategorize_all_matching_is_set_based(admin_client, staff):
+    insights = make_insights(staff, 5)
+    Insight.objects.filter(id=insights[0].id).update(category="Equities")
+    before = InsightChange.objects.count()
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = admin_client.post(
+            CHANGELIST + "?category__exact=Macro",
+            {
+                "action": "recategorize_fixedincome",
+                "select_across": "1",
+                "index": "0",
+                ACTION_CHECKBOX_NAME: [insights[1].id],
+            },
+        )
+    assert resp.status_code == 302
+    assert sorted(Insight.objects.filter(category="FixedIncome").values_list("id", flat=True)) == [
+        i.id for i in insights[1:]
+    ]
+    assert Insight.objects.get(id=insights[0].id).category == "Equities"
+    assert InsightChange.objects.count() == before + 4
+    updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith('UPDATE "insights_insight"')]
+    assert len(updates) == 1
+
+
+@pytest.mark.django_db
+def test_bulk_delete_confirms_then_deletes_in_batches(admin_client, staff, monkeypatch):
+    import insights.admin as insights_admin
+
+    monkeypatch.setattr(insights_admin, "ACTION_BATCH_SIZE", 2)
+    insights = make_insights(staff, 5)
+    data = {"action": "delete_selected", "select_across": "1", "index": "0", ACTION_CHECKBOX_NAME: [insights[0].id]}
+
+    confirm = admin_client.post(CHANGELIST, data)
+    assert confirm.status_code == 200
+    assert dict(confirm.context["model_count"]) == {"insights": 5}
+    assert Insight.objects.count() == 5
+
+    data.pop("index")
+    with CaptureQueriesContext(connection) as ctx:
+        done = admin_client.post(CHANGELIST, {**data, "post": "yes"})
+    assert done.status_code == 302
+    deletes = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith('DELETE FROM "insights_insight" ')]
+    assert len(deletes) == 3  # batches of 2, 2 and 1
+    assert Insight.objects.count() == 0
+    assert AuthorStats.objects.get(user=staff).insight_count == 0
+    assert InsightChange.objects.filter(op=InsightChange.Op.DELETED).count() == 5
+
+
+@pytest.mark.django_db
+def test_add_and_rename_go_through_repositories(admin_client, staff):
+    rates = Tag.objects.create(name="rates")
+    resp = admin_client.post(
+        "/admin/insights/insight/add/",
+        {
+            "title": "From the admin",
+            "category": "Macro",
+            "body": "A body written in the admin.",
+            "tags": [rates.id],
+            "created_by": staff.id,
+        },
+    )
+    assert resp.status_code == 302
+    insight = Insight.objects.get(title="From the admin")
+    assert AuthorStats.objects.get(user=staff).insight_count == 1
+    assert InsightChange.objects.filter(insight_id=insight.id, op=InsightChange.Op.CREATED).exists()
+
+    resp = admin_client.post(f"/admin/insights/tag/{rates.id}/change/", {"name": " Interest Rates "})
+    assert resp.status_code == 302
+    assert list(insight.tags.values_list("name", flat=True)) == ["Interest Rates"]
+    assert InsightChange.objects.filter(insight_id=insight.id, op=InsightChange.Op.UPDATED).exists()
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import AsyncRequestFactory
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from insights import async_views
+
+User = get_user_model()
+factory = AsyncRequestFactory()
+
+
+def call(view, path, **kwargs):
+    # async_to_sync keeps ORM calls on this thread's test connection.
+    request = factory.get(path, headers=kwargs.pop("headers", None))
+    response = async_to_sync(view)(request, **kwargs)
+    return response.status_code, json.loads(response.content)
+
+
+@pytest.fixture
+def insights(db):
+    user = User.objects.create_user(username="asyncuser", password="password123")
+    client = APIClient()
+    client.force_authenticate(user=user)
+    for i in range(12):
+        client.post(
+            "/api/insights/",
+            {
+                "title": f"Async insight {i}",
+                "category": "Macro" if i % 2 else "Equities",
+                "body": "This is a long enough body for validation.",
+                "tags": ["Rates", "CPI"] if i % 3 else ["Rates"],
+            },
+            format="json",
+        )
+    return user
+
+
+def test_async_list_matches_sync_list(insights):
+    sync = APIClient().get("/api/insights/?tag=CPI&page=2&page_size=3").json()
+    status, data = call(async_views.insight_list_view, "/api/insights/?tag=CPI&page=2&page_size=3")
+    assert status == 200
+    assert data == sync
+
+
+def test_async_list_validates_and_rejects_bad_pages(insights):
+    assert call(async_views.insight_list_view, "/api/insights/?ordering=body")[0] == 400
+    assert call(async_views.insight_list_view, "/api/insights/?page=99")[0] == 404
+
+
+def test_async_retrieve_and_top_tags(insights):
+    first_id = APIClient().get("/api/insights/").json()["results"][0]["id"]
+    status, data = call(async_views.insight_detail_view, f"/api/insights/{first_id}/", pk=first_id)
+    assert status == 200
+    assert data == APIClient().get(f"/api/insights/{first_id}/").json()
+    assert call(async_views.insight_detail_view, "/api/insights/0/", pk=0)[0] == 404
+
+    status, data = call(async_views.top_tags_view, "/api/analytics/top-tags/")
+    assert status == 200
+    assert data["tags"][0] == {"name": "Rates", "count": 12}
+
+
+def test_async_me_requires_valid_token(insights):
+    assert call(async_views.me_view, "/api/auth/me/")[0] == 401
+
+    token = str(RefreshToken.for_user(insights).access_token)
+    status, data = call(
+        async_views.me_view,
+        "/api/auth/me/",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert status == 200
+    assert data == {"id": insights.id, "username": "asyncuser"}
@@ -0,0 +1,120 @@
+import json
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import AsyncRequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from insights import async_views
+from insights.infrastructure.passwords import PasswordHashingBusy, password_pool
+
+User = get_user_model()
+factory = AsyncRequestFactory()
+PASSWORD = "Password12345!"
+
+
+@pytest.fixture(autouse=True)
+def _fast_hashing(settings):
+    settings.PASSWORD_PBKDF2_ITERATIONS = 1000
+    yield
+    password_pool.shutdown()
+
+
+def post_async(view, path, data):
+    request = factory.post(path, data=json.dumps(data), content_type="application/json")
+    response = async_to_sync(view)(request)
+    return response.status_code, json.loads(response.content)
+
+
+def signup(client, username, email=""):
+    return client.post("/api/auth/signup/", {"username": username, "email": email, "password": PASSWORD}, format="json")
+
+
+@pytest.mark.django_db
+def test_signup_is_one_insert_and_returns_working_tokens():
+    client = APIClient()
+    with CaptureQueriesContext(connection) as ctx:
+        resp = signup(client, "newcomer", "new@example.com")
+    assert resp.status_code == 201
+    statements = [q["sql"] for q in ctx.captured_queries if "SAVEPOINT" not in q["sql"]]
+    assert len(statements) == 1 and statements[0].startswith("INSERT")
+
+    user = User.objects.get(username="newcomer")
+    assert user.password.startswith("pbkdf2_sha256$1000$")
+    assert user.check_password(PASSWORD)
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {resp.data['tokens']['access']}")
+    assert client.get("/api/auth/me/").data == {"id": user.id, "username": "newcomer"}
+
+
+@pytest.mark.django_db
+def test_duplicate_username_and_email_are_reported_from_constraints():
+    client = APIClient()
+    assert signup(client, "taken", "taken@example.com").status_code == 201
+    assert signup(client, "blank1").status_code == 201
+    assert signup(client, "blank2").status_code == 201  # blank emails may repeat
+
+    resp = signup(client, "taken", "other@example.com")
+    assert resp.status_code == 400
+    assert resp.data["error"]["details"] == {"detail": ["Username is already taken."]}
+    resp = signup(client, "someone", "taken@example.com")
+    assert resp.data["error"]["details"] == {"detail": ["Email is already registered."]}
+
+
+@pytest.mark.django_db
+def test_login_rehashes_to_the_configured_cost(settings):
+    settings.PASSWORD_PBKDF2_ITERATIONS = 2000
+    User.objects.create_user(username="veteran", password=PASSWORD)
+    assert User.objects.get(username="veteran").password.startswith("pbkdf2_sha256$2000$")
+    settings.PASSWORD_PBKDF2_ITERATIONS = 1000
+
+    resp = APIClient().post("/api/auth/login/", {"username": "veteran", "password": PASSWORD}, format="json")
+    assert resp.status_code == 200 and resp.data["access"]
+    assert User.objects.get(username="veteran").password.startswith("pbkdf2_sha256$1000$")
+    bad = APIClient().post("/api/auth/login/", {"username": "veteran", "password": "wrong-password"}, format="json")
+    assert bad.status_code == 401
+
+
+@pytest.mark.django_db
+def test_async_signup_and_login_match_the_sync_views():
+    status, data = post_async(
+        async_views.signup_view, "/api/auth/signup/", {"username": "asyncnew", "email": "", "password": PASSWORD}
+    )
+    assert status == 201 and data["user"]["username"] == "asyncnew"
+    status, data = post_async(
+        async_views.signup_view, "/api/auth/signup/", {"username": "asyncnew", "email": "", "password": PASSWORD}
+    )
+    assert status == 400 and data["error"]["details"] == {"detail": ["Username is already taken."]}
+
+    status, data = post_async(
+        async_views.login_view, "/api/auth/login/", {"username": "asyncnew", "password": PASSWORD}
+    )
+    assert status == 200 and set(data) == {"refresh", "access"}
+
+    wrong = {"username": "asyncnew", "password": "wrong-password"}
+    sync = APIClient().post("/api/auth/login/", wrong, format="json")
+    assert post_async(async_views.login_view, "/api/auth/login/", wrong) == (401, sync.json())
+    status, data = post_async(async_views.login_view, "/api/auth/login/", {"username": "asyncnew"})
+    assert status == 400 and data["error"]["details"] == {"password": ["This field is required."]}
+
+
+@pytest.mark.django_db
+def test_saturated_hashing_pool_answers_503(settings):
+    settings.PASSWORD_HASH_WORKERS = 1
+    settings.PASSWORD_HASH_QUEUE_SIZE = 0
+    password_pool.shutdown()
+    release = threading.Event()
+    blocker = password_pool._submit(release.wait)
+    try:
+        with pytest.raises(PasswordHashingBusy):
+            password_pool.hash(PASSWORD)
+        resp = signup(APIClient(), "toobusy")
+        assert resp.status_code == 503
+        assert resp.data["error"]["code"] == "BUSY"
+        assert resp["Retry-After"] == "1"
+    finally:
+        release.set()
+        blocker.result()
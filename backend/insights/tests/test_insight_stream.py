@@ -0,0 +1,132 @@
+import asyncio
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import AsyncRequestFactory, RequestFactory
+
+from insights.infrastructure.events import broadcaster
+from insights.infrastructure.repositories import InsightRepository
+from insights.views import insight_stream_view
+
+User = get_user_model()
+
+
+def read_events(path: str, events: list[dict]) -> list[str]:
+    """Open the stream, deliver ``events`` and collect what the client receives."""
+
+    async def run() -> list[str]:
+        response = await insight_stream_view(AsyncRequestFactory().get(path))
+        stream = response.streaming_content
+        received = [(await anext(stream)).decode()]  # retry hint; subscription is live
+        for event in events:
+            broadcaster.deliver(event)
+        await asyncio.sleep(0)
+        while True:
+            try:
+                chunk = await asyncio.wait_for(anext(stream), timeout=0.05)
+                received.append(chunk.decode())
+            except asyncio.TimeoutError:
+                break
+        await stream.aclose()
+        return received
+
+    return asyncio.run(run())
+
+
+def event(seq, **overrides):
+    data = {"seq": seq, "op": "created", "id": seq, "title": "t", "category": "Macro", "tags": ["Rates"]}
+    data.update(overrides)
+    return data
+
+
+def test_stream_pushes_matching_events_only():
+    chunks = read_events(
+        "/api/insights/stream/?category=Macro&tag=Rates",
+        [event(1), event(2, category="Equities"), event(3, tags=["CPI"]), event(4, op="deleted")],
+    )
+    assert chunks[0].startswith("retry:")
+    events = [c for c in chunks[1:] if c.startswith("id:")]
+    assert [json.loads(c.split("data: ", 1)[1])["seq"] for c in events] == [1, 4]
+    assert "event: deleted" in events[1]
+    assert len(broadcaster) == 0
+
+
+def test_stream_rejects_invalid_tag_mode():
+    response = asyncio.run(insight_stream_view(AsyncRequestFactory().get("/api/insights/stream/?tag_mode=x")))
+    assert response.status_code == 400
+
+
+def test_stream_is_refused_under_wsgi():
+    response = asyncio.run(insight_stream_view(RequestFactory().get("/api/insights/stream/")))
+    assert response.status_code == 501
+    assert json.loads(response.content)["error"]["code"] == "NOT_IMPLEMENTED"
+    assert len(broadcaster) == 0
+
+
+@pytest.mark.django_db
+def test_repository_publishes_after_commit(django_capture_on_commit_callbacks, monkeypatch):
+    published = []
+    monkeypatch.setattr(broadcaster, "deliver", published.append)
+    user = User.objects.create_user(username="streamer", password="password123")
+
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        insight = InsightRepository().create(
+            title="Streamed insight",
+            category="Macro",
+            body="This is a long enough body for validation.",
+            tags=["Rates"],
+            created_by=user,
+        )
+    assert published == []
+
+    for callback in callbacks:
+        callback()
+    assert [(e["op"], e["id"], e["tags"]) for e in published] == [("created", insight.id, ["Rates"])]
+
+
+@pytest.mark.django_db
+def test_bulk_repository_writes_publish_after_commit(django_capture_on_commit_callbacks, monkeypatch):
+    published = []
+    monkeypatch.setattr(broadcaster, "deliver", published.append)
+    user = User.objects.create_user(username="streamer", password="password123")
+    repo = InsightRepository()
+    ids = [
+        repo.create(title=f"Bulk {i}", category="Macro", body="x" * 40, tags=["Rates"], created_by=user).id
+        for i in range(3)
+    ]
+    published.clear()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        repo.recategorize(ids=ids[:2], category="Equities")
+        assert published == []
+    with django_capture_on_commit_callbacks(execute=True):
+        repo.delete_many(ids=ids[1:])
+    assert [(e["op"], e["id"], e["category"], e["tags"]) for e in published] == [
+        ("updated", ids[0], "Equities", ["Rates"]),
+        ("updated", ids[1], "Equities", ["Rates"]),
+        ("deleted", ids[1], "Equities", ["Rates"]),
+        ("deleted", ids[2], "Macro", ["Rates"]),
+    ]
+    assert sorted({e["seq"] for e in published}) == [e["seq"] for e in published]
+
+
+@pytest.mark.django_db
+def test_tag_merge_publishes_retagged_insights_after_commit(django_capture_on_commit_callbacks, monkeypatch):
+    from insights.infrastructure.repositories import TagRepository
+
+    published = []
+    monkeypatch.setattr(broadcaster, "deliver", published.append)
+    user = User.objects.create_user(username="streamer", password="password123")
+    tagged = InsightRepository().create(
+        title="Tagged", category="Macro", body="x" * 40, tags=["CPI", "Rates"], created_by=user
+    )
+    InsightRepository().create(title="Other", category="Macro", body="x" * 40, tags=["Rates"], created_by=user)
+    published.clear()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        TagRepository().merge(sources=["CPI"], target="Inflation")
+        assert published == []
+    assert [(e["op"], e["id"], sorted(e["tags"])) for e in published] == [
+        ("updated", tagged.id, ["Inflation", "Rates"])
+    ]
@@ -275,4 +275,626 @@ def test_pagination_respects_page_size_query_param(auth_client):
 
     res = auth_client.get("/api/insights/?page_size=5")
     assert res.status_code == 200
-    assert len(res.data["results"]) == 5
\ No newline at end of file
+    assert len(res.data["results"]) == 5
+
+@pytest.mark.django_db
+def test_tag_filter_is_exact_and_supports_any_and_all(auth_client):
+    auth_client.post("/api/insights/", payload(title="Rates only", tags=["Rates"]), format="json")
+    auth_client.post("/api/insights/", payload(title="CPI only", tags=["CPI"]), format="json")
+    auth_client.post("/api/insights/", payload(title="Rates and CPI", tags=["Rates", "CPI"]), format="json")
+
+    any_mode = auth_client.get("/api/insights/?tag=Rates&tag=CPI")
+    assert any_mode.status_code == 200
+    assert any_mode.data["count"] == 3
+    ids = [r["id"] for r in any_mode.data["results"]]
+    assert len(ids) == len(set(ids))
+
+    all_mode = auth_client.get("/api/insights/?tag=Rates&tag=CPI&tag_mode=all")
+    assert all_mode.status_code == 200
+    assert [r["title"] for r in all_mode.data["results"]] == ["Rates and CPI"]
+
+    assert auth_client.get("/api/insights/?tag=Rat").data["count"] == 0
+    assert auth_client.get("/api/insights/?tag=Rates&tag=Missing&tag_mode=all").data["count"] == 0
+
+
+@pytest.mark.django_db
+def test_tag_contains_keeps_substring_matching(auth_client):
+    auth_client.post("/api/insights/", payload(tags=["Rates", "Real rates"]), format="json")
+
+    res = auth_client.get("/api/insights/?tag_contains=rate")
+    assert res.status_code == 200
+    assert res.data["count"] == 1
+
+
+@pytest.mark.django_db
+def test_invalid_tag_mode_is_rejected(client):
+    res = client.get("/api/insights/?tag=Rates&tag_mode=some")
+    assert res.status_code == 400
+    assert res.data["error"]["code"] == "VALIDATION_ERROR"
+
+
+@pytest.mark.django_db
+def test_ordering_by_whitelisted_field(auth_client):
+    for title in ["Charlie insight", "Alpha insight", "Bravo insight"]:
+        auth_client.post("/api/insights/", payload(title=title), format="json")
+
+    res = auth_client.get("/api/insights/?ordering=title")
+    assert res.status_code == 200
+    assert [r["title"] for r in res.data["results"]] == [
+        "Alpha insight",
+        "Bravo insight",
+        "Charlie insight",
+    ]
+
+    default = auth_client.get("/api/insights/")
+    assert [r["title"] for r in default.data["results"]][0] == "Bravo insight"
+
+
+@pytest.mark.django_db
+def test_unsupported_ordering_is_rejected(client):
+    res = client.get("/api/insights/?ordering=body")
+    assert res.status_code == 400
+    assert res.data["error"]["code"] == "VALIDATION_ERROR"
+
+
+@pytest.mark.django_db
+def test_mine_lists_only_own_insights_with_cached_count(auth_client, user, other_user):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    other = APIClient()
+    other.force_authenticate(user=other_user)
+    for i in range(3):
+        auth_client.post("/api/insights/", payload(title=f"Mine {i}"), format="json")
+    other.post("/api/insights/", payload(title="Not mine"), format="json")
+
+    with CaptureQueriesContext(connection) as ctx:
+        res = auth_client.get("/api/insights/mine/?page_size=2")
+    assert res.status_code == 200
+    assert res.data["count"] == 3
+    assert len(res.data["results"]) == 2
+    assert all(r["created_by"]["id"] == user.id for r in res.data["results"])
+    assert not any("COUNT(" in q["sql"].upper() for q in ctx.captured_queries)
+
+    by_param = auth_client.get(f"/api/insights/?created_by={other_user.id}")
+    assert [r["title"] for r in by_param.data["results"]] == ["Not mine"]
+    assert auth_client.get("/api/insights/?created_by=%C2%B2").status_code == 400
+
+    insight_id = res.data["results"][0]["id"]
+    auth_client.delete(f"/api/insights/{insight_id}/")
+    assert auth_client.get("/api/insights/mine/").data["count"] == 2
+
+
+@pytest.mark.django_db
+def test_mine_requires_authentication(client):
+    res = client.get("/api/insights/mine/")
+    assert res.status_code in (401, 403)
+
+
+@pytest.mark.django_db
+def test_batch_retrieve_keeps_order_and_reports_missing(client, auth_client):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    ids = [
+        auth_client.post("/api/insights/", payload(title=f"Batch {i}"), format="json").data["id"]
+        for i in range(5)
+    ]
+    wanted = [ids[3], 999999, ids[0], ids[4]]
+
+    with CaptureQueriesContext(connection) as ctx:
+        res = client.get("/api/insights/batch/?ids=" + ",".join(map(str, wanted)))
+    assert res.status_code == 200
+    assert [r["id"] for r in res.data["results"]] == [ids[3], ids[0], ids[4]]
+    assert res.data["missing"] == [999999]
+    assert res.data["results"][0]["tags"] == ["CPI", "Rates"]
+    # Insights + tags, then one archive probe for the id not in the hot table.
+    assert len(ctx.captured_queries) == 3
+
+    posted = client.post("/api/insights/batch/", {"ids": [ids[1], ids[2]]}, format="json")
+    assert posted.status_code == 200
+    assert [r["id"] for r in posted.data["results"]] == [ids[1], ids[2]]
+
+
+@pytest.mark.django_db
+def test_batch_retrieve_validates_ids(client):
+    assert client.get("/api/insights/batch/?ids=a,b").status_code == 400
+    assert client.get("/api/insights/batch/").status_code == 400
+    listed = client.post("/api/insights/batch/", [1, 2], format="json")
+    assert listed.status_code == 400 and listed.data["error"]["code"] == "VALIDATION_ERROR"
+    too_many = ",".join(str(i) for i in range(1, 300))
+    res = client.get(f"/api/insights/batch/?ids={too_many}")
+    assert res.status_code == 400
+    assert res.data["error"]["code"] == "VALIDATION_ERROR"
+
+
+@pytest.mark.django_db
+def test_change_feed_returns_creates_updates_and_tombstones(client, auth_client):
+    created = auth_client.post("/api/insights/", payload(title="Feed one"), format="json").data
+    deleted = auth_client.post("/api/insights/", payload(title="Feed two"), format="json").data
+    auth_client.patch(f"/api/insights/{created['id']}/", {"title": "Feed one edited"}, format="json")
+    auth_client.delete(f"/api/insights/{deleted['id']}/")
+
+    res = client.get("/api/insights/changes/?since=0")
+    assert res.status_code == 200
+    changes = res.data["changes"]
+    assert [(c["op"], c["id"]) for c in changes] == [
+        ("created", created["id"]),
+        ("created", deleted["id"]),
+        ("updated", created["id"]),
+        ("deleted", deleted["id"]),
+    ]
+    assert changes[2]["insight"]["title"] == "Feed one edited"
+    assert changes[3]["insight"] is None
+    assert res.data["has_more"] is False
+
+    again = client.get(f"/api/insights/changes/?since={res.data['cursor']}")
+    assert again.data["changes"] == []
+    assert again.data["cursor"] == res.data["cursor"]
+
+    paged = client.get("/api/insights/changes/?since=0&limit=3")
+    assert len(paged.data["changes"]) == 3
+    assert paged.data["has_more"] is True
+
+    for bad in ("since=%C2%B2", "since=-1", "limit=x"):
+        res = client.get(f"/api/insights/changes/?{bad}")
+        assert res.status_code == 400 and res.data["error"]["code"] == "VALIDATION_ERROR"
+
+
+@pytest.mark.django_db
+def test_change_feed_requires_resync_after_compaction(client, auth_client):
+    from datetime import timedelta
+    from io import StringIO
+
+    from django.core.management import call_command
+    from django.utils import timezone
+
+    from insights.models import InsightChange
+
+    auth_client.post("/api/insights/", payload(), format="json")
+    auth_client.post("/api/insights/", payload(), format="json")
+    InsightChange.objects.update(created_at=timezone.now() - timedelta(days=90))
+    call_command("compact_insight_changes", days=30, stdout=StringIO())
+
+    res = client.get("/api/insights/changes/?since=0")
+    assert res.status_code == 410
+    assert res.data["error"]["code"] == "RESYNC_REQUIRED"
+    cursor = res.data["error"]["details"]["cursor"]
+
+    assert client.get(f"/api/insights/changes/?since={cursor}").status_code == 200
+
+
+@pytest.mark.django_db
+def test_large_listings_report_estimated_count(auth_client, settings, monkeypatch):
+    from insights.infrastructure import pagination
+
+    for i in range(3):
+        auth_client.post("/api/insights/", payload(title=f"Counted {i}"), format="json")
+
+    exact = auth_client.get("/api/insights/")
+    assert exact.data["count"] == 3
+    assert exact.data["count_is_estimate"] is False
+
+    settings.INSIGHTS_APPROX_COUNT_THRESHOLD = 1000
+    monkeypatch.setattr(pagination, "estimate_count", lambda qs: 250_000)
+    estimated = auth_client.get("/api/insights/")
+    assert estimated.data["count"] == 250_000
+    assert estimated.data["count_is_estimate"] is True
+    assert len(estimated.data["results"]) == 3
+
+    monkeypatch.setattr(pagination, "estimate_count", lambda qs: 12)
+    assert auth_client.get("/api/insights/?category=Macro").data["count"] == 3
+
+
+@pytest.mark.django_db
+def test_merge_tags_relinks_insights_and_deduplicates(auth_client, user):
+    from insights.models import InsightChange, Tag
+
+    a = auth_client.post("/api/insights/", payload(title="Both spellings", tags=["CPI", "cpi"]), format="json")
+    b = auth_client.post("/api/insights/", payload(title="Dotted spelling", tags=["C.P.I.", "Rates"]), format="json")
+    auth_client.post("/api/insights/", payload(title="Untouched one", tags=["Rates"]), format="json")
+
+    assert auth_client.post("/api/tags/merge/", {"sources": ["CPI"], "target": "cpi"}, format="json").status_code == 403
+
+    user.is_staff = True
+    user.save()
+    bad = auth_client.post("/api/tags/merge/", {"sources": ["nope"], "target": "cpi"}, format="json")
+    assert bad.status_code == 400
+    assert bad.data["error"]["code"] == "VALIDATION_ERROR"
+    listed = auth_client.post("/api/tags/merge/", ["CPI"], format="json")
+    assert listed.status_code == 400 and listed.data["error"]["code"] == "VALIDATION_ERROR"
+
+    before = InsightChange.objects.count()
+    resp = auth_client.post("/api/tags/merge/", {"sources": ["CPI", "C.P.I."], "target": "cpi"}, format="json")
+    assert resp.status_code == 200
+    assert sorted(resp.data["merged"]) == ["C.P.I.", "CPI"]
+    assert resp.data["insights_updated"] == 2
+    assert InsightChange.objects.count() == before + 2
+
+    assert sorted(Tag.objects.values_list("name", flat=True)) == ["Rates", "cpi"]
+    assert auth_client.get(f"/api/insights/{a.data['id']}/").data["tags"] == ["cpi"]
+    assert sorted(auth_client.get(f"/api/insights/{b.data['id']}/").data["tags"]) == ["Rates", "cpi"]
+    assert auth_client.get("/api/insights/?tag=cpi").data["count"] == 2
+
+
+@pytest.mark.django_db
+def test_merge_statement_count_does_not_grow_with_tagged_insights(user):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from insights.infrastructure.repositories import InsightRepository, TagRepository
+
+    def merge_queries(n, source):
+        for i in range(n):
+            InsightRepository().create(
+                title=f"Insight {i}", category="Macro", body="x" * 40, tags=[source, "Rates"], created_by=user
+            )
+        with CaptureQueriesContext(connection) as ctx:
+            assert TagRepository().merge(sources=[source], target="Rates").insights_updated == n
+        return len(ctx.captured_queries)
+
+    assert merge_queries(2, "CPI") == merge_queries(30, "PPI")
+
+
+@pytest.mark.django_db
+def test_tag_canonicalization_on_write_and_normalize_command(auth_client, settings):
+    from django.core.management import call_command
+
+    from insights.models import Tag
+
+    auth_client.post("/api/insights/", payload(title="Legacy spelling", tags=["Rate  Cuts", "CPI"]), format="json")
+
+    settings.INSIGHT_TAG_CANONICALIZER = "insights.domain.rules.canonical_tag_name"
+    resp = auth_client.post("/api/insights/", payload(title="New spelling", tags=["C.P.I.", "cpi", "Rates"]), format="json")
+    assert sorted(resp.data["tags"]) == ["cpi", "rates"]
+    assert auth_client.get("/api/insights/?tag=CPI").data["count"] == 1
+
+    call_command("merge_tags", "--normalize")
+    assert sorted(Tag.objects.values_list("name", flat=True)) == ["cpi", "rate cuts", "rates"]
+    assert auth_client.get("/api/insights/?tag=CPI").data["count"] == 2
+
+
+@pytest.mark.django_db
+def test_tag_resolution_is_cached_until_tags_are_merged(auth_client, user, django_capture_on_commit_callbacks):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    def tag_queries(fn):
+        with django_capture_on_commit_callbacks(execute=True), CaptureQueriesContext(connection) as ctx:
+            fn()
+        # Name lookups and inserts only; reading an insight's own tags is not resolution.
+        lookups = ('"insights_tag"."name" IN', '"insights_tag"."name" =', 'INSERT INTO "insights_tag"')
+        return [q["sql"] for q in ctx.captured_queries if any(m in q["sql"] for m in lookups)]
+
+    def create(title):
+        return auth_client.post("/api/insights/", payload(title=title, tags=["Rates", "CPI", "FX"]), format="json")
+
+    assert tag_queries(lambda: create("Warm the cache"))
+    assert tag_queries(lambda: create("Served from cache")) == []
+    assert tag_queries(lambda: auth_client.get("/api/insights/?tag=CPI&tag=FX&tag_mode=all")) == []
+
+    user.is_staff = True
+    user.save()
+    with django_capture_on_commit_callbacks(execute=True):
+        auth_client.post("/api/tags/merge/", {"sources": ["CPI"], "target": "Inflation"}, format="json")
+    assert auth_client.get("/api/insights/?tag=CPI").data["count"] == 0
+    assert auth_client.get("/api/insights/?tag=Inflation").data["count"] == 2
+
+
+@pytest.mark.django_db
+def test_retrieve_with_a_non_integer_id_is_not_found(client):
+    for pk in ("%C2%B2", "-1", "abc"):
+        assert client.get(f"/api/insights/{pk}/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_archived_insights_leave_default_lists_but_stay_readable(auth_client, user):
+    from datetime import timedelta
+
+    from django.core.management import call_command
+    from django.utils import timezone
+
+    from insights.models import ArchivedInsight, AuthorStats, Insight
+
+    ids = []
+    for i, tags in enumerate([["Rates", "Old"], ["Old"], ["Rates"]]):
+        ids.append(auth_client.post("/api/insights/", payload(title=f"Insight {i}", tags=tags), format="json").data["id"])
+    long_ago = timezone.now() - timedelta(days=800)
+    Insight.objects.filter(id__in=ids[:2]).update(created_at=long_ago)
+
+    call_command("archive_insights", "--days", "365", "--batch-size", "1")
+
+    assert set(ArchivedInsight.objects.values_list("id", flat=True)) == set(ids[:2])
+    assert AuthorStats.objects.get(user=user).insight_count == 1
+    assert [r["id"] for r in auth_client.get("/api/insights/").data["results"]] == [ids[2]]
+
+    both = auth_client.get("/api/insights/?include_archived=true&ordering=title")
+    assert both.data["count"] == 3
+    assert [r["title"] for r in both.data["results"]] == ["Insight 0", "Insight 1", "Insight 2"]
+    tagged = auth_client.get("/api/insights/?include_archived=1&tag=Rates")
+    assert sorted(r["id"] for r in tagged.data["results"]) == [ids[0], ids[2]]
+
+    old = auth_client.get(f"/api/insights/{ids[0]}/")
+    assert old.status_code == 200
+    assert sorted(old.data["tags"]) == ["Old", "Rates"]
+    assert auth_client.get(f"/api/insights/batch/?ids={ids[1]},{ids[2]}").data["missing"] == []
+    assert auth_client.delete(f"/api/insights/{ids[0]}/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_tag_merge_retags_archived_insights_and_retires_their_cached_form(auth_client, user):
+    from datetime import timedelta
+
+    from django.core.management import call_command
+    from django.utils import timezone
+
+    from insights.models import Insight, InsightChange
+
+    pk = auth_client.post("/api/insights/", payload(title="Archived one", tags=["CPI", "Rates"]), format="json").data["id"]
+    Insight.objects.filter(id=pk).update(created_at=timezone.now() - timedelta(days=800))
+    call_command("archive_insights", "--days", "365")
+    assert sorted(auth_client.get(f"/api/insights/{pk}/").data["tags"]) == ["CPI", "Rates"]  # now cached
+
+    user.is_staff = True
+    user.save()
+    before = InsightChange.objects.count()
+    resp = auth_client.post("/api/tags/merge/", {"sources": ["CPI"], "target": "Inflation"}, format="json")
+    assert resp.data["insights_updated"] == 1
+    assert list(InsightChange.objects.values_list("insight_id", "op"))[before:] == [(pk, "updated")]
+    assert sorted(auth_client.get(f"/api/insights/{pk}/").data["tags"]) == ["Inflation", "Rates"]
+
+
+@pytest.mark.django_db
+def test_hot_ordering_ranks_viewed_and_recent_insights(auth_client, settings):
+    from datetime import timedelta
+
+    from django.core.management import call_command
+    from django.utils import timezone
+
+    from insights.domain.rules import hot_score
+    from insights.infrastructure.view_counts import view_counts
+    from insights.models import Insight
+
+    ids = [auth_client.post("/api/insights/", payload(title=f"Insight {i}"), format="json").data["id"] for i in range(3)]
+    # The oldest is one day (one half-life) older; three views put it level with
+    # a fresh insight with one view, four put it ahead.
+    Insight.objects.filter(id=ids[0]).update(created_at=timezone.now() - timedelta(hours=settings.INSIGHT_HOT_HALF_LIFE_HOURS))
+    for pk, views in ((ids[0], 4), (ids[1], 1)):
+        for _ in range(views):
+            assert auth_client.get(f"/api/insights/{pk}/").status_code == 200
+    assert view_counts.pending() == {ids[0]: 4, ids[1]: 1}
+    assert view_counts.flush() == 5
+    assert list(Insight.objects.filter(hot_dirty=True).order_by("id").values_list("id", flat=True)) == ids[:2]
+
+    call_command("refresh_hot_scores", "--batch-size", "1")
+    hot = auth_client.get("/api/insights/?ordering=hot").data["results"]
+    assert [r["id"] for r in hot] == [ids[0], ids[1], ids[2]]
+    row = Insight.objects.get(id=ids[0])
+    assert not row.hot_dirty and row.view_count == 4
+    assert row.hot_score == pytest.approx(
+        hot_score(views=4, created_at=row.created_at, half_life_hours=settings.INSIGHT_HOT_HALF_LIFE_HOURS)
+    )
+    # New insights start with a current score, no refresh needed.
+    fresh = Insight.objects.get(id=ids[2])
+    assert not fresh.hot_dirty
+    assert fresh.hot_score == pytest.approx(
+        hot_score(views=0, created_at=fresh.created_at, half_life_hours=settings.INSIGHT_HOT_HALF_LIFE_HOURS)
+    )
+
+    settings.INSIGHT_HOT_HALF_LIFE_HOURS = 1000
+    call_command("refresh_hot_scores", "--all")
+    assert [r["id"] for r in auth_client.get("/api/insights/?ordering=hot").data["results"]][0] == ids[0]
+    assert auth_client.get("/api/insights/?ordering=hot&include_archived=true").data["count"] == 3
+
+
+@pytest.mark.django_db
+def test_view_buffer_without_flush_thread_stays_bounded(auth_client, settings, monkeypatch):
+    import atexit
+
+    from insights.infrastructure.view_counts import ViewCountBuffer
+    from insights.models import Insight
+
+    registered = []
+    monkeypatch.setattr(atexit, "register", registered.append)
+    settings.INSIGHT_VIEW_FLUSH_MAX_PENDING = 3
+    pk = auth_client.post("/api/insights/", payload(), format="json").data["id"]
+    buffer = ViewCountBuffer()
+
+    buffer.record(pk)
+    assert registered == [buffer.flush]  # flushed at exit even with no thread
+    buffer.record(pk)
+    buffer.record(pk)
+    assert buffer.pending() == {}
+    assert Insight.objects.get(id=pk).view_count == 3
+
+
+@pytest.mark.django_db
+def test_edit_keeps_views_flushed_while_it_ran(auth_client):
+    from insights.infrastructure.repositories import EngagementRepository, InsightRepository
+    from insights.models import Insight
+
+    pk = auth_client.post("/api/insights/", payload(), format="json").data["id"]
+    loaded = Insight.objects.get(id=pk)  # as the edit request would have it
+    EngagementRepository().add_views({pk: 50})
+
+    InsightRepository().update(insight=loaded, title="Edited title", category="Macro", body=loaded.body, tags=["rates"])
+    row = Insight.objects.get(id=pk)
+    assert (row.title, row.view_count, row.hot_dirty) == ("Edited title", 50, True)
+
+
+@pytest.mark.django_db
+def test_idempotency_key_replays_the_first_create(auth_client, other_user):
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from insights.models import IdempotencyKey, Insight
+
+    first = auth_client.post("/api/insights/", payload(), format="json", HTTP_IDEMPOTENCY_KEY="import-42")
+    retry = auth_client.post("/api/insights/", payload(), format="json", HTTP_IDEMPOTENCY_KEY="import-42")
+    assert first.status_code == retry.status_code == 201
+    assert retry.data == first.data
+    assert retry["Idempotent-Replayed"] == "true" and not first.has_header("Idempotent-Replayed")
+    assert Insight.objects.count() == 1
+
+    reused = auth_client.post("/api/insights/", payload(title="Another one"), format="json", HTTP_IDEMPOTENCY_KEY="import-42")
+    assert reused.status_code == 422
+    assert reused.data["error"]["code"] == "UNPROCESSABLE"
+
+    # Keys are per user; failed attempts do not hold the key.
+    other = APIClient()
+    other.force_authenticate(user=other_user)
+    assert other.post("/api/insights/", payload(), format="json", HTTP_IDEMPOTENCY_KEY="import-42").status_code == 201
+    invalid = auth_client.post("/api/insights/", payload(title="x"), format="json", HTTP_IDEMPOTENCY_KEY="import-43")
+    assert invalid.status_code == 400
+    assert auth_client.post("/api/insights/", payload(), format="json", HTTP_IDEMPOTENCY_KEY="import-43").status_code == 201
+    assert Insight.objects.count() == 3
+
+    # A duplicate arriving while the first attempt still runs is turned away;
+    # once that attempt's lock times out (its worker died) the key is taken over.
+    auth_client.post("/api/insights/", payload(title="In flight"), format="json", HTTP_IDEMPOTENCY_KEY="import-44")
+    Insight.objects.filter(title="In flight").delete()
+    claim = IdempotencyKey.objects.filter(key="import-44")
+    claim.update(response_status=None, response_body=None, locked_until=timezone.now() + timedelta(seconds=60))
+    busy = auth_client.post("/api/insights/", payload(title="In flight"), format="json", HTTP_IDEMPOTENCY_KEY="import-44")
+    assert busy.status_code == 409
+    assert busy.data["error"]["code"] == "CONFLICT" and busy["Retry-After"] == "1"
+    claim.update(locked_until=timezone.now() - timedelta(seconds=1))
+    taken = auth_client.post("/api/insights/", payload(title="In flight"), format="json", HTTP_IDEMPOTENCY_KEY="import-44")
+    assert taken.status_code == 201 and not taken.has_header("Idempotent-Replayed")
+
+    insight_id = first.data["id"]
+    for _ in range(2):
+        resp = auth_client.delete(f"/api/insights/{insight_id}/", HTTP_IDEMPOTENCY_KEY="delete-42")
+        assert resp.status_code == 204
+
+
+@pytest.mark.django_db
+def test_expired_idempotency_keys_are_purged_and_reusable(auth_client, user, settings):
+    from datetime import timedelta
+
+    from django.core.management import call_command
+    from django.utils import timezone
+
+    from insights.models import IdempotencyKey, Insight
+
+    for key in ("a", "b", "c"):
+        auth_client.post("/api/insights/", payload(title=f"Keyed {key}"), format="json", HTTP_IDEMPOTENCY_KEY=key)
+    IdempotencyKey.objects.filter(key__in=["a", "b"]).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+    # An expired key no longer replays, even before the purge runs.
+    again = auth_client.post("/api/insights/", payload(title="Keyed a"), format="json", HTTP_IDEMPOTENCY_KEY="a")
+    assert again.status_code == 201 and not again.has_header("Idempotent-Replayed")
+    assert Insight.objects.count() == 4
+
+    call_command("purge_idempotency_keys", "--batch-size", "1")
+    assert sorted(IdempotencyKey.objects.values_list("key", flat=True)) == ["a", "c"]
+
+
+@pytest.mark.django_db
+def test_slow_queries_are_logged_with_plan_and_origin(auth_client, user, settings):
+    from django.core.management import call_command
+
+    from insights.infrastructure.query_log import fingerprint, slow_query_log
+
+    assert fingerprint("SELECT 1 FROM t WHERE a IN (%s, %s) AND b = 'x'")[0] == "SELECT ? FROM t WHERE a IN (...) AND b = ?"
+    assert fingerprint("SELECT * FROM t WHERE id IN (%s)")[1] == fingerprint("SELECT * FROM t WHERE id IN (%s, %s)")[1]
+
+    auth_client.post("/api/insights/", payload(), format="json")
+    slow_query_log.clear()
+    settings.SLOW_QUERY_THRESHOLD_MS = 0.000001
+    settings.SLOW_QUERY_EXPLAIN = "sync"
+    auth_client.get("/api/insights/?tag=CPI")
+    settings.SLOW_QUERY_THRESHOLD_MS = 0
+
+    top = slow_query_log.top(limit=50)
+    listing = next(t for t in top if t["sql"].startswith("SELECT") and "ORDER BY" in t["sql"] and "LIMIT" in t["sql"])
+    assert listing["views"] == ["insight-list"]
+    assert listing["use_cases"] == ["ListInsightsUseCase"]
+    assert listing["plan"]
+
+    assert auth_client.get("/api/diagnostics/slow-queries/").status_code == 403
+    user.is_staff = True
+    user.save()
+    resp = auth_client.get("/api/diagnostics/slow-queries/?limit=5")
+    assert resp.status_code == 200
+    assert len(resp.data["top"]) <= 5
+    assert auth_client.get("/api/diagnostics/slow-queries/?limit=%C2%B2").status_code == 400
+    call_command("slow_queries", "--plans", "--clear")
+    assert slow_query_log.entries() == []
+
+
+def test_traced_use_case_label_ends_with_the_call():
+    import asyncio
+
+    from insights.infrastructure.query_log import current_use_case, traced
+
+    class Probe:
+        @traced
+        def run(self, fail=False):
+            if fail:
+                raise RuntimeError
+            return current_use_case.get()
+
+        @traced
+        async def arun(self):
+            return current_use_case.get()
+
+    assert Probe().run() == Probe.__qualname__ and current_use_case.get() is None
+    with pytest.raises(RuntimeError):
+        Probe().run(fail=True)
+    assert current_use_case.get() is None
+    assert asyncio.run(Probe().arun()) == Probe.__qualname__
+
+
+def test_slow_query_log_keeps_every_workers_entries_in_a_ring(settings):
+    from insights.infrastructure.query_log import SlowQueryLog
+
+    settings.SLOW_QUERY_LOG_SIZE = 3
+    workers = [SlowQueryLog(), SlowQueryLog()]  # sharing only the cache, like two processes
+    workers[0].clear()
+    for n in range(5):
+        workers[n % 2].append({"n": n})
+    assert [e["n"] for e in workers[1].entries()] == [2, 3, 4]
+
+    workers[0].clear()
+    assert workers[1].entries() == []
+    workers[1].append({"n": 5})
+    assert workers[0].entries() == [{"n": 5}]
+
+
+@pytest.mark.django_db
+def test_list_and_detail_reuse_cached_representations(auth_client, user, django_capture_on_commit_callbacks):
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from insights.infrastructure.representations import KEY_PREFIX
+
+    ids = [
+        auth_client.post("/api/insights/", payload(title=f"Cached {i}", tags=["Rates"]), format="json").data["id"]
+        for i in range(3)
+    ]
+    client = APIClient()
+    cold = client.get("/api/insights/?ordering=title").data["results"]
+
+    # Other list variants and the detail view only read keys, then hit the cache.
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.get("/api/insights/?category=Macro&ordering=title").data["results"] == cold
+        assert client.get(f"/api/insights/{ids[1]}/").data == cold[1]
+    assert len(ctx.captured_queries) == 3  # COUNT, page keys, detail key
+
+    with django_capture_on_commit_callbacks(execute=True):
+        auth_client.patch(f"/api/insights/{ids[0]}/", {"title": "Cached edited"}, format="json")
+    assert client.get(f"/api/insights/{ids[0]}/").data["title"] == "Cached edited"
+    with django_capture_on_commit_callbacks(execute=True):
+        auth_client.delete(f"/api/insights/{ids[2]}/")
+    assert cache.get(f"{KEY_PREFIX}{ids[2]}") is None
+
+    user.is_staff = True
+    user.save()
+    stats = auth_client.get("/api/diagnostics/representation-cache/").data
+    assert stats["hits"] == 4 and stats["misses"] == 4
+    assert stats["hit_ratio"] == 0.5
+    assert auth_client.delete("/api/diagnostics/representation-cache/").status_code == 204
+    assert auth_client.get("/api/diagnostics/representation-cache/").data["hit_ratio"] is None
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+
+from insights.models import AuthorStats, Insight, InsightChange, LoadCheckpoint
+
+User = get_user_model()
+
+BODY = "This body is long enough to pass validation."
+
+
+def record(i, **overrides):
+    data = {
+        "title": f"Backfill {i:04d}",
+        "category": "Macro",
+        "body": BODY,
+        "tags": ["rates", f"t{i % 3}"],
+        "created_at": "2019-05-01T12:00:00Z",
+    }
+    data.update(overrides)
+    return data
+
+
+@pytest.fixture
+def author(db):
+    return User.objects.create_user(username="loader", password="Password12345!")
+
+
+@pytest.mark.django_db
+def test_load_ndjson_validates_and_keeps_side_tables_in_step(tmp_path, author):
+    src = tmp_path / "notes.ndjson"
+    lines = [json.dumps(record(i)) for i in range(5)]
+    lines.insert(2, json.dumps(record(99, title="no")))
+    lines.insert(4, "{not json")
+    src.write_text("\n".join(lines) + "\n")
+
+    call_command("load_insights", str(src), "--user", "loader", "--batch-size", "2")
+
+    assert Insight.objects.count() == 5
+    assert Insight.objects.filter(created_at__year=2019).count() == 5
+    assert set(Insight.objects.get(title="Backfill 0001").tags.values_list("name", flat=True)) == {"rates", "t1"}
+    assert AuthorStats.objects.get(user=author).insight_count == 5
+    assert InsightChange.objects.filter(op=InsightChange.Op.CREATED).count() == 5
+    checkpoint = LoadCheckpoint.objects.get(job=str(src.resolve()))
+    assert (checkpoint.position, checkpoint.loaded, checkpoint.rejected) == (7, 5, 2)
+
+
+@pytest.mark.django_db
+def test_load_csv_resumes_from_checkpoint(tmp_path, author):
+    src = tmp_path / "notes.csv"
+    rows = ["title,category,body,tags,created_by"]
+    rows += [f"Backfill {i:04d},Equities,{BODY},rates|t{i},loader" for i in range(6)]
+    rows.insert(4, f"Backfill 9999,Equities,{BODY},rates,ghost")
+    src.write_text("\n".join(rows) + "\n")
+
+    with pytest.raises(CommandError):
+        call_command("load_insights", str(src), "--batch-size", "2", "--max-errors", "0")
+    # Every chunk up to and including the one with the bad row was committed.
+    assert Insight.objects.count() == 3
+
+    call_command("load_insights", str(src), "--batch-size", "2")
+    assert Insight.objects.count() == 6
+    assert sorted(Insight.objects.values_list("title", flat=True)) == [f"Backfill {i:04d}" for i in range(6)]
+
+    call_command("load_insights", str(src), "--batch-size", "2")
+    assert Insight.objects.count() == 6
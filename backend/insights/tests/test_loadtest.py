@@ -0,0 +1,73 @@
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from insights.loadtest import compare_reports, parse_mix, percentile
+from insights.models import Insight
+
+User = get_user_model()
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([7.0], 99) == 7.0
+    assert percentile([], 50) == 0.0
+
+
+def test_parse_mix_rejects_unknown_scenarios():
+    assert parse_mix("browse:3,author") == {"browse": 3.0, "author": 1.0}
+    with pytest.raises(ValueError):
+        parse_mix("browse,stampede:2")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_loadtest_against_live_server(live_server, tmp_path, capsys, settings):
+    settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+    user = User.objects.create_user(username="loader", password="Password12345!")
+    Insight.objects.create(title="Seed insight", category="Macro", body="Long enough body text.", created_by=user)
+    output = tmp_path / "report.json"
+
+    call_command(
+        "loadtest",
+        url=live_server.url,
+        scenario="browse:2,top-tags:1,author:1",
+        concurrency=2,
+        duration=1.0,
+        warmup=0.2,
+        username="loader",
+        password="Password12345!",
+        seed=1,
+        json=True,
+        output=str(output),
+    )
+
+    report = json.loads(capsys.readouterr().out)
+    assert report == json.loads(output.read_text())
+    routes = report["routes"]
+    assert routes["GET insights/ (list)"]["status_codes"] == {"200": routes["GET insights/ (list)"]["requests"]}
+    assert routes["POST insights/"]["status_codes"].keys() == {"201"}
+    assert routes["DELETE insights/<id>/"]["status_codes"].keys() == {"204"}
+    # Browsing may race an author step deleting the insight it just listed.
+    assert set(report["total"]["errors"]) <= {"404"}
+    assert report["total"]["errors"].get("404", 0) == routes.get("GET insights/<id>/", {}).get("errors", {}).get(
+        "404", 0
+    )
+    assert report["total"]["p50_ms"] <= report["total"]["p95_ms"] <= report["total"]["p99_ms"]
+    assert Insight.objects.count() == 1  # author steps clean up after themselves
+
+    capsys.readouterr()
+    call_command("loadtest", compare=[str(output), str(output)])
+    assert "+0%" in capsys.readouterr().out
+
+
+def test_compare_reports_lists_shared_routes():
+    route = {"rps": 100.0, "p50_ms": 10.0, "p95_ms": 20.0, "p99_ms": 40.0}
+    base = {"routes": {"a": route}, "total": route}
+    other = {"routes": {"a": dict(route, p95_ms=10.0)}, "total": route}
+    lines = compare_reports(base, other)
+    assert any("p95_ms" in line and "-50%" in line for line in lines)
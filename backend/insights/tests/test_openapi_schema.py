@@ -0,0 +1,74 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from project import schema
+
+
+@pytest.fixture(autouse=True)
+def schema_path(settings, tmp_path):
+    settings.OPENAPI_SCHEMA_PATH = str(tmp_path / "openapi.json")
+    cache.clear()
+    schema.reset_schema()
+    yield tmp_path / "openapi.json"
+    schema.reset_schema()
+
+
+def test_schema_is_generated_once_and_served_with_etag(monkeypatch):
+    calls = []
+    real_generate = schema.generate_schema
+    monkeypatch.setattr(schema, "generate_schema", lambda: calls.append(1) or real_generate())
+    client = APIClient()
+
+    first = client.get("/api/schema/?format=json")
+    assert first.status_code == 200
+    assert first["Content-Type"] == schema.JSON_MEDIA_TYPE
+    assert "/api/insights/" in json.loads(first.content)["paths"]
+
+    yaml = client.get("/api/schema/")
+    assert yaml["Content-Type"] == schema.YAML_MEDIA_TYPE
+    assert yaml.content.startswith(b"openapi:")
+
+    cached = client.get("/api/schema/?format=json", HTTP_IF_NONE_MATCH=first["ETag"])
+    assert cached.status_code == 304
+    assert calls == [1]
+
+
+def test_management_command_writes_artifact_that_is_served(schema_path, monkeypatch):
+    call_command("generate_openapi_schema", stdout=StringIO())
+    assert schema_path.exists()
+
+    schema.reset_schema()
+    cache.clear()
+    monkeypatch.setattr(schema, "generate_schema", lambda: pytest.fail("artifact should be used"))
+    res = APIClient().get("/api/schema/?format=json")
+    assert res.status_code == 200
+    assert json.loads(res.content) == json.loads(schema_path.read_text())
+
+
+def test_shared_cache_entry_is_scoped_to_the_build(settings, monkeypatch):
+    settings.DEBUG = False
+    calls = []
+    monkeypatch.setattr(schema, "generate_schema", lambda: calls.append(1) or {"openapi": "3.0.3", "build": len(calls)})
+    timeouts = []
+    real_set = schema.cache.set
+    monkeypatch.setattr(
+        schema.cache, "set", lambda key, value, timeout: timeouts.append(timeout) or real_set(key, value, timeout)
+    )
+
+    settings.OPENAPI_SCHEMA_BUILD_ID = "abc123"
+    assert schema.get_schema()["build"] == 1
+    schema.reset_schema()
+    assert schema.get_schema()["build"] == 1  # another worker of the same build
+    schema.reset_schema()
+    settings.OPENAPI_SCHEMA_BUILD_ID = "def456"
+    assert schema.get_schema()["build"] == 2  # a new deploy regenerates
+
+    schema.reset_schema()
+    settings.OPENAPI_SCHEMA_BUILD_ID = ""
+    schema.get_schema()
+    assert timeouts == [None, None, settings.OPENAPI_SCHEMA_CACHE_SECONDS]
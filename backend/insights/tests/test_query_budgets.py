@@ -0,0 +1,180 @@
+"""
+Query budgets for every route in insights/urls.py.
+
+Each scenario runs against 1, 10 and 100 seeded insights and must issue
+the same number of queries at every size (no N+1), and no more than its
+entry in query_budgets.json. After an intended change, regenerate the
+baseline with:
+
+    UPDATE_QUERY_BUDGETS=1 python -m pytest insights/tests/test_query_budgets.py
+"""
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from insights.infrastructure.bulk_load import InsightBulkLoader, InsightRecord
+
+User = get_user_model()
+
+BASELINE_PATH = Path(__file__).with_name("query_budgets.json")
+SIZES = (1, 10, 100)
+PASSWORD = "Password12345!"
+BODY = "This body is long enough to pass validation."
+
+# Routes deliberately left out of the harness.
+EXCLUDED_ROUTES = {
+    "insight-stream": "long-lived SSE response; it issues no queries per event",
+}
+
+
+@dataclass
+class Context:
+    n: int
+    user: User
+    client: APIClient
+    staff_client: APIClient
+    anon: APIClient
+    ids: list[int]
+
+
+def seed(n: int) -> Context:
+    user = User.objects.create_user(username=f"budget{n}", password=PASSWORD)
+    staff = User.objects.create_user(username=f"staff{n}", password=PASSWORD, is_staff=True)
+    records = [
+        InsightRecord(
+            number=i + 1,
+            title=f"Budget insight {i:03d}",
+            category="Macro",
+            body=BODY,
+            tags=("shared", "rates", f"t{i % 5}"),
+        )
+        for i in range(n)
+    ]
+    InsightBulkLoader(job=f"budget-{n}", default_author=user).write_chunk(records, consumed=n)
+    ids = list(user.insights.order_by("id").values_list("id", flat=True))
+
+    client, staff_client = APIClient(), APIClient()
+    client.force_authenticate(user=user)
+    staff_client.force_authenticate(user=staff)
+    return Context(n=n, user=user, client=client, staff_client=staff_client, anon=APIClient(), ids=ids)
+
+
+def _insight(**overrides):
+    data = {"title": "Budget new insight", "category": "Macro", "body": BODY, "tags": ["shared", "fx"]}
+    data.update(overrides)
+    return data
+
+
+# (route name or pattern, label) -> request issued against a seeded Context.
+SCENARIOS: dict[tuple[str, str], Callable[[Context], object]] = {
+    ("api-root", "GET"): lambda c: c.client.get("/api/"),
+    ("token_obtain_pair", "POST"): lambda c: c.anon.post(
+        "/api/auth/login/", {"username": c.user.username, "password": PASSWORD}, format="json"
+    ),
+    ("token_refresh", "POST"): lambda c: c.anon.post(
+        "/api/auth/refresh/", {"refresh": str(RefreshToken.for_user(c.user))}, format="json"
+    ),
+    ("logout", "POST"): lambda c: c.client.post("/api/auth/logout/"),
+    ("auth/me/", "GET"): lambda c: c.client.get("/api/auth/me/"),
+    ("auth/signup/", "POST"): lambda c: c.anon.post(
+        "/api/auth/signup/",
+        {"username": f"newcomer{c.n}", "email": "", "password": PASSWORD},
+        format="json",
+    ),
+    ("insight-list", "GET"): lambda c: c.anon.get("/api/insights/?page_size=100"),
+    ("insight-list", "GET tag filter"): lambda c: c.anon.get(
+        "/api/insights/?page_size=100&tag=shared&tag=rates&tag_mode=all"
+    ),
+    ("insight-list", "GET hot"): lambda c: c.anon.get("/api/insights/?page_size=100&ordering=hot"),
+    ("insight-list", "GET search"): lambda c: c.anon.get("/api/insights/?page_size=100&search=budget"),
+    ("insight-list", "GET include_archived"): lambda c: c.anon.get(
+        "/api/insights/?page_size=100&include_archived=true"
+    ),
+    ("insight-list", "POST"): lambda c: c.client.post("/api/insights/", _insight(), format="json"),
+    ("insight-list", "POST idempotent"): lambda c: c.client.post(
+        "/api/insights/", _insight(), format="json", HTTP_IDEMPOTENCY_KEY="budget-key"
+    ),
+    ("insight-mine", "GET"): lambda c: c.client.get("/api/insights/mine/?page_size=100"),
+    ("insight-batch", "GET"): lambda c: c.anon.get("/api/insights/batch/?ids=" + ",".join(map(str, c.ids))),
+    ("insight-batch", "POST"): lambda c: c.anon.post("/api/insights/batch/", {"ids": c.ids}, format="json"),
+    ("insight-changes", "GET"): lambda c: c.anon.get("/api/insights/changes/?limit=500"),
+    ("insight-detail", "GET"): lambda c: c.anon.get(f"/api/insights/{c.ids[0]}/"),
+    ("insight-detail", "PUT"): lambda c: c.client.put(f"/api/insights/{c.ids[0]}/", _insight(), format="json"),
+    ("insight-detail", "PATCH"): lambda c: c.client.patch(
+        f"/api/insights/{c.ids[0]}/", {"title": "Budget renamed"}, format="json"
+    ),
+    ("insight-detail", "DELETE"): lambda c: c.client.delete(f"/api/insights/{c.ids[0]}/"),
+    ("top-tags", "GET"): lambda c: c.anon.get("/api/analytics/top-tags/"),
+    ("tag-merge", "POST"): lambda c: c.staff_client.post(
+        "/api/tags/merge/", {"sources": ["rates"], "target": "shared"}, format="json"
+    ),
+    ("slow-queries", "GET"): lambda c: c.staff_client.get("/api/diagnostics/slow-queries/"),
+    ("representation-cache", "GET"): lambda c: c.staff_client.get("/api/diagnostics/representation-cache/"),
+    ("representation-cache", "DELETE"): lambda c: c.staff_client.delete("/api/diagnostics/representation-cache/"),
+    ("task-queue", "GET"): lambda c: c.staff_client.get("/api/diagnostics/tasks/"),
+    ("task-queue", "DELETE"): lambda c: c.staff_client.delete("/api/diagnostics/tasks/"),
+}
+
+
+def _routes(patterns, prefix=""):
+    for p in patterns:
+        if isinstance(p, URLResolver):
+            yield from _routes(p.url_patterns, prefix + str(p.pattern))
+        else:
+            yield p.name or prefix + str(p.pattern)
+
+
+def _load_baseline() -> dict[str, int]:
+    return json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+
+
+def _measure(scenario: Callable[[Context], object], n: int) -> int:
+    with transaction.atomic():
+        ctx = seed(n)
+        with CaptureQueriesContext(connection) as queries:
+            response = scenario(ctx)
+        assert response.status_code < 400, getattr(response, "data", response)
+        transaction.set_rollback(True)
+    return len(queries)
+
+
+@pytest.fixture(autouse=True)
+def _stable_counts(settings):
+    # Planner estimates (Postgres) and slow-query EXPLAINs would add queries
+    # that depend on the database rather than on the code under test.
+    settings.INSIGHTS_APPROX_COUNT_THRESHOLD = 0
+    settings.SLOW_QUERY_THRESHOLD_MS = 0
+    settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+def test_every_route_has_a_budget_scenario():
+    covered = {route for route, _ in SCENARIOS} | set(EXCLUDED_ROUTES)
+    missing = set(_routes(get_resolver("insights.urls").url_patterns)) - covered
+    assert not missing, f"Add query-budget scenarios for: {sorted(missing)}"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("key", list(SCENARIOS), ids=[" ".join(k) for k in SCENARIOS])
+def test_query_budget(key):
+    counts = {n: _measure(SCENARIOS[key], n) for n in SIZES}
+    name = " ".join(key)
+
+    if os.environ.get("UPDATE_QUERY_BUDGETS"):
+        baseline = _load_baseline()
+        baseline[name] = max(counts.values())
+        BASELINE_PATH.write_text(json.dumps(dict(sorted(baseline.items())), indent=2) + "\n")
+
+    assert len(set(counts.values())) == 1, f"{name}: query count grows with rows {counts}"
+    budget = _load_baseline().get(name)
+    assert budget is not None, f"{name}: no entry in {BASELINE_PATH.name}; run with UPDATE_QUERY_BUDGETS=1"
+    assert counts[SIZES[0]] <= budget, f"{name}: {counts[SIZES[0]]} queries, budget is {budget}"
@@ -0,0 +1,39 @@
+import io
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from project.renderers import FastJSONParser, FastJSONRenderer
+
+
+def test_fast_renderer_matches_drf_output():
+    data = {
+        "results": [
+            {
+                "id": 1,
+                "price": Decimal("1.25"),
+                "updated_at": timezone.now(),
+                "label": gettext_lazy("Macro"),
+                "body": "line\u2028separator",
+            }
+        ],
+        "next": None,
+    }
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+    assert FastJSONRenderer().render(None) == b""
+
+
+def test_fast_renderer_honours_indent():
+    rendered = FastJSONRenderer().render({"a": 1}, "application/json; indent=2")
+    assert rendered == b'{\n  "a": 1\n}'
+
+
+def test_fast_parser_parses_and_rejects_malformed_json():
+    parser = FastJSONParser()
+    assert parser.parse(io.BytesIO('{"tags": ["CPI", "€"]}'.encode())) == {"tags": ["CPI", "€"]}
+    with pytest.raises(ParseError):
+        parser.parse(io.BytesIO(b'{"tags": '))
@@ -0,0 +1,28 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+
+from insights.management.commands.profile_startup import parse_importtime
+
+
+def test_parse_importtime_keeps_top_level_modules():
+    stderr = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       100 |        100 |   child",
+            "import time:       200 |       1300 | parent",
+            "import time:        50 |         50 | other",
+        ]
+    )
+    assert parse_importtime(stderr) == [("parent", 0.2, 1.3), ("other", 0.05, 0.05)]
+
+
+def test_api_profile_keeps_heavy_modules_off_startup():
+    out = StringIO()
+    call_command("profile_startup", "--profile-settings=project.settings_api", "--json", stdout=out)
+    report = json.loads(out.getvalue())
+
+    assert report["status"] == 401
+    assert report["watched_modules_loaded"] == []
+    assert report["top_modules"]
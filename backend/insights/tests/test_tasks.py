@@ -0,0 +1,182 @@
+import time
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from insights.infrastructure.tasks import ImmediateTaskBackend, get_task_backend, task, task_metrics
+from insights.models import DeferredTask
+
+User = get_user_model()
+DATABASE_BACKEND = "insights.infrastructure.tasks.DatabaseTaskBackend"
+CALLS = []
+
+
+@task(batch_size=2)
+def collect(payloads):
+    CALLS.append([p["n"] for p in payloads])
+
+
+@task(max_attempts=2)
+def always_fails(payloads):
+    raise RuntimeError("boom")
+
+
+@task()
+def slow(payloads):
+    time.sleep(0.05)
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    CALLS.clear()
+    task_metrics.reset()
+    yield
+    CALLS.clear()
+
+
+@pytest.fixture
+def database_backend(settings):
+    settings.INSIGHT_TASK_BACKEND = DATABASE_BACKEND
+    return get_task_backend()
+
+
+@pytest.mark.django_db
+def test_database_backend_runs_same_type_tasks_in_batches(database_backend):
+    for n in range(3):
+        collect.defer({"n": n})
+    always_fails.defer()
+    DeferredTask.objects.filter(name=always_fails.name).update(run_after=timezone.now() + timedelta(hours=1))
+    depth = database_backend.depth()
+    assert depth[collect.name]["queued"] == depth[collect.name]["ready"] == 3
+    assert depth[always_fails.name]["ready"] == 0
+
+    assert [database_backend.run_batch() for _ in range(3)] == [2, 1, 0]
+    assert CALLS == [[0, 1], [2]]
+    assert list(DeferredTask.objects.values_list("name", flat=True)) == [always_fails.name]
+    stats = task_metrics.stats()
+    assert (stats["runs"], stats["tasks"], stats["failures"]) == (2, 3, 0)
+    assert stats["avg_latency_ms"] is not None
+
+
+@pytest.mark.django_db
+def test_database_backend_latency_includes_the_handler(database_backend):
+    slow.defer()
+    assert database_backend.run_batch() == 1
+    assert task_metrics.stats()["avg_latency_ms"] >= 50
+
+
+@pytest.mark.django_db
+def test_database_backend_retries_with_backoff_then_parks_dead_tasks(database_backend):
+    always_fails.defer()
+    DeferredTask.objects.create(name="insights.tests.missing_task", payload={}, run_after=timezone.now())
+
+    assert database_backend.run_batch() == 1
+    row = DeferredTask.objects.get(name=always_fails.name)
+    assert row.status == DeferredTask.Status.QUEUED and row.attempts == 1
+    assert row.run_after > timezone.now() and row.last_error == "RuntimeError: boom"
+    assert database_backend.run_batch() == 1  # the unknown task: parked at once
+    assert database_backend.run_batch() == 0  # the failed one is backing off
+
+    DeferredTask.objects.update(run_after=timezone.now())
+    assert database_backend.run_batch() == 1
+    assert set(DeferredTask.objects.values_list("status", flat=True)) == {DeferredTask.Status.DEAD}
+    assert database_backend.run_batch() == 0
+    assert database_backend.depth()[always_fails.name]["dead"] == 1
+    stats = task_metrics.stats()
+    assert (stats["failures"], stats["dead"]) == (3, 2)
+
+
+@pytest.mark.django_db
+def test_deferred_task_is_dropped_when_the_transaction_rolls_back(database_backend, django_capture_on_commit_callbacks):
+    with pytest.raises(RuntimeError), transaction.atomic():
+        collect.defer({"n": 1})
+        raise RuntimeError
+    assert not DeferredTask.objects.exists()
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        with pytest.raises(RuntimeError), transaction.atomic():
+            ImmediateTaskBackend().enqueue(collect, {"n": 2})
+            raise RuntimeError
+    assert callbacks == [] and CALLS == []
+
+
+@pytest.mark.django_db
+def test_thread_pool_backend_runs_after_commit(settings, django_capture_on_commit_callbacks):
+    settings.INSIGHT_TASK_BACKEND = "insights.infrastructure.tasks.ThreadPoolTaskBackend"
+    backend = get_task_backend()
+    with django_capture_on_commit_callbacks(execute=True):
+        for n in range(5):
+            collect.defer({"n": n})
+        assert CALLS == []
+    backend.shutdown()
+    assert sorted(n for batch in CALLS for n in batch) == [0, 1, 2, 3, 4]
+    assert all(len(batch) <= collect.batch_size for batch in CALLS)
+    assert backend.depth() == {}
+
+
+@pytest.mark.django_db
+def test_claimed_tasks_are_hidden_from_other_workers_until_the_lease_lapses(database_backend):
+    for n in range(3):
+        collect.defer({"n": n})
+    ids = list(DeferredTask.objects.order_by("id").values_list("id", flat=True))
+    now = timezone.now()
+    held = database_backend._claim(ids[:2], now)  # a worker that then dies
+    assert [r.id for r in held] == ids[:2]
+    assert database_backend._claim(ids, now) == [DeferredTask.objects.get(id=ids[2])]  # only the free one
+    assert database_backend.run_batch() == 0
+
+    DeferredTask.objects.filter(id__in=ids[:2]).update(run_after=now)
+    assert database_backend.run_batch() == 2
+    assert CALLS == [[0, 1]]
+
+
+# Concurrent workers need a database with row-level locking (SQLite locks the whole file).
+row_locking = pytest.mark.skipif(
+    not connection.features.has_select_for_update_skip_locked, reason="needs row-level locking"
+)
+
+
+@pytest.mark.parametrize("concurrency", [1, pytest.param(2, marks=row_locking)])
+@pytest.mark.django_db(transaction=True)
+def test_run_workers_drains_the_queue(database_backend, capsys, concurrency):
+    for n in range(5):
+        collect.defer({"n": n})
+    call_command("run_workers", "--once", "--concurrency", str(concurrency))
+    assert "Ran 5 tasks." in capsys.readouterr().out
+    assert sorted(n for batch in CALLS for n in batch) == [0, 1, 2, 3, 4]
+    assert not DeferredTask.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_workers_fails_loudly_when_a_worker_errors(database_backend, monkeypatch):
+    from django.core.management.base import CommandError
+
+    from insights.infrastructure.tasks import DatabaseTaskBackend
+
+    def run_batch(self):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(DatabaseTaskBackend, "run_batch", run_batch)
+    with pytest.raises(CommandError, match="1 of 1 workers failed"):
+        call_command("run_workers", "--once", "--concurrency", "1")
+
+
+@pytest.mark.django_db
+def test_task_queue_diagnostics_are_staff_only(database_backend):
+    collect.defer({"n": 1})
+    c = APIClient()
+    user = User.objects.create_user(username="testuser", password="password123")
+    c.force_authenticate(user=user)
+    assert c.get("/api/diagnostics/tasks/").status_code == 403
+
+    user.is_staff = True
+    user.save()
+    data = c.get("/api/diagnostics/tasks/").data
+    assert data["backend"] == "DatabaseTaskBackend"
+    assert data["queue"][collect.name]["queued"] == 1
+    assert c.delete("/api/diagnostics/tasks/").status_code == 204
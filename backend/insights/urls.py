@@ -1,8 +1,20 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from .views import InsightViewSet, logout_view, top_tags_view,me_view,signup_view
+from .views import (
+    InsightViewSet,
+    insight_stream_view,
+    logout_view,
+    me_view,
+    merge_tags_view,
+    representation_cache_view,
+    signup_view,
+    slow_queries_view,
+    task_queue_view,
+    top_tags_view,
+)
 
 router = DefaultRouter()
 router.register(r"insights", InsightViewSet, basename="insight")
@@ -15,9 +27,33 @@ urlpatterns = [
     path("auth/me/", me_view),
     path("auth/signup/", signup_view),
 
+    # Live feed (SSE, async); must precede the router's detail route
+    path("insights/stream/", insight_stream_view, name="insight-stream"),
+
     # Insights CRUD
     path("", include(router.urls)),
 
     # Analytics
     path("analytics/top-tags/", top_tags_view, name="top-tags"),
-]
\ No newline at end of file
+
+    # Tag maintenance (staff)
+    path("tags/merge/", merge_tags_view, name="tag-merge"),
+
+    # Diagnostics (staff)
+    path("diagnostics/slow-queries/", slow_queries_view, name="slow-queries"),
+    path("diagnostics/representation-cache/", representation_cache_view, name="representation-cache"),
+    path("diagnostics/tasks/", task_queue_view, name="task-queue"),
+]
+
+if settings.INSIGHTS_ASYNC_READS:
+    # ASGI: async reads take precedence over the sync routes for the same paths.
+    from . import async_views
+
+    urlpatterns = [
+        path("auth/login/", async_views.login_view),
+        path("auth/signup/", async_views.signup_view),
+        path("auth/me/", async_views.me_view),
+        path("analytics/top-tags/", async_views.top_tags_view),
+        path("insights/", async_views.insight_list_view),
+        path("insights/<int:pk>/", async_views.insight_detail_view),
+    ] + urlpatterns
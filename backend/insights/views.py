@@ -1,32 +1,118 @@
 from __future__ import annotations
 
+import asyncio
+import json
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
 from rest_framework import status, viewsets
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import ValidationError as DRFValidationError
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 
+from .application.use_cases.batch_get_insights import BatchGetInsightsUseCase
 from .application.use_cases.create_insight import CreateInsightInput, CreateInsightUseCase
 from .application.use_cases.delete_insight import DeleteInsightUseCase
 from .application.use_cases.list_insights import ListInsightsQuery, ListInsightsUseCase
+from .application.use_cases.merge_tags import MergeTagsInput, MergeTagsUseCase
 from .application.use_cases.top_tags import TopTagsUseCase
 from .application.use_cases.update_insight import UpdateInsightInput, UpdateInsightUseCase
-from .application.use_cases.signup_user import SignupInput, SignupUserUseCase, SignupValidationError
-from .domain.exceptions import ValidationError
-from .infrastructure.repositories import InsightRepository
-from .infrastructure.user_repository import UserRepository
-from .infrastructure.selectors import InsightSelector, TagAnalyticsSelector
+from .domain.exceptions import ResyncRequiredError, ValidationError
+from .infrastructure.events import EventFilter, broadcaster, get_event_backend
+from .infrastructure.idempotency import idempotent
+from .infrastructure.query_log import use_case_scope
+from .infrastructure.repositories import InsightRepository, TagRepository
+from .infrastructure.representations import InsightKey, representation_cache
+from .infrastructure.selectors import (
+    DEFAULT_ORDERING,
+    INSIGHT_ORDERINGS,
+    ChangeFeedSelector,
+    TAG_MODE_ANY,
+    TAG_MODES,
+    InsightKeyList,
+    InsightSelector,
+    TagAnalyticsSelector,
+    TagSelector,
+)
+from .infrastructure.tags import canonical_tags
+from .infrastructure.tasks import task_metrics, task_stats
+from .infrastructure.view_counts import view_counts
 from .models import Insight
 from .serializers import InsightSerializer,SignupSerializer
-from django.contrib.auth import get_user_model
 
+CHANGES_DEFAULT_LIMIT = 100
+CHANGES_MAX_LIMIT = 500
+STREAM_HEARTBEAT_SECONDS = 15
+
+
+def parse_count(raw: str) -> int | None:
+    """``raw`` as a non-negative integer, else None (str.isdigit() also accepts "²", which int() rejects)."""
+    try:
+        value = int(raw)
+    except ValueError:
+        return None
+    return value if value >= 0 else None
+
+
+def parse_list_query(params, *, created_by: int | None = None) -> ListInsightsQuery:
+    """Build a ListInsightsQuery from query params; ``created_by`` forces the author."""
+    tag_mode = params.get("tag_mode") or TAG_MODE_ANY
+    if tag_mode not in TAG_MODES:
+        raise DRFValidationError({"tag_mode": [f"Must be one of: {', '.join(TAG_MODES)}."]})
+    ordering = params.get("ordering") or DEFAULT_ORDERING
+    if ordering not in INSIGHT_ORDERINGS:
+        raise DRFValidationError({"ordering": [f"Must be one of: {', '.join(INSIGHT_ORDERINGS)}."]})
 
+    if created_by is None:
+        raw = params.get("created_by") or None
+        if raw is not None:
+            created_by = parse_count(raw)
+            if created_by is None:
+                raise DRFValidationError({"created_by": ["Must be a user id."]})
+
+    return ListInsightsQuery(
+        search=params.get("search"),
+        category=params.get("category"),
+        created_by=created_by,
+        tags=tuple(params.getlist("tag")),
+        tag_mode=tag_mode,
+        tag_contains=params.get("tag_contains"),
+        ordering=ordering,
+        include_archived=(params.get("include_archived") or "").lower() in ("1", "true", "yes"),
+    )
+
+
+def render_insights(keys: list[InsightKey], *, selector: InsightSelector) -> list[dict]:
+    """
+    InsightSerializer output for ``keys``, in order. Current entries come
+    from the representation cache; only the misses are loaded (one row and
+    one tag query per tier) and serialized. Rows deleted since the keys
+    were read are left out.
+    """
+    rendered = representation_cache.get_many(keys)
+    missing = [k for k in keys if k.id not in rendered]
+    if missing:
+        found = {
+            **selector.get_many(ids=[k.id for k in missing if not k.archived], include_archived=False),
+            **selector.get_archived_many(ids=[k.id for k in missing if k.archived]),
+        }
+        fresh = {pk: (obj.updated_at, dict(InsightSerializer(obj).data)) for pk, obj in found.items()}
+        representation_cache.set_many(fresh)
+        rendered.update((pk, data) for pk, (_, data) in fresh.items())
+    return [rendered[k.id] for k in keys if k.id in rendered]
 
 
 class InsightViewSet(viewsets.ModelViewSet):
     serializer_class = InsightSerializer
     queryset = Insight.objects.all()  # overridden by get_queryset
 
+    # Filtering and ordering are owned by InsightSelector, which only allows
+    # index-backed orderings; the global DRF filter backends would bypass that.
+    filter_backends: list = []
+
     repo = InsightRepository()
     selector = InsightSelector()
 
@@ -35,18 +121,136 @@ class InsightViewSet(viewsets.ModelViewSet):
         # - list/retrieve: public
         # - create: authenticated
         # - update/delete: owner only (also requires authentication)
-        if self.action in ("create", "update", "partial_update", "destroy"):
+        # - mine: authenticated
+        if self.action in ("create", "update", "partial_update", "destroy", "mine"):
             return [IsAuthenticated()]
         return [AllowAny()]
 
+    def get_list_query(self) -> ListInsightsQuery:
+        created_by = self.request.user.id if self.action == "mine" else None
+        return parse_list_query(self.request.query_params, created_by=created_by)
+
     def get_queryset(self):
-        q = ListInsightsQuery(
-            search=self.request.query_params.get("search"),
-            category=self.request.query_params.get("category"),
-            tag=self.request.query_params.get("tag"),
-        )
+        q = self.get_list_query()
         return ListInsightsUseCase(selector=self.selector).execute(query=q)
 
+    def get_known_count(self) -> int | None:
+        q = self.get_list_query()
+        return ListInsightsUseCase(selector=self.selector).known_count(query=q)
+
+    def list(self, request, *args, **kwargs):
+        # Paginate over (id, updated_at) only; render_insights fills in the page.
+        # The queryset is evaluated here, after the use case returned.
+        with use_case_scope(ListInsightsUseCase.__name__):
+            keys = InsightKeyList(self.get_queryset())
+            page = self.paginate_queryset(keys)
+            if page is None:
+                return Response(render_insights(keys[:], selector=self.selector))
+            return self.get_paginated_response(render_insights(page, selector=self.selector))
+
+    def retrieve(self, request, *args, **kwargs):
+        # Archived insights stay readable by id (read-only).
+        pk = parse_count(str(kwargs.get(self.lookup_field, "")))
+        key = self.selector.get_key(pk=pk) if pk is not None else None
+        rendered = render_insights([key], selector=self.selector) if key else []
+        if not rendered:
+            raise Http404
+        if not key.archived:
+            view_counts.record(key.id)
+        return Response(rendered[0])
+
+    @action(detail=False, methods=["get"])
+    def mine(self, request, *args, **kwargs):
+        return self.list(request, *args, **kwargs)
+
+    @action(detail=False, methods=["get", "post"])
+    def batch(self, request, *args, **kwargs):
+        # GET ?ids=1,2&ids=3 or POST {"ids": [1, 2, 3]}; order is preserved.
+        if request.method == "POST":
+            if not isinstance(request.data, dict):
+                return Response(
+                    {"error": {"code": "VALIDATION_ERROR", "details": {"detail": ["Expected a JSON object."]}}},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            raw_ids = request.data.get("ids", [])
+            if not isinstance(raw_ids, list):
+                raw_ids = [raw_ids]
+        else:
+            raw_ids = [
+                part for value in request.query_params.getlist("ids") for part in value.split(",")
+            ]
+
+        try:
+            ids = [int(str(i).strip()) for i in raw_ids if str(i).strip()]
+        except ValueError:
+            return Response(
+                {"error": {"code": "VALIDATION_ERROR", "details": {"ids": ["Ids must be integers."]}}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            result = BatchGetInsightsUseCase(selector=self.selector).execute(ids=ids)
+        except ValidationError as e:
+            return Response(
+                {"error": {"code": "VALIDATION_ERROR", "details": e.details}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(
+            {
+                "results": self.get_serializer(result.insights, many=True).data,
+                "missing": result.missing,
+            }
+        )
+
+    @action(detail=False, methods=["get"])
+    def changes(self, request, *args, **kwargs):
+        # Incremental sync: ?since=<cursor>&limit=<n>, entries in commit order.
+        since = parse_count(request.query_params.get("since") or "0")
+        limit = parse_count(request.query_params.get("limit") or str(CHANGES_DEFAULT_LIMIT))
+        if since is None or limit is None:
+            return Response(
+                {"error": {"code": "VALIDATION_ERROR", "details": {"detail": ["since and limit must be integers."]}}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        from .application.use_cases.list_changes import ListChangesUseCase  # rarely used; loaded lazily
+
+        use_case = ListChangesUseCase(feed=ChangeFeedSelector(), selector=self.selector)
+        try:
+            page = use_case.execute(
+                since=since,
+                limit=max(1, min(limit, CHANGES_MAX_LIMIT)),
+            )
+        except ResyncRequiredError as e:
+            # The client should record `cursor`, re-fetch the list, then poll from it.
+            return Response(
+                {
+                    "error": {
+                        "code": "RESYNC_REQUIRED",
+                        "details": {"compacted_through": e.compacted_through, "cursor": e.latest},
+                    }
+                },
+                status=status.HTTP_410_GONE,
+            )
+
+        return Response(
+            {
+                "changes": [
+                    {
+                        "seq": c.seq,
+                        "op": c.op,
+                        "id": c.insight_id,
+                        "insight": self.get_serializer(c.insight).data if c.insight else None,
+                    }
+                    for c in page.changes
+                ],
+                "cursor": page.cursor,
+                "has_more": page.has_more,
+            }
+        )
+
+    @method_decorator(idempotent)
     def create(self, request, *args, **kwargs):
         ser = self.get_serializer(data=request.data)
         ser.is_valid(raise_exception=True)
@@ -70,6 +274,7 @@ class InsightViewSet(viewsets.ModelViewSet):
 
         return Response(self.get_serializer(insight).data, status=status.HTTP_201_CREATED)
 
+    @method_decorator(idempotent)
     def update(self, request, *args, **kwargs):
         insight = self.get_object()
         partial = kwargs.pop("partial", False)
@@ -106,6 +311,7 @@ class InsightViewSet(viewsets.ModelViewSet):
         kwargs["partial"] = True
         return self.update(request, *args, **kwargs)
 
+    @method_decorator(idempotent)
     def destroy(self, request, *args, **kwargs):
         insight = self.get_object()
         use_case = DeleteInsightUseCase(repo=self.repo)
@@ -123,8 +329,88 @@ class InsightViewSet(viewsets.ModelViewSet):
 @permission_classes([AllowAny])
 def top_tags_view(request):
     use_case = TopTagsUseCase(selector=TagAnalyticsSelector())
-    tags_qs = use_case.execute(limit=10)
-    return Response({"tags": [{"name": t.name, "count": t.count} for t in tags_qs]})
+    with use_case_scope(TopTagsUseCase.__name__):
+        tags = list(use_case.execute(limit=10))
+    return Response({"tags": [{"name": t.name, "count": t.count} for t in tags]})
+
+
+@api_view(["POST"])
+@permission_classes([IsAdminUser])
+@idempotent
+def merge_tags_view(request):
+    # {"sources": ["CPI", "C.P.I."], "target": "cpi"}; staff only.
+    if not isinstance(request.data, dict):
+        return Response(
+            {"error": {"code": "VALIDATION_ERROR", "details": {"detail": ["Expected a JSON object."]}}},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    sources = request.data.get("sources", [])
+    if not isinstance(sources, list):
+        sources = [sources]
+
+    use_case = MergeTagsUseCase(repo=TagRepository(), selector=TagSelector())
+    try:
+        result = use_case.execute(
+            data=MergeTagsInput(
+                sources=tuple(str(s) for s in sources),
+                target=str(request.data.get("target", "")),
+            )
+        )
+    except ValidationError as e:
+        return Response(
+            {"error": {"code": "VALIDATION_ERROR", "details": e.details}},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    return Response(
+        {
+            "target": {"id": result.target.id, "name": result.target.name},
+            "merged": result.merged,
+            "insights_updated": result.insights_updated,
+        }
+    )
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def slow_queries_view(request):
+    # Top offenders grouped by SQL fingerprint, plus the most recent entries.
+    from .infrastructure.query_log import slow_query_log
+
+    limit = parse_count(request.query_params.get("limit") or "20")
+    if limit is None:
+        return Response(
+            {"error": {"code": "VALIDATION_ERROR", "details": {"limit": ["Must be an integer."]}}},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    limit = max(1, min(limit, 100))
+    return Response(
+        {
+            "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+            "top": slow_query_log.top(limit=limit),
+            "recent": slow_query_log.entries()[-limit:][::-1],
+        }
+    )
+
+
+@api_view(["GET", "DELETE"])
+@permission_classes([IsAdminUser])
+def representation_cache_view(request):
+    # Hit ratio of the per-insight representation cache; DELETE resets the counters.
+    if request.method == "DELETE":
+        representation_cache.reset_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    return Response(representation_cache.stats())
+
+
+@api_view(["GET", "DELETE"])
+@permission_classes([IsAdminUser])
+def task_queue_view(request):
+    # Deferred task depth, failures and latency; DELETE resets the counters.
+    if request.method == "DELETE":
+        task_metrics.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    return Response(task_stats())
 
 
 @api_view(["POST"])
@@ -139,12 +425,15 @@ def me_view(request):
     u = request.user
     return Response({"id": u.id, "username": u.username})
 
-User = get_user_model()
-
-
 @api_view(["POST"])
 @permission_classes([AllowAny])
 def signup_view(request):
+    # Signup is rare compared to reads; keep its modules off worker startup.
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from .application.use_cases.signup_user import SignupInput, SignupUserUseCase, SignupValidationError
+    from .infrastructure.user_repository import UserRepository
+
     ser = SignupSerializer(data=request.data)
     ser.is_valid(raise_exception=True)
 
@@ -163,8 +452,7 @@ def signup_view(request):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    user = User.objects.get(id=out.id)
-    refresh = RefreshToken.for_user(user)
+    refresh = RefreshToken.for_user(out.user)
 
     return Response(
         {
@@ -172,4 +460,57 @@ def signup_view(request):
             "tokens": {"refresh": str(refresh), "access": str(refresh.access_token)},
         },
         status=status.HTTP_201_CREATED,
-    )
\ No newline at end of file
+    )
+
+async def insight_stream_view(request):
+    """
+    Server-Sent Events feed of insight writes (created/updated/deleted).
+
+    Accepts the list filters ``category``, ``tag`` (repeatable) and
+    ``tag_mode``. Runs as a plain async Django view so that, under ASGI, an
+    idle connection costs one queue and no thread. Under WSGI Django would
+    drain the endless stream into a worker, so the feed is refused there.
+    """
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"error": {"code": "NOT_IMPLEMENTED", "details": {"detail": ["The live feed is only served under ASGI."]}}},
+            status=status.HTTP_501_NOT_IMPLEMENTED,
+        )
+
+    tag_mode = request.GET.get("tag_mode") or TAG_MODE_ANY
+    if tag_mode not in TAG_MODES:
+        return JsonResponse(
+            {"error": {"code": "VALIDATION_ERROR", "details": {"tag_mode": [f"Must be one of: {', '.join(TAG_MODES)}."]}}},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    event_filter = EventFilter(
+        category=request.GET.get("category") or None,
+        tags=frozenset(canonical_tags(request.GET.getlist("tag"))),
+        tag_mode=tag_mode,
+    )
+    get_event_backend().start(broadcaster)
+
+    response = StreamingHttpResponse(_event_stream(event_filter), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # disable proxy buffering (nginx)
+    return response
+
+
+async def _event_stream(event_filter: EventFilter):
+    with broadcaster.subscribe() as sub:
+        yield f"retry: {STREAM_HEARTBEAT_SECONDS * 1000}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), timeout=STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if sub.overflowed:
+                # Client is too slow; it should catch up via /api/insights/changes/.
+                yield "event: resync\ndata: {}\n\n"
+                return
+            if event_filter.matches(event):
+                yield f"id: {event['seq']}\nevent: {event['op']}\ndata: {json.dumps(event)}\n\n"
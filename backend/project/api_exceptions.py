@@ -26,6 +26,12 @@ def api_exception_handler(exc: Exception, context: dict[str, Any]) -> Response |
         code = "FORBIDDEN"
     elif resp.status_code == 404:
         code = "NOT_FOUND"
+    elif resp.status_code == 409:
+        code = "CONFLICT"
+    elif resp.status_code == 422:
+        code = "UNPROCESSABLE"
+    elif resp.status_code == 503:
+        code = "BUSY"
     elif resp.status_code >= 500:
         code = "SERVER_ERROR"
 
@@ -2,4 +2,6 @@
 import os
 from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+# Read endpoints switch to their async implementations under ASGI.
+os.environ.setdefault('INSIGHTS_ASYNC_READS', 'True')
 application = get_asgi_application()
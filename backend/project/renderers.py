@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import decimal
+import json
+from typing import Any, Callable
+
+from django.conf import settings
+from rest_framework.utils import encoders
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+# Order tried by the "auto" backend; "stdlib" is always available.
+JSON_BACKENDS = ("orjson", "msgspec", "stdlib")
+
+_fallback_encoder = encoders.JSONEncoder()
+
+
+def _default(obj: Any) -> Any:
+    """Types the fast encoders do not handle natively, mirroring DRF's JSONEncoder."""
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    return _fallback_encoder.default(obj)
+
+
+def _stdlib_dumps(data: Any) -> bytes:
+    return json.dumps(
+        data, cls=encoders.JSONEncoder, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def _load_backend(name: str) -> tuple[str, Callable[[Any], bytes], Callable[[bytes], Any]] | None:
+    if name == "orjson":
+        try:
+            import orjson
+        except ImportError:
+            return None
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+        def dumps(data: Any) -> bytes:
+            return orjson.dumps(data, default=_default, option=options)
+
+        return name, dumps, orjson.loads
+
+    if name == "msgspec":
+        try:
+            import msgspec
+        except ImportError:
+            return None
+        encoder = msgspec.json.Encoder(enc_hook=_default, decimal_format="number")
+        return name, encoder.encode, msgspec.json.decode
+
+    return "stdlib", _stdlib_dumps, json.loads
+
+
+def _select_backend() -> tuple[str, Callable[[Any], bytes], Callable[[bytes], Any]]:
+    wanted = getattr(settings, "API_JSON_BACKEND", "auto")
+    candidates = JSON_BACKENDS if wanted == "auto" else (wanted, "stdlib")
+    for name in candidates:
+        backend = _load_backend(name)
+        if backend is not None:
+            return backend
+    return _load_backend("stdlib")
+
+
+_backend: tuple[str, Callable[[Any], bytes], Callable[[bytes], Any]] | None = None
+
+
+def _get_backend() -> tuple[str, Callable[[Any], bytes], Callable[[bytes], Any]]:
+    global _backend
+    if _backend is None:
+        _backend = _select_backend()
+    return _backend
+
+
+def backend_name() -> str:
+    return _get_backend()[0]
+
+
+def dumps(data: Any) -> bytes:
+    """Compact UTF-8 JSON, same output contract as FastJSONRenderer."""
+    # U+2028/U+2029 are escaped so the output stays a strict JavaScript subset.
+    return _get_backend()[1](data).replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+
+
+def loads(raw: bytes) -> Any:
+    return _get_backend()[2](raw)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson/msgspec (settings.API_JSON_BACKEND).
+
+    Falls back to DRF's implementation for pretty-printed (``indent``)
+    responses and non-default UNICODE/COMPACT/STRICT settings.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if (
+            self.ensure_ascii
+            or not self.compact
+            or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser backed by orjson/msgspec; rejects NaN/Infinity like strict DRF."""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if backend_name() == "stdlib" or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return loads(stream.read())
+        except ValueError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
@@ -0,0 +1,148 @@
+"""
+OpenAPI schema served from a precomputed artifact instead of introspecting
+every view per request.
+
+Lookup order for the schema document:
+1. this process's memory;
+2. the artifact written by `manage.py generate_openapi_schema`
+   (settings.OPENAPI_SCHEMA_PATH), e.g. at image build time;
+3. the shared Django cache (one generation per deployment, not per worker),
+   keyed on settings.OPENAPI_SCHEMA_BUILD_ID; without a build id the entry
+   expires after settings.OPENAPI_SCHEMA_CACHE_SECONDS instead;
+4. generating it with drf-spectacular, then storing it in 1 and 3.
+
+With DEBUG on, only step 1 is used so a stale artifact never hides code
+changes during development (runserver reloads the process anyway).
+
+drf-spectacular is only imported for step 4, for YAML output and for the
+Swagger UI page, so ordinary API workers never pay its import cost.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.module_loading import import_string
+from django.views.decorators.http import require_GET
+from rest_framework.utils.encoders import JSONEncoder
+
+JSON_MEDIA_TYPE = "application/vnd.oai.openapi+json"
+YAML_MEDIA_TYPE = "application/vnd.oai.openapi"
+
+_lock = threading.Lock()
+_schema: dict[str, Any] | None = None
+_bodies: dict[str, tuple[bytes, str]] = {}
+
+
+def _cache_key() -> str:
+    version = settings.SPECTACULAR_SETTINGS.get("VERSION", "")
+    return f"openapi-schema:{version}:{settings.OPENAPI_SCHEMA_BUILD_ID}"
+
+
+def _cache_schema(schema: dict[str, Any]) -> None:
+    # A build id pins the entry to one release; an unversioned one must not
+    # outlive a deploy that changes serializers or routes.
+    timeout = None if settings.OPENAPI_SCHEMA_BUILD_ID else settings.OPENAPI_SCHEMA_CACHE_SECONDS
+    cache.set(_cache_key(), schema, timeout=timeout)
+
+
+def generate_schema() -> dict[str, Any]:
+    from drf_spectacular.settings import spectacular_settings
+
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=True)
+    # Normalise lazy translation strings etc. so the result is plain JSON data.
+    return json.loads(json.dumps(schema, cls=JSONEncoder))
+
+
+def write_schema_artifact(path: Path | None = None) -> Path:
+    """Generate the schema, write it to disk and publish it to the shared cache."""
+    schema = generate_schema()
+    path = Path(path or settings.OPENAPI_SCHEMA_PATH)
+    path.write_text(json.dumps(schema, indent=2, ensure_ascii=False))
+    _cache_schema(schema)
+    reset_schema()
+    return path
+
+
+def reset_schema() -> None:
+    global _schema
+    with _lock:
+        _schema = None
+        _bodies.clear()
+
+
+def get_schema() -> dict[str, Any]:
+    global _schema
+    if _schema is not None:
+        return _schema
+    with _lock:
+        if _schema is None:
+            if settings.DEBUG:
+                _schema = generate_schema()
+                return _schema
+            path = Path(settings.OPENAPI_SCHEMA_PATH)
+            if path.exists():
+                _schema = json.loads(path.read_text())
+                return _schema
+            schema = cache.get(_cache_key())
+            if schema is None:
+                schema = generate_schema()
+                _cache_schema(schema)
+            _schema = schema
+        return _schema
+
+
+def _render(fmt: str) -> tuple[bytes, str]:
+    """Encoded body and ETag for ``fmt``, computed once per process."""
+    if fmt not in _bodies:
+        schema = get_schema()
+        if fmt == "json":
+            body = json.dumps(schema, ensure_ascii=False).encode()
+        else:
+            from drf_spectacular.renderers import OpenApiYamlRenderer
+
+            body = OpenApiYamlRenderer().render(schema, renderer_context={})
+        _bodies[fmt] = (body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+    return _bodies[fmt]
+
+
+def _wants_json(request) -> bool:
+    fmt = request.GET.get("format")
+    if fmt:
+        return fmt in ("json", "openapi-json")
+    return "json" in request.headers.get("Accept", "")
+
+
+@require_GET
+def openapi_schema_view(request):
+    """Drop-in replacement for SpectacularAPIView (YAML by default, JSON on request)."""
+    fmt = "json" if _wants_json(request) else "yaml"
+    body, etag = _render(fmt)
+
+    if etag in request.headers.get("If-None-Match", ""):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type=JSON_MEDIA_TYPE if fmt == "json" else YAML_MEDIA_TYPE)
+    response["ETag"] = etag
+    response["Cache-Control"] = "public, max-age=300"
+    return response
+
+
+def lazy_view(dotted_path: str, **initkwargs):
+    """URL-conf friendly view whose class is imported on its first request."""
+    view = None
+
+    def wrapper(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(dotted_path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    return wrapper
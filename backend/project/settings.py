@@ -31,6 +31,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "insights.infrastructure.query_log.QueryContextMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -71,6 +72,12 @@ TEMPLATES = [
 
 STATIC_URL = "static/"
 
+# JSON encoder behind FastJSONRenderer/FastJSONParser: "auto" picks orjson,
+# then msgspec, then the standard library. Set API_FAST_JSON=False to use
+# DRF's own JSON renderer and parser.
+API_JSON_BACKEND = env("API_JSON_BACKEND", default="auto")
+API_FAST_JSON = env.bool("API_FAST_JSON", default=True)
+
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
@@ -84,11 +91,130 @@ REST_FRAMEWORK = {
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "project.renderers.FastJSONRenderer" if API_FAST_JSON else "rest_framework.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "project.renderers.FastJSONParser" if API_FAST_JSON else "rest_framework.parsers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_PAGINATION_CLASS": "insights.infrastructure.pagination.DefaultPagination",
     "EXCEPTION_HANDLER": "project.api_exceptions.api_exception_handler",
     "PAGE_SIZE": 10,
 }
 
+# Password hashing. Hashes and checks run in a pool of PASSWORD_HASH_WORKERS
+# threads (0 = one per CPU) with at most PASSWORD_HASH_QUEUE_SIZE waiting;
+# beyond that signup/login answer 503 with Retry-After. The first hasher is
+# used for new hashes; PASSWORD_PBKDF2_ITERATIONS lowers or raises its work
+# factor (0 = Django's default; lower it only outside production).
+AUTHENTICATION_BACKENDS = ["insights.infrastructure.passwords.PooledModelBackend"]
+PASSWORD_HASHERS = env.list(
+    "PASSWORD_HASHERS",
+    default=[
+        "insights.infrastructure.passwords.TunablePBKDF2PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+        "django.contrib.auth.hashers.Argon2PasswordHasher",
+        "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+        "django.contrib.auth.hashers.ScryptPasswordHasher",
+    ],
+)
+PASSWORD_PBKDF2_ITERATIONS = env.int("PASSWORD_PBKDF2_ITERATIONS", default=0)
+PASSWORD_HASH_WORKERS = env.int("PASSWORD_HASH_WORKERS", default=0)
+PASSWORD_HASH_QUEUE_SIZE = env.int("PASSWORD_HASH_QUEUE_SIZE", default=64)
+
+# Optional rule applied to tag names on write and in tag filters, e.g.
+# "insights.domain.rules.canonical_tag_name" so "CPI", "cpi" and "C.P.I." are
+# one tag. Existing duplicates can be folded with `manage.py merge_tags --normalize`.
+INSIGHT_TAG_CANONICALIZER = env.str("INSIGHT_TAG_CANONICALIZER", default="")
+
+# Slow-query log: statements at or above this duration are recorded with an
+# EXPLAIN plan ("async" background thread, "sync" inline, or "off") in a ring
+# buffer of SLOW_QUERY_LOG_SIZE entries kept in the Django cache. 0 disables.
+SLOW_QUERY_THRESHOLD_MS = env.float("SLOW_QUERY_THRESHOLD_MS", default=200.0)
+SLOW_QUERY_EXPLAIN = env.str("SLOW_QUERY_EXPLAIN", default="async")
+SLOW_QUERY_LOG_SIZE = env.int("SLOW_QUERY_LOG_SIZE", default=500)
+
+# `manage.py archive_insights` moves insights older than this to the archive
+# table; lists include them only with ?include_archived=true.
+INSIGHT_ARCHIVE_AFTER_DAYS = env.int("INSIGHT_ARCHIVE_AFTER_DAYS", default=365)
+
+# Per-process LRU of tag name -> id (0 disables). Renames/merges invalidate it
+# in every worker through a version key in the Django cache, so production
+# needs a shared CACHES backend (e.g. Redis), not the per-process default.
+INSIGHT_TAG_CACHE_SIZE = env.int("INSIGHT_TAG_CACHE_SIZE", default=10_000)
+
+# Seconds a rendered insight stays in the per-object representation cache
+# (keyed by id and updated_at, reused by every list variant); 0 disables.
+INSIGHT_REPRESENTATION_CACHE_TIMEOUT = env.int("INSIGHT_REPRESENTATION_CACHE_TIMEOUT", default=24 * 3600)
+
+# ordering=hot: score = log2(1 + views) + age in half-lives, so an insight one
+# half-life newer needs half the views to rank alongside an older one.
+INSIGHT_HOT_HALF_LIFE_HOURS = env.float("INSIGHT_HOT_HALF_LIFE_HOURS", default=24.0)
+# Retrieves are counted in memory and written in batches every this many
+# seconds (0: no background thread; on explicit flush, process exit or once
+# the buffer is full), or sooner once this many views are pending.
+INSIGHT_VIEW_FLUSH_SECONDS = env.float("INSIGHT_VIEW_FLUSH_SECONDS", default=10.0)
+INSIGHT_VIEW_FLUSH_MAX_PENDING = env.int("INSIGHT_VIEW_FLUSH_MAX_PENDING", default=10_000)
+
+# List pages whose planner estimate reaches this many rows report the estimate
+# (with count_is_estimate=true) instead of running COUNT(*); 0 disables.
+INSIGHTS_APPROX_COUNT_THRESHOLD = env.int("INSIGHTS_APPROX_COUNT_THRESHOLD", default=100_000)
+
+# Serve list/retrieve/top-tags/me with async views (set by project/asgi.py).
+INSIGHTS_ASYNC_READS = env.bool("INSIGHTS_ASYNC_READS", default=False)
+
+# Change feed (/api/insights/changes/): entries older than this are removed by
+# `manage.py compact_insight_changes`; clients behind it must resync.
+INSIGHT_CHANGES_RETENTION_DAYS = env.int("INSIGHT_CHANGES_RETENTION_DAYS", default=30)
+
+# Idempotency-Key on writes: the first successful response is replayed to
+# retries for this long, then removed by `manage.py purge_idempotency_keys`.
+# A request that holds a key longer than the lock timeout is presumed dead.
+IDEMPOTENCY_KEY_TTL_HOURS = env.int("IDEMPOTENCY_KEY_TTL_HOURS", default=24)
+IDEMPOTENCY_LOCK_TIMEOUT_SECONDS = env.int("IDEMPOTENCY_LOCK_TIMEOUT_SECONDS", default=60)
+
+# Live event delivery for /api/insights/stream/. LocalEventBackend only reaches
+# subscribers in the writing process; use PostgresNotifyBackend with >1 worker.
+INSIGHT_EVENTS_BACKEND = env(
+    "INSIGHT_EVENTS_BACKEND",
+    default="insights.infrastructure.events.LocalEventBackend",
+)
+
+# Deferred side effects (insights.infrastructure.tasks). ThreadPoolTaskBackend
+# runs them in this process after commit (development); DatabaseTaskBackend
+# queues them in the database for `manage.py run_workers` (production).
+INSIGHT_TASK_BACKEND = env(
+    "INSIGHT_TASK_BACKEND",
+    default="insights.infrastructure.tasks.ThreadPoolTaskBackend",
+)
+INSIGHT_TASK_WORKERS = env.int("INSIGHT_TASK_WORKERS", default=2)
+INSIGHT_TASK_POLL_SECONDS = env.float("INSIGHT_TASK_POLL_SECONDS", default=1.0)
+
+# Cold-start budget checked by `manage.py profile_startup --check`, and modules
+# that should stay off an API worker's startup path under settings_api.
+# (django.contrib.admin itself is always imported: DRF's schema package pulls
+# in admindocs.)
+STARTUP_TARGET_MS = env.int("STARTUP_TARGET_MS", default=1000)
+STARTUP_WATCHED_MODULES = [
+    "drf_spectacular",
+    "django_filters",
+    "django.contrib.sessions.middleware",
+    "django.contrib.messages.middleware",
+    "django.contrib.admin.apps",
+]
+
+# Precomputed OpenAPI schema served by /api/schema/ (see project/schema.py);
+# written by `manage.py generate_openapi_schema`.
+OPENAPI_SCHEMA_PATH = env("OPENAPI_SCHEMA_PATH", default=str(BASE_DIR / "openapi-schema.json"))
+# Without an artifact the schema is shared through the cache. Set BUILD_ID
+# (commit sha, image tag) per deploy so a new release never reads the last
+# one's schema; without it, entries expire after OPENAPI_SCHEMA_CACHE_SECONDS.
+OPENAPI_SCHEMA_BUILD_ID = env("BUILD_ID", default="")
+OPENAPI_SCHEMA_CACHE_SECONDS = env.int("OPENAPI_SCHEMA_CACHE_SECONDS", default=300)
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Insights API",
     "DESCRIPTION": "Minimal API for the take-home exercise skeleton",
@@ -0,0 +1,65 @@
+"""
+Lean "API-only" settings profile for autoscaled API workers.
+
+The API authenticates only with JWT and serves JSON, so the admin, the
+session/CSRF/messages stack, the browsable API, django-filter and
+drf-spectacular are dropped here to cut cold-start time. Use it with:
+
+    DJANGO_SETTINGS_MODULE=project.settings_api
+
+Generate the OpenAPI artifact (`manage.py generate_openapi_schema`) with the
+full settings; /api/schema/ still serves it under this profile.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK, TEMPLATES
+
+API_ONLY = True
+
+INSTALLED_APPS = [
+    app
+    for app in INSTALLED_APPS
+    if app
+    not in (
+        "django.contrib.admin",
+        "django.contrib.sessions",
+        "django.contrib.messages",
+        "django.contrib.staticfiles",
+        "drf_spectacular",
+        "django_filters",
+    )
+]
+
+MIDDLEWARE = [
+    m
+    for m in MIDDLEWARE
+    if m
+    not in (
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "django.middleware.csrf.CsrfViewMiddleware",
+        "django.contrib.auth.middleware.AuthenticationMiddleware",
+        "django.contrib.messages.middleware.MessageMiddleware",
+        "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    )
+]
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        "OPTIONS": {
+            "context_processors": [
+                "django.template.context_processors.debug",
+                "django.template.context_processors.request",
+            ],
+        },
+    }
+]
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    # DRF instantiates the schema class while decorating @api_view functions;
+    # the base inspector keeps drf-spectacular off the import path.
+    "DEFAULT_SCHEMA_CLASS": "rest_framework.schemas.inspectors.ViewInspector",
+    "DEFAULT_FILTER_BACKENDS": [],
+    "DEFAULT_RENDERER_CLASSES": REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"][:1],
+    "DEFAULT_PARSER_CLASSES": REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"][:1],
+}
@@ -1,13 +1,11 @@
-from django.contrib import admin
+from django.apps import apps
 from django.urls import include, path
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView, TokenVerifyView
 
-urlpatterns = [
-    path("admin/", admin.site.urls),
+from project.schema import lazy_view, openapi_schema_view
 
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
-    path("api/docs/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
+urlpatterns = [
+    path("api/schema/", openapi_schema_view, name="schema"),
 
     # JWT endpoints
     path("api/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
@@ -15,4 +13,20 @@ urlpatterns = [
     path("api/token/verify/", TokenVerifyView.as_view(), name="token_verify"),
 
     path("api/", include("insights.urls")),
-]
\ No newline at end of file
+]
+
+# Not installed under the API-only settings profile (project/settings_api.py).
+if apps.is_installed("django.contrib.admin"):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path("admin/", admin.site.urls))
+
+if apps.is_installed("drf_spectacular"):
+    urlpatterns.insert(
+        1,
+        path(
+            "api/docs/",
+            lazy_view("drf_spectacular.views.SpectacularSwaggerView", url_name="schema"),
+            name="swagger-ui",
+        ),
+    )